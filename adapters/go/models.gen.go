@@ -76,6 +76,9 @@ type AuthTokenRefreshRequestPayload struct {
 // AvatarUrl User avatar URL
 type AvatarUrl = string
 
+// Cursor Opaque keyset pagination cursor. Returned as `meta.nextCursor` while more records follow; pass it back unchanged to fetch the next page, with `offset` set to 0.
+type Cursor = string
+
 // Email Email address
 type Email = openapi_types.Email
 
@@ -139,11 +142,14 @@ type PaginationMeta struct {
 	// Limit Number of items per page
 	Limit int `json:"limit"`
 
+	// NextCursor Opaque keyset pagination cursor. Returned as `meta.nextCursor` while more records follow; pass it back unchanged to fetch the next page, with `offset` set to 0.
+	NextCursor *Cursor `json:"nextCursor,omitempty"`
+
 	// Offset Offset of records to skip
 	Offset int `json:"offset"`
 
-	// Total Total number of items
-	Total int `json:"total"`
+	// Total Total number of items. May be omitted or estimated when paginating with a cursor.
+	Total *int `json:"total,omitempty"`
 }
 
 // PaginationOffset Offset of records to skip.
@@ -219,6 +225,50 @@ type User struct {
 	UpdatedAt time.Time `json:"updatedAt"`
 }
 
+// UserBatchCreateRequest Request payload for creating several users at once
+type UserBatchCreateRequest struct {
+	// Items Users to create. Results are returned in the same order.
+	Items []UserCreateRequest `json:"items"`
+}
+
+// UserBatchGetRequest Request payload for fetching several users at once
+type UserBatchGetRequest struct {
+	// Ids Identifiers of the users to fetch. Results are returned in the same order.
+	Ids []Id `json:"ids"`
+}
+
+// UserBatchResponse Per-item results of a batch operation, in request order
+type UserBatchResponse struct {
+	Results []UserBatchResult `json:"results"`
+}
+
+// UserBatchResult Outcome of a single item of a batch operation. Exactly one of `user` and `error` is set.
+type UserBatchResult struct {
+	// Error Error response payload.
+	Error *Error `json:"error,omitempty"`
+
+	// Id Unique identifier
+	Id *Id `json:"id,omitempty"`
+
+	// User User entity representing a system user
+	User *User `json:"user,omitempty"`
+}
+
+// UserBatchUpdateItem Changes to apply to a single user of a batch update
+type UserBatchUpdateItem struct {
+	// Changes Request payload for updating user information
+	Changes UserUpdateRequest `json:"changes"`
+
+	// Id Unique identifier
+	Id Id `json:"id"`
+}
+
+// UserBatchUpdateRequest Request payload for updating several users at once
+type UserBatchUpdateRequest struct {
+	// Items Users to update. Results are returned in the same order.
+	Items []UserBatchUpdateItem `json:"items"`
+}
+
 // UserCreateRequest Request payload for creating a new user
 type UserCreateRequest struct {
 	// Email Email address
@@ -293,6 +343,9 @@ type UserId = openapi_types.UUID
 
 // UsersRequestPayload Users request payload.
 type UsersRequestPayload struct {
+	// Cursor Opaque keyset pagination cursor. Returned as `meta.nextCursor` while more records follow; pass it back unchanged to fetch the next page, with `offset` set to 0.
+	Cursor *Cursor `json:"cursor,omitempty"`
+
 	// Filter Filter criteria for selecting records.
 	Filter *struct {
 		// Roles Filter by user roles.
@@ -341,3 +394,12 @@ type UpdateUserByIdJSONRequestBody = UserUpdateRequest
 
 // UpdateUserEmailJSONRequestBody defines body for UpdateUserEmail for application/json ContentType.
 type UpdateUserEmailJSONRequestBody = UserUpdateEmailRequest
+
+// BatchCreateUsersJSONRequestBody defines body for BatchCreateUsers for application/json ContentType.
+type BatchCreateUsersJSONRequestBody = UserBatchCreateRequest
+
+// BatchGetUsersJSONRequestBody defines body for BatchGetUsers for application/json ContentType.
+type BatchGetUsersJSONRequestBody = UserBatchGetRequest
+
+// BatchUpdateUsersJSONRequestBody defines body for BatchUpdateUsers for application/json ContentType.
+type BatchUpdateUsersJSONRequestBody = UserBatchUpdateRequest
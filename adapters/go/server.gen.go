@@ -50,6 +50,15 @@ type ServerInterface interface {
 	// Update user email
 	// (PUT /v1/users/{userId}/email)
 	UpdateUserEmail(w http.ResponseWriter, r *http.Request, userId UserId)
+	// Create users in batch
+	// (POST /v1/users:batchCreate)
+	BatchCreateUsers(w http.ResponseWriter, r *http.Request)
+	// Get users in batch
+	// (POST /v1/users:batchGet)
+	BatchGetUsers(w http.ResponseWriter, r *http.Request)
+	// Update users in batch
+	// (PATCH /v1/users:batchUpdate)
+	BatchUpdateUsers(w http.ResponseWriter, r *http.Request)
 }
 
 // Unimplemented server implementation that returns http.StatusNotImplemented for each endpoint.
@@ -122,6 +131,24 @@ func (_ Unimplemented) UpdateUserEmail(w http.ResponseWriter, r *http.Request, u
 	w.WriteHeader(http.StatusNotImplemented)
 }
 
+// Create users in batch
+// (POST /v1/users:batchCreate)
+func (_ Unimplemented) BatchCreateUsers(w http.ResponseWriter, r *http.Request) {
+	w.WriteHeader(http.StatusNotImplemented)
+}
+
+// Get users in batch
+// (POST /v1/users:batchGet)
+func (_ Unimplemented) BatchGetUsers(w http.ResponseWriter, r *http.Request) {
+	w.WriteHeader(http.StatusNotImplemented)
+}
+
+// Update users in batch
+// (PATCH /v1/users:batchUpdate)
+func (_ Unimplemented) BatchUpdateUsers(w http.ResponseWriter, r *http.Request) {
+	w.WriteHeader(http.StatusNotImplemented)
+}
+
 // ServerInterfaceWrapper converts contexts to parameters.
 type ServerInterfaceWrapper struct {
 	Handler            ServerInterface
@@ -394,6 +421,66 @@ func (siw *ServerInterfaceWrapper) UpdateUserEmail(w http.ResponseWriter, r *htt
 	handler.ServeHTTP(w, r)
 }
 
+// BatchCreateUsers operation middleware
+func (siw *ServerInterfaceWrapper) BatchCreateUsers(w http.ResponseWriter, r *http.Request) {
+
+	ctx := r.Context()
+
+	ctx = context.WithValue(ctx, BearerAuthScopes, []string{})
+
+	r = r.WithContext(ctx)
+
+	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		siw.Handler.BatchCreateUsers(w, r)
+	}))
+
+	for _, middleware := range siw.HandlerMiddlewares {
+		handler = middleware(handler)
+	}
+
+	handler.ServeHTTP(w, r)
+}
+
+// BatchGetUsers operation middleware
+func (siw *ServerInterfaceWrapper) BatchGetUsers(w http.ResponseWriter, r *http.Request) {
+
+	ctx := r.Context()
+
+	ctx = context.WithValue(ctx, BearerAuthScopes, []string{})
+
+	r = r.WithContext(ctx)
+
+	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		siw.Handler.BatchGetUsers(w, r)
+	}))
+
+	for _, middleware := range siw.HandlerMiddlewares {
+		handler = middleware(handler)
+	}
+
+	handler.ServeHTTP(w, r)
+}
+
+// BatchUpdateUsers operation middleware
+func (siw *ServerInterfaceWrapper) BatchUpdateUsers(w http.ResponseWriter, r *http.Request) {
+
+	ctx := r.Context()
+
+	ctx = context.WithValue(ctx, BearerAuthScopes, []string{})
+
+	r = r.WithContext(ctx)
+
+	handler := http.Handler(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		siw.Handler.BatchUpdateUsers(w, r)
+	}))
+
+	for _, middleware := range siw.HandlerMiddlewares {
+		handler = middleware(handler)
+	}
+
+	handler.ServeHTTP(w, r)
+}
+
 type UnescapedCookieParamError struct {
 	ParamName string
 	Err       error
@@ -540,6 +627,15 @@ func HandlerWithOptions(si ServerInterface, options ChiServerOptions) http.Handl
 	r.Group(func(r chi.Router) {
 		r.Put(options.BaseURL+"/v1/users/{userId}/email", wrapper.UpdateUserEmail)
 	})
+	r.Group(func(r chi.Router) {
+		r.Post(options.BaseURL+"/v1/users:batchCreate", wrapper.BatchCreateUsers)
+	})
+	r.Group(func(r chi.Router) {
+		r.Post(options.BaseURL+"/v1/users:batchGet", wrapper.BatchGetUsers)
+	})
+	r.Group(func(r chi.Router) {
+		r.Patch(options.BaseURL+"/v1/users:batchUpdate", wrapper.BatchUpdateUsers)
+	})
 
 	return r
 }
@@ -1008,6 +1104,111 @@ func (response UpdateUserEmail404JSONResponse) VisitUpdateUserEmailResponse(w ht
 	return json.NewEncoder(w).Encode(response)
 }
 
+type BatchCreateUsersRequestObject struct {
+	Body *BatchCreateUsersJSONRequestBody
+}
+
+type BatchCreateUsersResponseObject interface {
+	VisitBatchCreateUsersResponse(w http.ResponseWriter) error
+}
+
+type BatchCreateUsers200JSONResponse UserBatchResponse
+
+func (response BatchCreateUsers200JSONResponse) VisitBatchCreateUsersResponse(w http.ResponseWriter) error {
+	w.Header().Set("Content-Type", "application/json")
+	w.WriteHeader(200)
+
+	return json.NewEncoder(w).Encode(response)
+}
+
+type BatchCreateUsers400JSONResponse Error
+
+func (response BatchCreateUsers400JSONResponse) VisitBatchCreateUsersResponse(w http.ResponseWriter) error {
+	w.Header().Set("Content-Type", "application/json")
+	w.WriteHeader(400)
+
+	return json.NewEncoder(w).Encode(response)
+}
+
+type BatchCreateUsers401JSONResponse Error
+
+func (response BatchCreateUsers401JSONResponse) VisitBatchCreateUsersResponse(w http.ResponseWriter) error {
+	w.Header().Set("Content-Type", "application/json")
+	w.WriteHeader(401)
+
+	return json.NewEncoder(w).Encode(response)
+}
+
+type BatchGetUsersRequestObject struct {
+	Body *BatchGetUsersJSONRequestBody
+}
+
+type BatchGetUsersResponseObject interface {
+	VisitBatchGetUsersResponse(w http.ResponseWriter) error
+}
+
+type BatchGetUsers200JSONResponse UserBatchResponse
+
+func (response BatchGetUsers200JSONResponse) VisitBatchGetUsersResponse(w http.ResponseWriter) error {
+	w.Header().Set("Content-Type", "application/json")
+	w.WriteHeader(200)
+
+	return json.NewEncoder(w).Encode(response)
+}
+
+type BatchGetUsers400JSONResponse Error
+
+func (response BatchGetUsers400JSONResponse) VisitBatchGetUsersResponse(w http.ResponseWriter) error {
+	w.Header().Set("Content-Type", "application/json")
+	w.WriteHeader(400)
+
+	return json.NewEncoder(w).Encode(response)
+}
+
+type BatchGetUsers401JSONResponse Error
+
+func (response BatchGetUsers401JSONResponse) VisitBatchGetUsersResponse(w http.ResponseWriter) error {
+	w.Header().Set("Content-Type", "application/json")
+	w.WriteHeader(401)
+
+	return json.NewEncoder(w).Encode(response)
+}
+
+type BatchUpdateUsersRequestObject struct {
+	Body *BatchUpdateUsersJSONRequestBody
+}
+
+type BatchUpdateUsersResponseObject interface {
+	VisitBatchUpdateUsersResponse(w http.ResponseWriter) error
+}
+
+type BatchUpdateUsers200JSONResponse UserBatchResponse
+
+func (response BatchUpdateUsers200JSONResponse) VisitBatchUpdateUsersResponse(w http.ResponseWriter) error {
+	w.Header().Set("Content-Type", "application/json")
+	w.WriteHeader(200)
+
+	return json.NewEncoder(w).Encode(response)
+}
+
+type BatchUpdateUsers400JSONResponse Error
+
+func (response BatchUpdateUsers400JSONResponse) VisitBatchUpdateUsersResponse(w http.ResponseWriter) error {
+	w.Header().Set("Content-Type", "application/json")
+	w.WriteHeader(400)
+
+	return json.NewEncoder(w).Encode(response)
+}
+
+type BatchUpdateUsers401JSONResponse Error
+
+func (response BatchUpdateUsers401JSONResponse) VisitBatchUpdateUsersResponse(w http.ResponseWriter) error {
+	w.Header().Set("Content-Type", "application/json")
+	w.WriteHeader(401)
+
+	return json.NewEncoder(w).Encode(response)
+}
+
 // StrictServerInterface represents all server handlers.
 type StrictServerInterface interface {
 	// User login
@@ -1043,6 +1244,15 @@ type StrictServerInterface interface {
 	// Update user email
 	// (PUT /v1/users/{userId}/email)
 	UpdateUserEmail(ctx context.Context, request UpdateUserEmailRequestObject) (UpdateUserEmailResponseObject, error)
+	// Create users in batch
+	// (POST /v1/users:batchCreate)
+	BatchCreateUsers(ctx context.Context, request BatchCreateUsersRequestObject) (BatchCreateUsersResponseObject, error)
+	// Get users in batch
+	// (POST /v1/users:batchGet)
+	BatchGetUsers(ctx context.Context, request BatchGetUsersRequestObject) (BatchGetUsersResponseObject, error)
+	// Update users in batch
+	// (PATCH /v1/users:batchUpdate)
+	BatchUpdateUsers(ctx context.Context, request BatchUpdateUsersRequestObject) (BatchUpdateUsersResponseObject, error)
 }
 
 type StrictHandlerFunc = strictnethttp.StrictHTTPHandlerFunc
@@ -1389,3 +1599,96 @@ func (sh *strictHandler) UpdateUserEmail(w http.ResponseWriter, r *http.Request,
 		sh.options.ResponseErrorHandlerFunc(w, r, fmt.Errorf("unexpected response type: %T", response))
 	}
 }
+
+// BatchCreateUsers operation middleware
+func (sh *strictHandler) BatchCreateUsers(w http.ResponseWriter, r *http.Request) {
+	var request BatchCreateUsersRequestObject
+
+	var body BatchCreateUsersJSONRequestBody
+	if err := json.NewDecoder(r.Body).Decode(&body); err != nil {
+		sh.options.RequestErrorHandlerFunc(w, r, fmt.Errorf("can't decode JSON body: %w", err))
+		return
+	}
+	request.Body = &body
+
+	handler := func(ctx context.Context, w http.ResponseWriter, r *http.Request, request interface{}) (interface{}, error) {
+		return sh.ssi.BatchCreateUsers(ctx, request.(BatchCreateUsersRequestObject))
+	}
+	for _, middleware := range sh.middlewares {
+		handler = middleware(handler, "BatchCreateUsers")
+	}
+
+	response, err := handler(r.Context(), w, r, request)
+
+	if err != nil {
+		sh.options.ResponseErrorHandlerFunc(w, r, err)
+	} else if validResponse, ok := response.(BatchCreateUsersResponseObject); ok {
+		if err := validResponse.VisitBatchCreateUsersResponse(w); err != nil {
+			sh.options.ResponseErrorHandlerFunc(w, r, err)
+		}
+	} else if response != nil {
+		sh.options.ResponseErrorHandlerFunc(w, r, fmt.Errorf("unexpected response type: %T", response))
+	}
+}
+
+// BatchGetUsers operation middleware
+func (sh *strictHandler) BatchGetUsers(w http.ResponseWriter, r *http.Request) {
+	var request BatchGetUsersRequestObject
+
+	var body BatchGetUsersJSONRequestBody
+	if err := json.NewDecoder(r.Body).Decode(&body); err != nil {
+		sh.options.RequestErrorHandlerFunc(w, r, fmt.Errorf("can't decode JSON body: %w", err))
+		return
+	}
+	request.Body = &body
+
+	handler := func(ctx context.Context, w http.ResponseWriter, r *http.Request, request interface{}) (interface{}, error) {
+		return sh.ssi.BatchGetUsers(ctx, request.(BatchGetUsersRequestObject))
+	}
+	for _, middleware := range sh.middlewares {
+		handler = middleware(handler, "BatchGetUsers")
+	}
+
+	response, err := handler(r.Context(), w, r, request)
+
+	if err != nil {
+		sh.options.ResponseErrorHandlerFunc(w, r, err)
+	} else if validResponse, ok := response.(BatchGetUsersResponseObject); ok {
+		if err := validResponse.VisitBatchGetUsersResponse(w); err != nil {
+			sh.options.ResponseErrorHandlerFunc(w, r, err)
+		}
+	} else if response != nil {
+		sh.options.ResponseErrorHandlerFunc(w, r, fmt.Errorf("unexpected response type: %T", response))
+	}
+}
+
+// BatchUpdateUsers operation middleware
+func (sh *strictHandler) BatchUpdateUsers(w http.ResponseWriter, r *http.Request) {
+	var request BatchUpdateUsersRequestObject
+
+	var body BatchUpdateUsersJSONRequestBody
+	if err := json.NewDecoder(r.Body).Decode(&body); err != nil {
+		sh.options.RequestErrorHandlerFunc(w, r, fmt.Errorf("can't decode JSON body: %w", err))
+		return
+	}
+	request.Body = &body
+
+	handler := func(ctx context.Context, w http.ResponseWriter, r *http.Request, request interface{}) (interface{}, error) {
+		return sh.ssi.BatchUpdateUsers(ctx, request.(BatchUpdateUsersRequestObject))
+	}
+	for _, middleware := range sh.middlewares {
+		handler = middleware(handler, "BatchUpdateUsers")
+	}
+
+	response, err := handler(r.Context(), w, r, request)
+
+	if err != nil {
+		sh.options.ResponseErrorHandlerFunc(w, r, err)
+	} else if validResponse, ok := response.(BatchUpdateUsersResponseObject); ok {
+		if err := validResponse.VisitBatchUpdateUsersResponse(w); err != nil {
+			sh.options.ResponseErrorHandlerFunc(w, r, err)
+		}
+	} else if response != nil {
+		sh.options.ResponseErrorHandlerFunc(w, r, fmt.Errorf("unexpected response type: %T", response))
+	}
+}
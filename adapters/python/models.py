@@ -271,6 +271,20 @@ class PaginationOffset(RootModel[StrictInt]):
     """
 
 
+class Cursor(RootModel[StrictStr]):
+    root: Annotated[
+        StrictStr,
+        Field(
+            examples=[
+                'WyJqb2huIGRvZSIsIjEyM2U0NTY3LWU4OWItMTJkMy1hNDU2LTQyNjYxNDE3NDAwMCJd'
+            ]
+        ),
+    ]
+    """
+    Opaque keyset pagination cursor. Returned as `meta.nextCursor` while more records follow; pass it back unchanged to fetch the next page, with `offset` set to 0.
+    """
+
+
 class UserSortField(Enum):
     """
     Enum defining the fields by which user can sort the users list.
@@ -312,10 +326,11 @@ class PaginationMeta(BaseModel):
     """
     Offset of records to skip
     """
-    total: Annotated[StrictInt, Field(examples=[150])]
+    total: Annotated[StrictInt | None, Field(examples=[150])] = None
     """
-    Total number of items
+    Total number of items. May be omitted or estimated when paginating with a cursor.
     """
+    next_cursor: Annotated[Cursor | None, Field(alias='nextCursor')] = None
 
 
 class UserCreateRequest(BaseModel):
@@ -350,3 +365,65 @@ class UserUpdateEmailRequest(BaseModel):
 
     new_email: Annotated[Email, Field(alias='newEmail')]
     password: Password
+
+
+class UserBatchGetRequest(BaseModel):
+    """
+    Request payload for fetching several users at once
+    """
+
+    ids: Annotated[Sequence[Id], Field(max_length=100, min_length=1)]
+    """
+    Identifiers of the users to fetch. Results are returned in the same order.
+    """
+
+
+class UserBatchResult(BaseModel):
+    """
+    Outcome of a single item of a batch operation. Exactly one of `user` and `error` is set.
+    """
+
+    id: Id | None = None
+    user: User | None = None
+    error: Error | None = None
+
+
+class UserBatchResponse(BaseModel):
+    """
+    Per-item results of a batch operation, in request order
+    """
+
+    results: Sequence[UserBatchResult]
+
+
+class UserBatchCreateRequest(BaseModel):
+    """
+    Request payload for creating several users at once
+    """
+
+    items: Annotated[Sequence[UserCreateRequest], Field(max_length=100, min_length=1)]
+    """
+    Users to create. Results are returned in the same order.
+    """
+
+
+class UserBatchUpdateItem(BaseModel):
+    """
+    Changes to apply to a single user of a batch update
+    """
+
+    id: Id
+    changes: UserUpdateRequest
+
+
+class UserBatchUpdateRequest(BaseModel):
+    """
+    Request payload for updating several users at once
+    """
+
+    items: Annotated[
+        Sequence[UserBatchUpdateItem], Field(max_length=100, min_length=1)
+    ]
+    """
+    Users to update. Results are returned in the same order.
+    """
@@ -0,0 +1,46 @@
+# coding: utf-8
+
+"""Lazy exports of the API routers and base classes.
+
+Each module is imported on first access to one of its names, so importing a
+single router does not build the others.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "AuthenticationApiRouter": ("contracts.apis.authentication_api", "router"),
+    "BaseAuthenticationApi": (
+        "contracts.apis.authentication_api_base",
+        "BaseAuthenticationApi",
+    ),
+    "BaseHealthApi": ("contracts.apis.health_api_base", "BaseHealthApi"),
+    "BaseUsersApi": ("contracts.apis.users_api_base", "BaseUsersApi"),
+    "HealthApiRouter": ("contracts.apis.health_api", "router"),
+    "UsersApiRouter": ("contracts.apis.users_api", "router"),
+}
+
+__all__ = sorted(_EXPORTS)
+
+if TYPE_CHECKING:
+    from contracts.apis.authentication_api import router as AuthenticationApiRouter
+    from contracts.apis.authentication_api_base import BaseAuthenticationApi
+    from contracts.apis.health_api import router as HealthApiRouter
+    from contracts.apis.health_api_base import BaseHealthApi
+    from contracts.apis.users_api import router as UsersApiRouter
+    from contracts.apis.users_api_base import BaseUsersApi
+
+
+def __getattr__(name):
+    try:
+        module, attribute = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(import_module(module), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -1,11 +1,19 @@
 # coding: utf-8
 
-from typing import Dict, List  # noqa: F401
-import importlib
-import pkgutil
+from typing import Dict, List, Optional  # noqa: F401
 
 from contracts.apis.authentication_api_base import BaseAuthenticationApi
-import contracts.impl
+from contracts.cache import LISTS, batch_user_ids, response_cache  # noqa: F401
+from contracts.coalescing import single_flight  # noqa: F401
+from contracts.conditional import (  # noqa: F401
+    check_version,
+    conditional_response,
+    tagged_response,
+)
+from contracts.dispatcher import dispatcher
+from contracts.metrics import MeteredRoute
+from contracts.responses import trusted_response  # noqa: F401
+from contracts.streaming import ListStream  # noqa: F401
 
 from fastapi import (  # noqa: F401
     APIRouter,
@@ -17,6 +25,7 @@ from fastapi import (  # noqa: F401
     HTTPException,
     Path,
     Query,
+    Request,
     Response,
     Security,
     status,
@@ -32,11 +41,7 @@ from contracts.models.register_request_payload import RegisterRequestPayload
 from contracts.models.token_response import TokenResponse
 from contracts.security_api import get_token_bearerAuth
 
-router = APIRouter()
-
-ns_pkg = contracts.impl
-for _, name, _ in pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + "."):
-    importlib.import_module(name)
+router = APIRouter(route_class=MeteredRoute)
 
 
 @router.post(
@@ -54,9 +59,9 @@ async def authenticate_user(
     auth_request_payload: AuthRequestPayload = Body(None, description=""),
 ) -> AuthenticateUser200Response:
     """Authenticate a user with email/username and password. Returns JWT tokens for subsequent API calls. """
-    if not BaseAuthenticationApi.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseAuthenticationApi.subclasses[0]().authenticate_user(auth_request_payload)
+    return await dispatcher.handler(BaseAuthenticationApi, "authenticate_user")(
+        auth_request_payload,
+    )
 
 
 @router.post(
@@ -75,9 +80,7 @@ async def logout_user(
     ),
 ) -> LogoutUser200Response:
     """Logout user and invalidate tokens"""
-    if not BaseAuthenticationApi.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseAuthenticationApi.subclasses[0]().logout_user()
+    return await dispatcher.handler(BaseAuthenticationApi, "logout_user")()
 
 
 @router.post(
@@ -95,9 +98,9 @@ async def refresh_tokens(
     auth_token_refresh_request_payload: AuthTokenRefreshRequestPayload = Body(None, description=""),
 ) -> TokenResponse:
     """Refresh access token using refresh token. Returns new JWT tokens. """
-    if not BaseAuthenticationApi.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseAuthenticationApi.subclasses[0]().refresh_tokens(auth_token_refresh_request_payload)
+    return await dispatcher.handler(BaseAuthenticationApi, "refresh_tokens")(
+        auth_token_refresh_request_payload,
+    )
 
 
 @router.post(
@@ -115,6 +118,6 @@ async def register_user(
     register_request_payload: RegisterRequestPayload = Body(None, description=""),
 ) -> AuthenticateUser200Response:
     """Create a new user account"""
-    if not BaseAuthenticationApi.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseAuthenticationApi.subclasses[0]().register_user(register_request_payload)
+    return await dispatcher.handler(BaseAuthenticationApi, "register_user")(
+        register_request_payload,
+    )
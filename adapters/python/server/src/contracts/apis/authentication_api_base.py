@@ -1,7 +1,8 @@
 # coding: utf-8
 
-from typing import ClassVar, Dict, List, Tuple  # noqa: F401
+from typing import ClassVar, Dict, List, Optional, Tuple, Union  # noqa: F401
 
+from contracts.streaming import ListStream  # noqa: F401
 from contracts.models.auth_request_payload import AuthRequestPayload
 from contracts.models.auth_token_refresh_request_payload import AuthTokenRefreshRequestPayload
 from contracts.models.authenticate_user200_response import AuthenticateUser200Response
@@ -17,6 +18,17 @@ class BaseAuthenticationApi:
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
         BaseAuthenticationApi.subclasses = BaseAuthenticationApi.subclasses + (cls,)
+
+    async def startup(self) -> None:
+        """Called once during application startup, before the first request"""
+        ...
+
+
+    async def shutdown(self) -> None:
+        """Called once during application shutdown"""
+        ...
+
+
     async def authenticate_user(
         self,
         auth_request_payload: AuthRequestPayload,
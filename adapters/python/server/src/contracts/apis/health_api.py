@@ -1,11 +1,19 @@
 # coding: utf-8
 
-from typing import Dict, List  # noqa: F401
-import importlib
-import pkgutil
+from typing import Dict, List, Optional  # noqa: F401
 
 from contracts.apis.health_api_base import BaseHealthApi
-import contracts.impl
+from contracts.cache import LISTS, batch_user_ids, response_cache  # noqa: F401
+from contracts.coalescing import single_flight  # noqa: F401
+from contracts.conditional import (  # noqa: F401
+    check_version,
+    conditional_response,
+    tagged_response,
+)
+from contracts.dispatcher import dispatcher
+from contracts.metrics import MeteredRoute
+from contracts.responses import trusted_response  # noqa: F401
+from contracts.streaming import ListStream  # noqa: F401
 
 from fastapi import (  # noqa: F401
     APIRouter,
@@ -17,6 +25,7 @@ from fastapi import (  # noqa: F401
     HTTPException,
     Path,
     Query,
+    Request,
     Response,
     Security,
     status,
@@ -27,11 +36,7 @@ from contracts.models.error import Error
 from contracts.models.get_health_status200_response import GetHealthStatus200Response
 
 
-router = APIRouter()
-
-ns_pkg = contracts.impl
-for _, name, _ in pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + "."):
-    importlib.import_module(name)
+router = APIRouter(route_class=MeteredRoute)
 
 
 @router.get(
@@ -47,6 +52,7 @@ for _, name, _ in pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + "."):
 async def get_health_status(
 ) -> GetHealthStatus200Response:
     """Check API health status"""
-    if not BaseHealthApi.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseHealthApi.subclasses[0]().get_health_status()
+    return await single_flight.run(
+        "get_health_status",
+        dispatcher.handler(BaseHealthApi, "get_health_status"),
+    )
@@ -1,7 +1,8 @@
 # coding: utf-8
 
-from typing import ClassVar, Dict, List, Tuple  # noqa: F401
+from typing import ClassVar, Dict, List, Optional, Tuple, Union  # noqa: F401
 
+from contracts.streaming import ListStream  # noqa: F401
 from contracts.models.error import Error
 from contracts.models.get_health_status200_response import GetHealthStatus200Response
 
@@ -12,6 +13,17 @@ class BaseHealthApi:
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
         BaseHealthApi.subclasses = BaseHealthApi.subclasses + (cls,)
+
+    async def startup(self) -> None:
+        """Called once during application startup, before the first request"""
+        ...
+
+
+    async def shutdown(self) -> None:
+        """Called once during application shutdown"""
+        ...
+
+
     async def get_health_status(
         self,
     ) -> GetHealthStatus200Response:
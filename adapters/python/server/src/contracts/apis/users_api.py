@@ -1,11 +1,21 @@
 # coding: utf-8
 
-from typing import Dict, List  # noqa: F401
-import importlib
-import pkgutil
+from typing import Dict, List, Optional  # noqa: F401
 
 from contracts.apis.users_api_base import BaseUsersApi
-import contracts.impl
+from contracts.cache import LISTS, batch_user_ids, response_cache  # noqa: F401
+from contracts.coalescing import single_flight  # noqa: F401
+from contracts.conditional import (  # noqa: F401
+    check_version,
+    conditional_response,
+    tagged_response,
+)
+from contracts.dispatcher import dispatcher
+from contracts.metrics import MeteredRoute
+from contracts.responses import trusted_response  # noqa: F401
+from contracts.streaming import ListStream  # noqa: F401
+from contracts.loader import user_loader, uses_user_loader
+from contracts.query import users_request_payload as decode_users_request_payload
 
 from fastapi import (  # noqa: F401
     APIRouter,
@@ -17,6 +27,7 @@ from fastapi import (  # noqa: F401
     HTTPException,
     Path,
     Query,
+    Request,
     Response,
     Security,
     status,
@@ -29,17 +40,97 @@ from contracts.models.error import Error
 from contracts.models.get_user_list200_response import GetUserList200Response
 from contracts.models.logout_user200_response import LogoutUser200Response
 from contracts.models.user import User
+from contracts.models.user_batch_create_request import UserBatchCreateRequest
+from contracts.models.user_batch_get_request import UserBatchGetRequest
+from contracts.models.user_batch_response import UserBatchResponse
+from contracts.models.user_batch_update_request import UserBatchUpdateRequest
 from contracts.models.user_create_request import UserCreateRequest
 from contracts.models.user_update_email_request import UserUpdateEmailRequest
 from contracts.models.user_update_request import UserUpdateRequest
-from contracts.models.object import object
+from contracts.models.users_request_payload import UsersRequestPayload
 from contracts.security_api import get_token_bearerAuth
 
-router = APIRouter()
+router = APIRouter(route_class=MeteredRoute)
+
+
+@router.post(
+    "/v1/users:batchCreate",
+    responses={
+        200: {"model": UserBatchResponse, "description": "Batch processed. Every item carries either the user or the error it failed with."},
+        400: {"model": Error, "description": "Invalid request."},
+        401: {"model": Error, "description": "Unauthorized."},
+    },
+    tags=["Users"],
+    summary="Create users in batch",
+    response_model_by_alias=True,
+)
+@trusted_response
+async def batch_create_users(
+    user_batch_create_request: UserBatchCreateRequest = Body(None, description=""),
+    token_bearerAuth: TokenModel = Security(
+        get_token_bearerAuth
+    ),
+) -> UserBatchResponse:
+    """Create up to 100 users in a single request (admin only)"""
+    result = await dispatcher.handler(BaseUsersApi, "batch_create_users")(
+        user_batch_create_request,
+    )
+    response_cache.invalidate(LISTS, *batch_user_ids(result))
+    single_flight.detach()
+    return result
+
+
+@router.post(
+    "/v1/users:batchGet",
+    responses={
+        200: {"model": UserBatchResponse, "description": "Batch processed. Every item carries either the user or the error it failed with."},
+        400: {"model": Error, "description": "Invalid request."},
+        401: {"model": Error, "description": "Unauthorized."},
+    },
+    tags=["Users"],
+    summary="Get users in batch",
+    response_model_by_alias=True,
+)
+@trusted_response
+async def batch_get_users(
+    user_batch_get_request: UserBatchGetRequest = Body(None, description=""),
+    token_bearerAuth: TokenModel = Security(
+        get_token_bearerAuth
+    ),
+) -> UserBatchResponse:
+    """Retrieve up to 100 users by their IDs in a single request"""
+    return await single_flight.run(
+        "batch_get_users",
+        dispatcher.handler(BaseUsersApi, "batch_get_users"),
+        user_batch_get_request,
+    )
+
 
-ns_pkg = contracts.impl
-for _, name, _ in pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + "."):
-    importlib.import_module(name)
+@router.patch(
+    "/v1/users:batchUpdate",
+    responses={
+        200: {"model": UserBatchResponse, "description": "Batch processed. Every item carries either the user or the error it failed with."},
+        400: {"model": Error, "description": "Invalid request."},
+        401: {"model": Error, "description": "Unauthorized."},
+    },
+    tags=["Users"],
+    summary="Update users in batch",
+    response_model_by_alias=True,
+)
+@trusted_response
+async def batch_update_users(
+    user_batch_update_request: UserBatchUpdateRequest = Body(None, description=""),
+    token_bearerAuth: TokenModel = Security(
+        get_token_bearerAuth
+    ),
+) -> UserBatchResponse:
+    """Update up to 100 users in a single request"""
+    result = await dispatcher.handler(BaseUsersApi, "batch_update_users")(
+        user_batch_update_request,
+    )
+    response_cache.invalidate(LISTS, *batch_user_ids(result))
+    single_flight.detach()
+    return result
 
 
 @router.post(
@@ -54,6 +145,7 @@ for _, name, _ in pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + "."):
     summary="Create user",
     response_model_by_alias=True,
 )
+@trusted_response
 async def create_user(
     user_create_request: UserCreateRequest = Body(None, description=""),
     token_bearerAuth: TokenModel = Security(
@@ -61,9 +153,12 @@ async def create_user(
     ),
 ) -> User:
     """Create a new user (admin only)"""
-    if not BaseUsersApi.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseUsersApi.subclasses[0]().create_user(user_create_request)
+    result = await dispatcher.handler(BaseUsersApi, "create_user")(
+        user_create_request,
+    )
+    response_cache.invalidate(LISTS, *batch_user_ids(result))
+    single_flight.detach()
+    return result
 
 
 @router.delete(
@@ -78,6 +173,7 @@ async def create_user(
     summary="Delete user",
     response_model_by_alias=True,
 )
+@trusted_response
 async def delete_user_by_id(
     userId: Annotated[StrictStr, Field(description="User unique identifier")] = Path(..., description="User unique identifier"),
     token_bearerAuth: TokenModel = Security(
@@ -85,9 +181,12 @@ async def delete_user_by_id(
     ),
 ) -> LogoutUser200Response:
     """Delete a specific user"""
-    if not BaseUsersApi.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseUsersApi.subclasses[0]().delete_user_by_id(userId)
+    result = await dispatcher.handler(BaseUsersApi, "delete_user_by_id")(
+        userId,
+    )
+    response_cache.invalidate(LISTS, userId)
+    single_flight.detach()
+    return result
 
 
 @router.get(
@@ -103,15 +202,44 @@ async def delete_user_by_id(
     response_model_by_alias=True,
 )
 async def get_user_by_id(
+    request: Request,
     userId: Annotated[StrictStr, Field(description="User unique identifier")] = Path(..., description="User unique identifier"),
     token_bearerAuth: TokenModel = Security(
         get_token_bearerAuth
     ),
 ) -> User:
     """Retrieve a specific user by their ID"""
-    if not BaseUsersApi.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseUsersApi.subclasses[0]().get_user_by_id(userId)
+    cache_key = response_cache.key(
+        "get_user_by_id", token_bearerAuth, userId
+    )
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return tagged_response(request, *cached)
+    version = await single_flight.run(
+        "get_user_version",
+        dispatcher.handler(BaseUsersApi, "get_user_version"),
+        userId,
+    )
+    unchanged = check_version(request, version)
+    if unchanged is not None:
+        return unchanged
+    load = (
+        user_loader.load
+        if uses_user_loader()
+        else dispatcher.handler(BaseUsersApi, "get_user_by_id")
+    )
+    result = await single_flight.run(
+        "get_user_by_id",
+        load,
+        userId,
+    )
+    return conditional_response(
+        request,
+        result,
+        version=version,
+        cache_key=cache_key,
+        cache_tags=(userId,),
+    )
 
 
 @router.get(
@@ -126,15 +254,32 @@ async def get_user_by_id(
     response_model_by_alias=True,
 )
 async def get_user_list(
-    users_request_payload: Annotated[object, Field(description="Filter, sort and pagination query to fetch records.")] = Query(None, description="Filter, sort and pagination query to fetch records.", alias="UsersRequestPayload"),
+    request: Request,
+    users_request_payload: UsersRequestPayload = Depends(decode_users_request_payload),
     token_bearerAuth: TokenModel = Security(
         get_token_bearerAuth
     ),
 ) -> GetUserList200Response:
     """Get users based on provided filters, sorting and pagination parameters."""
-    if not BaseUsersApi.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseUsersApi.subclasses[0]().get_user_list(users_request_payload)
+    cache_key = response_cache.key(
+        "get_user_list", token_bearerAuth, users_request_payload
+    )
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return tagged_response(request, *cached)
+    result = await single_flight.run(
+        "get_user_list",
+        dispatcher.handler(BaseUsersApi, "get_user_list"),
+        users_request_payload,
+    )
+    if isinstance(result, ListStream):
+        return result.response()
+    return conditional_response(
+        request,
+        result,
+        cache_key=cache_key,
+        cache_tags=(LISTS,),
+    )
 
 
 @router.put(
@@ -149,6 +294,7 @@ async def get_user_list(
     summary="Update user",
     response_model_by_alias=True,
 )
+@trusted_response
 async def update_user_by_id(
     userId: Annotated[StrictStr, Field(description="User unique identifier")] = Path(..., description="User unique identifier"),
     user_update_request: UserUpdateRequest = Body(None, description=""),
@@ -157,9 +303,13 @@ async def update_user_by_id(
     ),
 ) -> User:
     """Update a specific user&#39;s information"""
-    if not BaseUsersApi.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseUsersApi.subclasses[0]().update_user_by_id(userId, user_update_request)
+    result = await dispatcher.handler(BaseUsersApi, "update_user_by_id")(
+        userId,
+        user_update_request,
+    )
+    response_cache.invalidate(LISTS, userId)
+    single_flight.detach()
+    return result
 
 
 @router.put(
@@ -175,6 +325,7 @@ async def update_user_by_id(
     summary="Update user email",
     response_model_by_alias=True,
 )
+@trusted_response
 async def update_user_email(
     userId: Annotated[StrictStr, Field(description="User unique identifier")] = Path(..., description="User unique identifier"),
     user_update_email_request: UserUpdateEmailRequest = Body(None, description=""),
@@ -183,6 +334,10 @@ async def update_user_email(
     ),
 ) -> User:
     """Update user email address (requires password confirmation)"""
-    if not BaseUsersApi.subclasses:
-        raise HTTPException(status_code=500, detail="Not implemented")
-    return await BaseUsersApi.subclasses[0]().update_user_email(userId, user_update_email_request)
+    result = await dispatcher.handler(BaseUsersApi, "update_user_email")(
+        userId,
+        user_update_email_request,
+    )
+    response_cache.invalidate(LISTS, userId)
+    single_flight.detach()
+    return result
@@ -1,17 +1,22 @@
 # coding: utf-8
 
-from typing import ClassVar, Dict, List, Tuple  # noqa: F401
+from typing import ClassVar, Dict, List, Optional, Tuple, Union  # noqa: F401
 
+from contracts.streaming import ListStream  # noqa: F401
 from pydantic import Field, StrictStr
 from typing_extensions import Annotated
 from contracts.models.error import Error
 from contracts.models.get_user_list200_response import GetUserList200Response
 from contracts.models.logout_user200_response import LogoutUser200Response
 from contracts.models.user import User
+from contracts.models.user_batch_create_request import UserBatchCreateRequest
+from contracts.models.user_batch_get_request import UserBatchGetRequest
+from contracts.models.user_batch_response import UserBatchResponse
+from contracts.models.user_batch_update_request import UserBatchUpdateRequest
 from contracts.models.user_create_request import UserCreateRequest
 from contracts.models.user_update_email_request import UserUpdateEmailRequest
 from contracts.models.user_update_request import UserUpdateRequest
-from contracts.models.object import object
+from contracts.models.users_request_payload import UsersRequestPayload
 from contracts.security_api import get_token_bearerAuth
 
 class BaseUsersApi:
@@ -20,6 +25,41 @@ class BaseUsersApi:
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
         BaseUsersApi.subclasses = BaseUsersApi.subclasses + (cls,)
+
+    async def startup(self) -> None:
+        """Called once during application startup, before the first request"""
+        ...
+
+
+    async def shutdown(self) -> None:
+        """Called once during application shutdown"""
+        ...
+
+
+    async def batch_create_users(
+        self,
+        user_batch_create_request: UserBatchCreateRequest,
+    ) -> UserBatchResponse:
+        """Create up to 100 users in a single request (admin only)"""
+        ...
+
+
+    async def batch_get_users(
+        self,
+        user_batch_get_request: UserBatchGetRequest,
+    ) -> UserBatchResponse:
+        """Retrieve up to 100 users by their IDs in a single request"""
+        ...
+
+
+    async def batch_update_users(
+        self,
+        user_batch_update_request: UserBatchUpdateRequest,
+    ) -> UserBatchResponse:
+        """Update up to 100 users in a single request"""
+        ...
+
+
     async def create_user(
         self,
         user_create_request: UserCreateRequest,
@@ -44,11 +84,32 @@ class BaseUsersApi:
         ...
 
 
+    async def get_user_version(
+        self,
+        userId: Annotated[StrictStr, Field(description="User unique identifier")],
+    ) -> Optional[str]:
+        """Return a version tag for `get_user_by_id`, or `None` if unknown
+
+        Optional. The tag becomes the strong ETag of `get_user_by_id`, so it
+        must change whenever the representation does (e.g. a row version or an
+        `updatedAt` timestamp). Implementing it lets requests with a matching
+        `If-None-Match` be answered with `304` without calling
+        `get_user_by_id`; otherwise the ETag is a hash of the response body.
+        """
+        ...
+
+
     async def get_user_list(
         self,
-        users_request_payload: Annotated[object, Field(description="Filter, sort and pagination query to fetch records.")],
-    ) -> GetUserList200Response:
-        """Get users based on provided filters, sorting and pagination parameters."""
+        users_request_payload: Annotated[UsersRequestPayload, Field(description="Filter, sort and pagination query to fetch records.")],
+    ) -> Union[GetUserList200Response, ListStream]:
+        """Get users based on provided filters, sorting and pagination parameters.
+
+        `users_request_payload` is validated already (see `contracts.query`)
+        and may be shared with other requests, so do not modify it.
+        Return a `ListStream` to stream large pages instead of building the
+        whole response in memory.
+        """
         ...
 
 
@@ -0,0 +1,212 @@
+# coding: utf-8
+
+"""Opt-in cache of rendered responses for read routes.
+
+With `CONTRACTS_RESPONSE_CACHE` enabled, `get_user_by_id` and `get_user_list`
+keep the bytes and ETag they sent, keyed by operation, arguments
+(`UsersRequestPayload` in canonical form), the `sub` of the caller's token and
+the negotiated media type,
+so a hit costs neither an implementation call nor serialization. The cache is
+bounded by the total size of the stored bodies, evicting the least recently
+used first, and entries expire after a TTL.
+
+Entries are tagged with the users they show. Successful writes through this
+server invalidate the tags they touch: updates and deletes drop the user's own
+entries, and every write drops all cached lists, whose membership or totals
+it may change. Writes made elsewhere (another worker or service) are only
+picked up once the TTL expires, so keep it as short as staleness allows. A
+response whose loading overlapped a write is sent but not stored.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from contracts.models.extra_models import TokenModel
+from contracts.responses import media_type
+from contracts.settings import Settings, settings
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 30.0
+
+# Tag shared by every cached list response
+LISTS = "lists"
+
+# Rough bookkeeping cost of one entry (key, tags, dict slots), in bytes
+_ENTRY_OVERHEAD = 256
+
+# Expiry, body, ETag and tags of a cached response
+_Entry = Tuple[float, bytes, str, Tuple[str, ...]]
+
+
+class CacheKey(tuple):
+    """Cache key of one call; remembers how many invalidations preceded it, so
+    a response loaded while a write went through is not stored afterwards"""
+
+    generation: int
+
+    def __new__(cls, parts: Iterable[Hashable], generation: int) -> "CacheKey":
+        key = super().__new__(cls, parts)
+        key.generation = generation
+        return key
+
+
+def canonical(value: Any) -> Hashable:
+    """Return a hashable form of a request argument in which equivalent values
+    compare equal (models and JSON objects with the same members in another
+    order, ...). Strings, such as path ids, are kept verbatim: `" 42"` and
+    `"42"` name different users."""
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return value
+    if isinstance(value, BaseModel):
+        value = value.model_dump(by_alias=True, exclude_none=True)
+    try:
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    except (TypeError, ValueError):
+        return repr(value)
+
+
+def batch_user_ids(result: Any) -> List[str]:
+    """Return the ids of the users a batch write response reports as written"""
+    return [
+        item.id
+        for item in getattr(result, "results", None) or ()
+        if item.user is not None
+    ]
+
+
+class ResponseCache:
+    """LRU cache of `(body, etag)` pairs bounded by bytes and age.
+
+    :param max_bytes: Upper bound on the summed size of the cached entries;
+        0 disables the cache
+    :param ttl: Seconds an entry is served for
+    :param clock: Returns a monotonic time in seconds
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.bytes = 0
+        self._generation = 0
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._tagged: Dict[str, Set[CacheKey]] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ResponseCache":
+        return cls(
+            max_bytes=settings.response_cache_bytes if settings.response_cache else 0,
+            ttl=settings.response_cache_ttl,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def key(
+        self, operation: str, token: Optional[TokenModel], *args: Any
+    ) -> Optional[CacheKey]:
+        """Build the key of a call to `operation`, or None if the cache is off"""
+        if not self.enabled:
+            return None
+        scope = token.sub if token is not None else None
+        return CacheKey(
+            (operation, scope, media_type.get())
+            + tuple(canonical(arg) for arg in args),
+            self._generation,
+        )
+
+    def get(self, key: Optional[CacheKey]) -> Optional[Tuple[bytes, str]]:
+        """Return the cached `(body, etag)` of `key`, or None"""
+        if key is None:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= self.clock():
+            self._drop(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def put(
+        self, key: Optional[CacheKey], body: bytes, etag: str, tags: Iterable[str] = ()
+    ) -> None:
+        """Store a rendered response, tagged with the resources it shows"""
+        if key is None or key.generation != self._generation:
+            return
+        size = self._size(body, etag)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        tags = tuple(tags)
+        self._entries[key] = (self.clock() + self.ttl, body, etag, tags)
+        self.bytes += size
+        for tag in tags:
+            self._tagged.setdefault(tag, set()).add(key)
+        while self.bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every entry carrying one of `tags`"""
+        self._generation += 1
+        if not self._entries:
+            return
+        for tag in tags:
+            for key in self._tagged.pop(tag, ()):
+                if key in self._entries:
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tagged.clear()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    @staticmethod
+    def _size(body: bytes, etag: str) -> int:
+        return len(body) + len(etag) + _ENTRY_OVERHEAD
+
+    def _drop(self, key: CacheKey) -> None:
+        _, body, etag, tags = self._entries.pop(key)
+        self.bytes -= self._size(body, etag)
+        for tag in tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+
+response_cache = ResponseCache.from_settings(settings)
@@ -0,0 +1,94 @@
+# coding: utf-8
+
+"""Single-flight coalescing of concurrent identical reads.
+
+For the operations listed in `CONTRACTS_SINGLE_FLIGHT`, a call whose
+operation and arguments (in the canonical form of `contracts.cache`, where
+strings such as ids are compared verbatim) match a call still in flight
+does not reach the implementation: it waits for the first one and receives
+the same result, or the same exception. The shared call runs as its own
+task, so a client that disconnects does not cancel it for the others.
+
+Only read operations may be listed; a `ListStream` can be consumed once, so
+waiters that get one call the implementation themselves. Write routes detach
+the calls in flight, so a read that starts after a write never joins a read
+that started before it.
+"""
+
+import asyncio
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from contracts.cache import canonical
+from contracts.settings import settings
+from contracts.streaming import ListStream
+
+
+class SingleFlight:
+    """Shares in-flight calls of the given operations between callers.
+
+    :param operations: Names of the operations to coalesce, e.g.
+        `get_user_by_id`; None or empty coalesces nothing
+    """
+
+    def __init__(self, operations: Optional[Iterable[str]] = None) -> None:
+        self.operations: Set[str] = set(operations or ())
+        self.calls: Dict[str, int] = {}
+        self.collapsed: Dict[str, int] = {}
+        self._flights: Dict[Tuple[Hashable, ...], "asyncio.Future[Any]"] = {}
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            operation: {
+                "calls": self.calls.get(operation, 0),
+                "collapsed": self.collapsed.get(operation, 0),
+            }
+            for operation in sorted(self.operations)
+        }
+
+    async def run(
+        self, operation: str, call: Callable[..., Awaitable[Any]], *args: Any
+    ) -> Any:
+        """Await `call(*args)`, or the identical call of `operation` already
+        in flight"""
+        if operation not in self.operations:
+            return await call(*args)
+        key = (operation,) + tuple(canonical(arg) for arg in args)
+        flight = self._flights.get(key)
+        if flight is None:
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+            flight = asyncio.ensure_future(call(*args))
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._land(key, done))
+            return await asyncio.shield(flight)
+        self.collapsed[operation] = self.collapsed.get(operation, 0) + 1
+        result = await asyncio.shield(flight)
+        if isinstance(result, ListStream):
+            self.collapsed[operation] -= 1
+            return await call(*args)
+        return result
+
+    def detach(self) -> None:
+        """Let calls made from now on start afresh instead of joining calls
+        already in flight, e.g. after a write those may not reflect"""
+        self._flights.clear()
+
+    def _land(self, key: Tuple[Hashable, ...], flight: "asyncio.Future[Any]") -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # retrieved here so a failure nobody waits for any more is not
+            # reported as "never retrieved"
+            flight.exception()
+
+
+single_flight = SingleFlight(settings.single_flight)
@@ -0,0 +1,306 @@
+# coding: utf-8
+
+"""Negotiated response compression.
+
+`CompressionMiddleware` is a pure ASGI middleware that picks the best
+encoding the client accepts (`Accept-Encoding`, honouring q-values) among
+zstd, brotli and gzip; zstd and brotli are offered only when the optional
+`zstandard` and `brotli` packages are installed. Only JSON, MessagePack and
+text bodies are compressed, and only from `minimum_size` bytes on, so small
+answers such as the health check are sent as they are.
+
+The threshold can be set per operation in `ROUTE_MINIMUM_SIZE`, where `None`
+turns compression off for that operation. Streamed bodies (`ListStream`) are
+compressed chunk by chunk, flushing after every chunk, so they are never
+buffered beyond the threshold.
+
+A compressed response carries a weak version of the route's ETag, since the
+bytes differ from the identity representation; `If-None-Match` compares
+weakly, so revalidation keeps working. Bytes in and out and the CPU time
+spent compressing are counted per encoding in `compression_stats`.
+"""
+
+import time
+import zlib
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+DEFAULT_MINIMUM_SIZE = 1024
+
+# Minimum body size per operation where it differs from the default; None
+# disables compression for that operation
+ROUTE_MINIMUM_SIZE: Dict[str, Optional[int]] = {
+    "get_health_status": None,
+}
+
+_COMPRESSIBLE_TYPES = ("application/json", "application/msgpack", "text/")
+
+Message = Dict[str, Any]
+Send = Callable[[Message], Awaitable[None]]
+
+
+class _Gzip:
+    def __init__(self) -> None:
+        self._compressor = zlib.compressobj(5, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self) -> None:
+        self._compressor = brotli.Compressor(quality=4)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class _Zstd:
+    def __init__(self) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=3).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+# Available encodings, most preferred first when the client has no preference
+ENCODINGS: Dict[str, Callable[[], Any]] = {}
+if zstandard is not None:
+    ENCODINGS["zstd"] = _Zstd
+if brotli is not None:
+    ENCODINGS["br"] = _Brotli
+ENCODINGS["gzip"] = _Gzip
+
+
+def negotiate(
+    accept_encoding: Optional[str], available: Mapping[str, Any] = ENCODINGS
+) -> Optional[str]:
+    """Return the available encoding the client prefers, or None for identity"""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        if name:
+            weights[name] = weight
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class CompressionStats:
+    """Per-encoding counters of compressed responses"""
+
+    def __init__(self) -> None:
+        self.encodings: Dict[str, Dict[str, float]] = {}
+
+    def _counters(self, encoding: str) -> Dict[str, float]:
+        counters = self.encodings.get(encoding)
+        if counters is None:
+            counters = self.encodings[encoding] = {
+                "responses": 0,
+                "bytes_in": 0,
+                "bytes_out": 0,
+                "cpu_seconds": 0.0,
+            }
+        return counters
+
+    def count_response(self, encoding: str) -> None:
+        self._counters(encoding)["responses"] += 1
+
+    def record(
+        self, encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float
+    ) -> None:
+        counters = self._counters(encoding)
+        counters["bytes_in"] += bytes_in
+        counters["bytes_out"] += bytes_out
+        counters["cpu_seconds"] += cpu_seconds
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            encoding: dict(
+                counters, bytes_saved=counters["bytes_in"] - counters["bytes_out"]
+            )
+            for encoding, counters in self.encodings.items()
+        }
+
+    def clear(self) -> None:
+        self.encodings.clear()
+
+
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """Compress HTTP response bodies with the encoding the client prefers.
+
+    :param app: The ASGI application to wrap
+    :param minimum_size: Smallest body, in bytes, worth compressing
+    :param route_minimum_size: Per-operation thresholds overriding
+        `minimum_size`, keyed by endpoint name; None disables compression
+    :param stats: Where bytes and CPU time are accounted
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        route_minimum_size: Optional[Mapping[str, Optional[int]]] = None,
+        stats: CompressionStats = compression_stats,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.route_minimum_size = (
+            ROUTE_MINIMUM_SIZE if route_minimum_size is None else route_minimum_size
+        )
+        self.stats = stats
+
+    async def __call__(self, scope: Message, receive: Callable, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self, scope, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def threshold(self, scope: Message) -> Optional[int]:
+        """Minimum body size for the operation that served `scope`, or None"""
+        name = getattr(scope.get("endpoint"), "__name__", None)
+        return self.route_minimum_size.get(name, self.minimum_size)
+
+
+class _CompressingResponder:
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        scope: Message,
+        encoding: str,
+        send: Send,
+    ) -> None:
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self.downstream = send
+        self.start: Optional[Message] = None
+        self.threshold: Optional[int] = None
+        self.buffered: List[bytes] = []
+        self.buffered_size = 0
+        self.compressor: Any = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self.passthrough:
+            await self.downstream(message)
+        elif message["type"] == "http.response.start":
+            self.start = message
+            self.threshold = self._threshold(message)
+            if self.threshold is None:
+                await self._pass(message)
+        elif message["type"] != "http.response.body":
+            await self.downstream(message)
+        elif self.compressor is not None:
+            await self._compress(
+                message.get("body", b""), message.get("more_body", False)
+            )
+        else:
+            await self._buffer(
+                message.get("body", b""), message.get("more_body", False)
+            )
+
+    def _threshold(self, start: Message) -> Optional[int]:
+        headers = Headers(raw=start["headers"])
+        if start["status"] < 200 or start["status"] in (204, 206, 304):
+            return None
+        if "content-encoding" in headers:
+            return None
+        if not headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES):
+            return None
+        return self.middleware.threshold(self.scope)
+
+    async def _pass(self, message: Message) -> None:
+        self.passthrough = True
+        await self.downstream(message)
+
+    async def _buffer(self, body: bytes, more_body: bool) -> None:
+        self.buffered.append(body)
+        self.buffered_size += len(body)
+        if more_body and self.buffered_size < self.threshold:
+            return
+        data = b"".join(self.buffered)
+        self.buffered.clear()
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if not more_body and len(data) < self.threshold:
+            await self._pass(self.start)
+            await self.downstream({"type": "http.response.body", "body": data})
+            return
+        headers["Content-Encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+        self.compressor = ENCODINGS[self.encoding]()
+        self.middleware.stats.count_response(self.encoding)
+        if more_body:
+            del headers["Content-Length"]
+            await self.downstream(self.start)
+            await self._compress(data, more_body)
+            return
+        compressed = self._run(self.compressor.finish, data)
+        headers["Content-Length"] = str(len(compressed))
+        await self.downstream(self.start)
+        await self.downstream({"type": "http.response.body", "body": compressed})
+
+    async def _compress(self, body: bytes, more_body: bool) -> None:
+        if more_body:
+            data = self._run(self.compressor.compress, body) if body else b""
+        else:
+            data = self._run(self.compressor.finish, body)
+        await self.downstream(
+            {"type": "http.response.body", "body": data, "more_body": more_body}
+        )
+
+    def _run(self, step: Callable[[bytes], bytes], data: bytes) -> bytes:
+        started = time.thread_time()
+        compressed = step(data)
+        self.middleware.stats.record(
+            self.encoding, len(data), len(compressed), time.thread_time() - started
+        )
+        return compressed
@@ -0,0 +1,114 @@
+# coding: utf-8
+
+"""Strong ETags and `If-None-Match` handling for read routes.
+
+The ETag of a response is either the version tag the implementation reports
+for the resource (quoted as is) or, when it has none, a hash of the rendered
+JSON bytes. A request whose `If-None-Match` lists the current tag is answered
+with `304 Not Modified` and an empty body; when the tag comes from a version
+hook, the resource is neither loaded nor serialized.
+"""
+
+import hashlib
+from typing import Any, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from contracts.cache import CacheKey, response_cache
+from contracts.responses import JSON, media_type, negotiated_headers, render_as
+from contracts.settings import settings
+
+
+def quote_etag(version: str) -> str:
+    """Return `version` as a strong entity tag"""
+    return '"%s"' % version.replace('"', "")
+
+
+def body_etag(body: bytes) -> str:
+    """Return a strong entity tag derived from the bytes of a representation"""
+    return quote_etag(hashlib.blake2b(body, digest_size=16).hexdigest())
+
+
+def version_etag(version: str) -> str:
+    """Return the strong entity tag of a version in the negotiated media type"""
+    media = media_type.get()
+    return quote_etag(
+        version if media == JSON else "%s+%s" % (version, media.rsplit("/", 1)[-1])
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an `If-None-Match` header value matches `etag`.
+
+    Uses the weak comparison RFC 9110 prescribes for `If-None-Match`, so a
+    `W/` prefix sent by an intermediary does not defeat the match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def check_version(request: Request, version: Optional[str]) -> Optional[Response]:
+    """Answer `304` from a version tag, before the resource is loaded.
+
+    Returns `None` when the implementation has no version tag or the client's
+    copy is stale, in which case the route proceeds as usual.
+    """
+    if version is None:
+        return None
+    etag = version_etag(version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    return None
+
+
+def render_tagged(
+    result: BaseModel, version: Optional[str] = None
+) -> Tuple[bytes, str]:
+    """Render `result` in the negotiated media type and return the bytes with
+    their ETag"""
+    if settings.verify_responses:
+        result = type(result).model_validate(result.model_dump())
+    body = render_as(result, media_type.get())
+    return body, version_etag(version) if version is not None else body_etag(body)
+
+
+def tagged_response(request: Request, body: bytes, etag: str) -> Response:
+    """Send `body` with its ETag, or `304` if the client already has it"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    headers = negotiated_headers()
+    headers["ETag"] = etag
+    return Response(content=body, media_type=media_type.get(), headers=headers)
+
+
+def conditional_response(
+    request: Request,
+    result: Any,
+    version: Optional[str] = None,
+    cache_key: Optional[CacheKey] = None,
+    cache_tags: Iterable[str] = (),
+) -> Any:
+    """Render `result` with a strong ETag, or `304` if the client has it.
+
+    With a `cache_key` the rendered body is also stored in `response_cache`.
+    Anything but a model (e.g. a streamed response) is returned untouched.
+    """
+    if not isinstance(result, BaseModel):
+        return result
+    body, etag = render_tagged(result, version)
+    response_cache.put(cache_key, body, etag, cache_tags)
+    return tagged_response(request, body, etag)
@@ -0,0 +1,88 @@
+# coding: utf-8
+
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple  # noqa: F401
+
+from fastapi import HTTPException
+
+logger = logging.getLogger("contracts.dispatcher")
+
+
+class ImplementationDispatcher:
+    """Owns one long-lived instance of each registered API implementation.
+
+    Instances are built once when the application starts (see the lifespan in
+    `contracts.main`) instead of on every request, so implementations can keep
+    connection pools, caches and other state in `__init__`/`startup`.
+    Routers resolve operations through `handler`, which returns a cached bound
+    method, wrapped by `instrument` when one is set.
+    """
+
+    def __init__(self) -> None:
+        self._instances: Dict[type, Any] = {}
+        self._handlers: Dict[Tuple[type, str], Callable] = {}
+        self._started = False
+        self.instrument: Optional[Callable[[Callable], Callable]] = None
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    async def startup(self, bases: Iterable[type]) -> None:
+        """Instantiate the first registered implementation of every base API
+        and await its `startup` hook. If one fails, the instances already
+        started are shut down before the error propagates."""
+        try:
+            for base in bases:
+                if base in self._instances or not base.subclasses:
+                    continue
+                instance = base.subclasses[0]()
+                await instance.startup()
+                self._instances[base] = instance
+        except BaseException:
+            await self.shutdown()
+            raise
+        self._started = True
+
+    async def shutdown(self) -> None:
+        """Await the `shutdown` hook of every instance, newest first, and drop
+        all cached handlers. A failing hook is logged and does not keep the
+        others from running."""
+        instances = list(self._instances.values())
+        self._instances.clear()
+        self._handlers.clear()
+        self._started = False
+        for instance in reversed(instances):
+            try:
+                await instance.shutdown()
+            except Exception:
+                logger.exception("Shutdown of %s failed", type(instance).__name__)
+
+    def instance(self, base: type) -> Any:
+        """Return the live implementation instance of `base`"""
+        try:
+            return self._instances[base]
+        except KeyError:
+            if not base.subclasses:
+                raise HTTPException(status_code=500, detail="Not implemented")
+            if not self._started:
+                raise RuntimeError(
+                    "%s is registered but the application lifespan has not "
+                    "started" % base.subclasses[0].__name__
+                )
+            raise HTTPException(status_code=500, detail="Not implemented")
+
+    def handler(self, base: type, operation: str) -> Callable:
+        """Return the cached bound method implementing `operation`"""
+        key = (base, operation)
+        try:
+            return self._handlers[key]
+        except KeyError:
+            bound = getattr(self.instance(base), operation)
+            if self.instrument is not None:
+                bound = self.instrument(bound)
+            self._handlers[key] = bound
+            return bound
+
+
+dispatcher = ImplementationDispatcher()
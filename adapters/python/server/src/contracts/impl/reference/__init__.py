@@ -0,0 +1,8 @@
+# coding: utf-8
+
+"""Reference implementations of the base APIs.
+
+The scan of `contracts.impl` imports this package but none of its modules,
+so they never replace the implementations of an application. Select one
+explicitly, e.g. `CONTRACTS_IMPL_MODULES=contracts.impl.reference.users`.
+"""
@@ -0,0 +1,703 @@
+# coding: utf-8
+
+"""In-memory reference implementation of `BaseUsersApi`.
+
+Selected with `CONTRACTS_IMPL_MODULES=contracts.impl.reference.users`. Users
+are kept in the numbered slots of one process, so every worker of
+`contracts.serve` has a store of its own: use it for development, for tests
+and as a model of how to back `get_user_list`, not in production.
+
+`filter.text` is answered by a `TextIndex`, an inverted index from the
+4-grams of every user's casefolded email, first name and last name to the
+sorted slots containing them. A query of four characters or more reads the
+slots of its rarest gram and keeps those whose fields contain the whole
+query; a shorter one takes the slots of every gram containing it.
+`filter.statuses` and `filter.roles` are answered by one `Bitmap` per status
+and role, checked against the text matches or, without text, against the
+slots in order. `sortBy: [FULL_NAME]` is answered by `by_name`, a
+`SortedList` of every user's precomputed name key and id, read from the
+position of the offset or cursor in O(log n + limit) without a filter.
+Creates, updates and deletes maintain all of them in place.
+"""
+
+import hashlib
+import hmac
+import itertools
+import math
+import operator
+import os
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timezone
+from functools import reduce
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from fastapi import HTTPException
+
+from contracts.apis.users_api_base import BaseUsersApi
+from contracts.models.error import Error
+from contracts.models.get_user_list200_response import GetUserList200Response
+from contracts.models.logout_user200_response import LogoutUser200Response
+from contracts.models.order import Order
+from contracts.models.pagination_meta import PaginationMeta
+from contracts.models.user import User
+from contracts.models.user_batch_response import UserBatchResponse
+from contracts.models.user_batch_result import UserBatchResult
+from contracts.models.user_role import UserRole
+from contracts.models.user_sort_field import UserSortField
+from contracts.models.user_status import UserStatus
+from contracts.models.users_request_payload_filter import UsersRequestPayloadFilter
+from contracts.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    user_sort_key,
+)
+
+NGRAM = 4
+PASSWORD_ITERATIONS = 10000
+
+# Joins the indexed fields of a user; never part of a query
+_SEPARATOR = "\x00"
+
+_popcount = getattr(int, "bit_count", None) or (lambda value: bin(value).count("1"))
+
+
+def ngrams(text: str, n: int = NGRAM) -> Set[str]:
+    """Distinct `n`-grams of `text`; a shorter text is its own only gram"""
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class Bitmap:
+    """Set of slots, one bit each, in a bytearray that grows as needed"""
+
+    __slots__ = ("bits", "count")
+
+    def __init__(self) -> None:
+        self.bits = bytearray()
+        self.count = 0
+
+    def __contains__(self, slot: int) -> bool:
+        index = slot >> 3
+        return index < len(self.bits) and self.bits[index] >> (slot & 7) & 1 == 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, slot: int) -> None:
+        index = slot >> 3
+        if index >= len(self.bits):
+            self.bits.extend(bytes(max(index + 1 - len(self.bits), len(self.bits))))
+        mask = 1 << (slot & 7)
+        if not self.bits[index] & mask:
+            self.bits[index] |= mask
+            self.count += 1
+
+    def discard(self, slot: int) -> None:
+        index = slot >> 3
+        mask = 1 << (slot & 7)
+        if index < len(self.bits) and self.bits[index] & mask:
+            self.bits[index] ^= mask
+            self.count -= 1
+
+    def to_int(self) -> int:
+        """The bitmap as an integer, to combine bitmaps with `&` and `|`"""
+        return int.from_bytes(self.bits, "little")
+
+
+class SortedList:
+    """Sorted list kept in blocks of at most `2 * load` items, so that adding
+    or removing an item moves one block rather than the whole list, and the
+    item at any position is found by bisecting the blocks' start positions.
+
+    :param load: Size blocks are split back to
+    """
+
+    def __init__(self, load: int = 1000) -> None:
+        self.load = load
+        self.blocks: List[list] = []
+        # Last item of every block
+        self.maxes: List[Any] = []
+        # Position of the first item of every block, rebuilt after writes
+        self._starts: Optional[List[int]] = None
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Any]:
+        return itertools.chain.from_iterable(self.blocks)
+
+    def add(self, item: Any) -> None:
+        self._starts = None
+        self.size += 1
+        if not self.blocks:
+            self.blocks.append([item])
+            self.maxes.append(item)
+            return
+        index = bisect_left(self.maxes, item)
+        if index == len(self.maxes):
+            index -= 1
+            self.blocks[index].append(item)
+            self.maxes[index] = item
+        else:
+            insort(self.blocks[index], item)
+        block = self.blocks[index]
+        if len(block) > 2 * self.load:
+            self.blocks.insert(index + 1, block[self.load:])
+            del block[self.load:]
+            self.maxes.insert(index, block[-1])
+
+    def remove(self, item: Any) -> None:
+        index = bisect_left(self.maxes, item)
+        block = self.blocks[index] if index < len(self.blocks) else []
+        position = bisect_left(block, item)
+        if position == len(block) or block[position] != item:
+            raise ValueError("%r is not in the list" % (item,))
+        self._starts = None
+        self.size -= 1
+        del block[position]
+        if block:
+            self.maxes[index] = block[-1]
+        else:
+            del self.blocks[index]
+            del self.maxes[index]
+
+    def index(self, item: Any) -> int:
+        """Number of items smaller than `item`"""
+        index = bisect_left(self.maxes, item)
+        if index == len(self.maxes):
+            return self.size
+        return self._block_starts()[index] + bisect_left(self.blocks[index], item)
+
+    def iterate(self, start: int = 0, reverse: bool = False) -> Iterator[Any]:
+        """Items from position `start` on, ascending, or with `reverse` from
+        position `start` counted from the end, descending"""
+        if reverse:
+            start = self.size - 1 - start
+        if not 0 <= start < self.size:
+            return iter(())
+        index = bisect_right(self._block_starts(), start) - 1
+        offset = start - self._starts[index]
+        blocks = self.blocks
+        if reverse:
+            return itertools.chain(
+                reversed(blocks[index][:offset + 1]),
+                itertools.chain.from_iterable(map(reversed, reversed(blocks[:index]))),
+            )
+        return itertools.chain(
+            blocks[index][offset:],
+            itertools.chain.from_iterable(itertools.islice(blocks, index + 1, None)),
+        )
+
+    def _block_starts(self) -> List[int]:
+        if self._starts is None:
+            self._starts = [0]
+            self._starts.extend(itertools.accumulate(map(len, self.blocks[:-1])))
+        return self._starts
+
+
+class TextIndex:
+    """Inverted index from the n-grams of documents to the sorted slots of
+    the documents containing them. A document is a few short fields; grams
+    never span two fields.
+
+    :param n: Length of the grams
+    """
+
+    def __init__(self, n: int = NGRAM) -> None:
+        self.n = n
+        self.postings: Dict[str, array] = {}
+        # Grams containing each string shorter than n, for short queries
+        self.containing: Dict[str, Set[str]] = {}
+        # Casefolded fields joined by _SEPARATOR, by slot; None when removed
+        self.documents: List[Optional[str]] = []
+
+    def grams(self, fields: Sequence[str]) -> Set[str]:
+        grams: Set[str] = set()
+        for field in fields:
+            grams |= ngrams(field, self.n)
+        return grams
+
+    def add(self, slot: int, fields: Sequence[str]) -> None:
+        fields = [field.casefold() for field in fields]
+        if slot >= len(self.documents):
+            self.documents.extend([None] * (slot + 1 - len(self.documents)))
+        self.documents[slot] = _SEPARATOR.join(fields)
+        for gram in self.grams(fields):
+            self._post(gram, slot)
+
+    def remove(self, slot: int) -> None:
+        document = self.documents[slot] if slot < len(self.documents) else None
+        if document is not None:
+            self.documents[slot] = None
+            for gram in self.grams(document.split(_SEPARATOR)):
+                self._unpost(gram, slot)
+
+    def update(self, slot: int, fields: Sequence[str]) -> None:
+        """Re-index `slot`, touching only the grams that changed"""
+        fields = [field.casefold() for field in fields]
+        document = _SEPARATOR.join(fields)
+        previous = self.documents[slot] if slot < len(self.documents) else None
+        if previous is None:
+            self.add(slot, fields)
+            return
+        if previous == document:
+            return
+        self.documents[slot] = document
+        old = self.grams(previous.split(_SEPARATOR))
+        new = self.grams(fields)
+        for gram in old - new:
+            self._unpost(gram, slot)
+        for gram in new - old:
+            self._post(gram, slot)
+
+    def search(self, query: str) -> List[int]:
+        """Slots of the documents containing `query`, ascending"""
+        query = query.casefold()
+        if not query or _SEPARATOR in query:
+            return []
+        if len(query) < self.n:
+            # Every gram containing the query is a field containing it
+            postings = self.postings
+            found: Set[int] = set()
+            found.update(*(postings[gram] for gram in self.containing.get(query, ())))
+            return sorted(found)
+        rarest = None
+        for gram in ngrams(query, self.n):
+            slots = self.postings.get(gram)
+            if slots is None:
+                return []
+            if rarest is None or len(slots) < len(rarest):
+                rarest = slots
+        if len(query) == self.n:
+            return rarest.tolist()
+        # Keep the candidates whose fields contain the whole query, in C
+        documents = map(self.documents.__getitem__, rarest)
+        return list(
+            itertools.compress(
+                rarest, map(operator.contains, documents, itertools.repeat(query))
+            )
+        )
+
+    def _post(self, gram: str, slot: int) -> None:
+        slots = self.postings.get(gram)
+        if slots is None:
+            self.postings[gram] = array("i", (slot,))
+            for part in _parts(gram, self.n):
+                self.containing.setdefault(part, set()).add(gram)
+        elif slots[-1] < slot:
+            slots.append(slot)
+        else:
+            insort(slots, slot)
+
+    def _unpost(self, gram: str, slot: int) -> None:
+        slots = self.postings[gram]
+        index = bisect_left(slots, slot)
+        if index < len(slots) and slots[index] == slot:
+            del slots[index]
+            if not slots:
+                del self.postings[gram]
+                for part in _parts(gram, self.n):
+                    grams = self.containing[part]
+                    grams.discard(gram)
+                    if not grams:
+                        del self.containing[part]
+
+
+def _parts(gram: str, n: int) -> Set[str]:
+    """Substrings of `gram` shorter than `n`"""
+    return {
+        gram[start:start + length]
+        for length in range(1, min(len(gram), n - 1) + 1)
+        for start in range(len(gram) - length + 1)
+    }
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _hash_password(password: str, salt: Optional[bytes] = None) -> Tuple[bytes, bytes]:
+    salt = salt or os.urandom(16)
+    return salt, hashlib.pbkdf2_hmac(
+        "sha256", password.encode("utf-8"), salt, PASSWORD_ITERATIONS
+    )
+
+
+def _not_found() -> HTTPException:
+    return HTTPException(status_code=404, detail="User not found")
+
+
+def _error_of(exc: HTTPException) -> Error:
+    code = {404: "ERR_NOT_FOUND", 409: "ERR_ALREADY_EXISTS", 403: "ERR_ACCESS_DENIED"}
+    return Error(
+        code=code.get(exc.status_code, "ERR_INVALID_ARG"), message=str(exc.detail)
+    )
+
+
+class InMemoryUsersApi(BaseUsersApi):
+    """Users kept in memory, with indexes for `get_user_list` filters"""
+
+    def __init__(self) -> None:
+        self.users: List[Optional[User]] = []
+        self.slots: Dict[str, int] = {}
+        self.emails: Dict[str, int] = {}
+        self.passwords: Dict[int, Tuple[bytes, bytes]] = {}
+        self.versions: Dict[int, int] = {}
+        self.text = TextIndex()
+        self.statuses = {status: Bitmap() for status in UserStatus}
+        self.roles = {role: Bitmap() for role in UserRole}
+        # Collation key of every user's full name, by slot
+        self.name_keys: List[Optional[str]] = []
+        # (name key, id, slot) of every user, in FULL_NAME order
+        self.by_name = SortedList()
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def load(self, users: Iterable[User]) -> None:
+        """Add existing users, e.g. to seed the store; ids and emails must be
+        unique"""
+        for user in users:
+            self._insert(user)
+
+    def _insert(self, user: User) -> int:
+        if user.id in self.slots:
+            raise HTTPException(status_code=409, detail="User already exists")
+        email = user.email.casefold()
+        if email in self.emails:
+            raise HTTPException(status_code=409, detail="User already exists")
+        slot = len(self.users)
+        self.users.append(user)
+        self.slots[user.id] = slot
+        self.emails[email] = slot
+        self.versions[slot] = 1
+        self.text.add(slot, (user.email, user.first_name, user.last_name))
+        self.statuses[user.status].add(slot)
+        self.roles[user.role].add(slot)
+        name_key = _name_key(user)
+        self.name_keys.append(name_key)
+        self.by_name.add((name_key, user.id, slot))
+        return slot
+
+    def _replace(self, slot: int, user: User) -> None:
+        previous = self.users[slot]
+        if previous.email.casefold() != user.email.casefold():
+            del self.emails[previous.email.casefold()]
+            self.emails[user.email.casefold()] = slot
+        self.users[slot] = user
+        self.versions[slot] += 1
+        self.text.update(slot, (user.email, user.first_name, user.last_name))
+        if previous.status != user.status:
+            self.statuses[previous.status].discard(slot)
+            self.statuses[user.status].add(slot)
+        if previous.role != user.role:
+            self.roles[previous.role].discard(slot)
+            self.roles[user.role].add(slot)
+        name_key = _name_key(user)
+        if name_key != self.name_keys[slot]:
+            self.by_name.remove((self.name_keys[slot], user.id, slot))
+            self.by_name.add((name_key, user.id, slot))
+            self.name_keys[slot] = name_key
+
+    def _remove(self, slot: int) -> None:
+        user = self.users[slot]
+        self.users[slot] = None
+        del self.slots[user.id]
+        del self.emails[user.email.casefold()]
+        self.passwords.pop(slot, None)
+        del self.versions[slot]
+        self.text.remove(slot)
+        self.statuses[user.status].discard(slot)
+        self.roles[user.role].discard(slot)
+        self.by_name.remove((self.name_keys[slot], user.id, slot))
+        self.name_keys[slot] = None
+
+    def _slot(self, user_id: str) -> int:
+        slot = self.slots.get(user_id)
+        if slot is None:
+            raise _not_found()
+        return slot
+
+    def _create(self, request) -> User:
+        now = _now()
+        user = User(
+            id=str(uuid.uuid4()),
+            email=request.email,
+            first_name=request.first_name,
+            last_name=request.last_name,
+            role=request.role or UserRole.BUYER,
+            status=request.status or UserStatus.ACTIVE,
+            created_at=now,
+            updated_at=now,
+        )
+        slot = self._insert(user)
+        self.passwords[slot] = _hash_password(request.password)
+        return user
+
+    def _update(self, user_id: str, changes) -> User:
+        slot = self._slot(user_id)
+        values = {
+            name: getattr(changes, name)
+            for name in changes.model_fields_set
+            if getattr(changes, name) is not None or name in changes.__nullable_fields__
+        }
+        user = self.users[slot].model_copy(update=dict(values, updated_at=_now()))
+        self._replace(slot, user)
+        return user
+
+    async def batch_create_users(self, user_batch_create_request):
+        results = []
+        for item in user_batch_create_request.items:
+            try:
+                user = self._create(item)
+            except HTTPException as e:
+                results.append(UserBatchResult(error=_error_of(e)))
+            else:
+                results.append(UserBatchResult(id=user.id, user=user))
+        return UserBatchResponse(results=results)
+
+    async def batch_get_users(self, user_batch_get_request):
+        results = []
+        for user_id in user_batch_get_request.ids:
+            slot = self.slots.get(user_id)
+            if slot is None:
+                results.append(
+                    UserBatchResult(id=user_id, error=_error_of(_not_found()))
+                )
+            else:
+                results.append(UserBatchResult(id=user_id, user=self.users[slot]))
+        return UserBatchResponse(results=results)
+
+    async def batch_update_users(self, user_batch_update_request):
+        results = []
+        for item in user_batch_update_request.items:
+            try:
+                user = self._update(item.id, item.changes)
+            except HTTPException as e:
+                results.append(UserBatchResult(id=item.id, error=_error_of(e)))
+            else:
+                results.append(UserBatchResult(id=item.id, user=user))
+        return UserBatchResponse(results=results)
+
+    async def create_user(self, user_create_request):
+        return self._create(user_create_request)
+
+    async def delete_user_by_id(self, userId):
+        self._remove(self._slot(userId))
+        return LogoutUser200Response(success=True)
+
+    async def get_user_by_id(self, userId):
+        return self.users[self._slot(userId)]
+
+    async def get_user_version(self, userId):
+        slot = self.slots.get(userId)
+        return None if slot is None else str(self.versions[slot])
+
+    async def update_user_by_id(self, userId, user_update_request):
+        return self._update(userId, user_update_request)
+
+    async def update_user_email(self, userId, user_update_email_request):
+        slot = self._slot(userId)
+        stored = self.passwords.get(slot)
+        password = user_update_email_request.password
+        if stored is None or not hmac.compare_digest(
+            _hash_password(password, stored[0])[1], stored[1]
+        ):
+            raise HTTPException(status_code=403, detail="Invalid password")
+        email = user_update_email_request.new_email
+        owner = self.emails.get(email.casefold())
+        if owner is not None and owner != slot:
+            raise HTTPException(status_code=409, detail="User already exists")
+        user = self.users[slot].model_copy(
+            update={"email": email, "updated_at": _now()}
+        )
+        self._replace(slot, user)
+        return user
+
+    async def get_user_list(self, users_request_payload):
+        payload = users_request_payload
+        sort_by = list(payload.sort_by or ())
+        order_by = list(payload.order_by or ())
+        if order_by and len(order_by) != len(sort_by):
+            raise HTTPException(
+                status_code=400, detail="sortBy and orderBy must have the same length"
+            )
+        if sort_by:
+            descending = order_by[0] == Order.DESC if order_by else False
+            entries, total = self._by_name(
+                payload.filter, descending, payload.cursor, payload.offset
+            )
+        else:
+            after = self._slot_after(payload.cursor) if payload.cursor else -1
+            slots, total = self._select(payload.filter, after + 1)
+            entries = itertools.islice(
+                ((None, None, slot) for slot in slots), payload.offset, None
+            )
+        rows = list(itertools.islice(entries, payload.limit + 1))
+        cursor = None
+        if len(rows) > payload.limit:
+            name_key, _, slot = rows[payload.limit - 1]
+            key = [name_key] if sort_by else [slot]
+            cursor = encode_cursor(key, self.users[slot].id)
+        return GetUserList200Response(
+            data=[self.users[slot] for _, _, slot in rows[:payload.limit]],
+            meta=PaginationMeta(
+                limit=payload.limit,
+                offset=payload.offset,
+                total=total,
+                next_cursor=cursor,
+            ),
+        )
+
+    def _groups(
+        self, filter: Optional[UsersRequestPayloadFilter]
+    ) -> List[List[Bitmap]]:
+        """Bitmaps of the statuses and of the roles `filter` accepts; a slot
+        must be in one bitmap of every group"""
+        groups: List[List[Bitmap]] = []
+        if filter is not None and filter.statuses:
+            groups.append([self.statuses[status] for status in set(filter.statuses)])
+        if filter is not None and filter.roles:
+            groups.append([self.roles[role] for role in set(filter.roles)])
+        return groups
+
+    def _search(
+        self, filter: Optional[UsersRequestPayloadFilter]
+    ) -> Optional[List[int]]:
+        """Slots matching `filter`, ascending, if it has a text query"""
+        query = filter.text.strip() if filter is not None and filter.text else ""
+        if not query:
+            return None
+        slots = self.text.search(query)
+        matches = _matcher(self._groups(filter))
+        if matches is not None:
+            slots = [slot for slot in slots if matches(slot)]
+        return slots
+
+    def _count(self, groups: List[List[Bitmap]]) -> int:
+        """Number of users in one bitmap of every group"""
+        if not groups:
+            return len(self.slots)
+        if len(groups) == 1 and len(groups[0]) == 1:
+            return len(groups[0][0])
+        return _popcount(
+            reduce(
+                int.__and__,
+                (reduce(int.__or__, (b.to_int() for b in group)) for group in groups),
+            )
+        )
+
+    def _select(
+        self, filter: Optional[UsersRequestPayloadFilter], start: int = 0
+    ) -> Tuple[Iterable[int], int]:
+        """Slots from `start` on matching `filter`, ascending, and how many
+        slots match in all"""
+        slots = self._search(filter)
+        if slots is not None:
+            return slots[bisect_left(slots, start):], len(slots)
+        groups = self._groups(filter)
+        matches = _matcher(groups)
+        users = self.users
+        slots = (
+            slot
+            for slot in range(start, len(users))
+            if users[slot] is not None and (matches is None or matches(slot))
+        )
+        return slots, self._count(groups)
+
+    def _by_name(
+        self,
+        filter: Optional[UsersRequestPayloadFilter],
+        descending: bool,
+        cursor: Optional[str],
+        offset: int = 0,
+    ) -> Tuple[Iterator[Tuple[str, str, int]], int]:
+        """`(name key, id, slot)` of the users matching `filter` in FULL_NAME
+        order from `cursor` on, past the first `offset`, and how many users
+        match in all.
+
+        Text matches are few; they are sorted by their precomputed keys.
+        Otherwise the `by_name` index is read from the cursor's position,
+        moved by `offset` when there is no filter to skip rows one by one,
+        so that an unfiltered page costs O(log n + limit)."""
+        position = self._name_after(cursor) if cursor else None
+        slots = self._search(filter)
+        if slots is not None:
+            name_keys, users = self.name_keys, self.users
+            entries = sorted((name_keys[slot], users[slot].id, slot) for slot in slots)
+            if position is None:
+                rows = reversed(entries) if descending else iter(entries)
+            elif descending:
+                rows = reversed(entries[:bisect_left(entries, position)])
+            else:
+                rows = iter(entries[bisect_right(entries, position + (math.inf,)):])
+            return itertools.islice(rows, offset, None), len(entries)
+        by_name = self.by_name
+        if position is None:
+            start = 0
+        elif descending:
+            start = len(by_name) - by_name.index(position)
+        else:
+            start = by_name.index(position + (math.inf,))
+        groups = self._groups(filter)
+        matches = _matcher(groups)
+        total = self._count(groups)
+        if matches is None:
+            return by_name.iterate(start + offset, reverse=descending), total
+        rows = by_name.iterate(start, reverse=descending)
+        rows = (row for row in rows if matches(row[2]))
+        return itertools.islice(rows, offset, None), total
+
+    @staticmethod
+    def _slot_after(cursor: str) -> int:
+        """Slot of the last user of the page before `cursor`, in slot order"""
+        key, _ = _decode(cursor)
+        if len(key) != 1 or not isinstance(key[0], int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return key[0]
+
+    @staticmethod
+    def _name_after(cursor: str) -> Tuple[str, str]:
+        """`(name key, id)` of the last user of the page before `cursor`, in
+        FULL_NAME order"""
+        key, id = _decode(cursor)
+        if len(key) != 1 or not isinstance(key[0], str):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return key[0], id
+
+
+def _name_key(user: User) -> str:
+    """Collation key of `user` in FULL_NAME order, as in its cursors"""
+    return user_sort_key(user, (UserSortField.FULL_NAME,))[0]
+
+
+def _decode(cursor: str) -> Tuple[list, str]:
+    try:
+        return decode_cursor(cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def _matcher(groups: List[List[Bitmap]]) -> Optional[Callable[[int], bool]]:
+    """Test of a slot being in one bitmap of every group, or None for no groups"""
+    if not groups:
+        return None
+    if len(groups) == 1 and len(groups[0]) == 1:
+        return groups[0][0].__contains__
+    return lambda slot: all(any(slot in bitmap for bitmap in group) for group in groups)
@@ -0,0 +1,187 @@
+# coding: utf-8
+
+"""DataLoader-style batching of per-id lookups.
+
+With `CONTRACTS_USER_BATCH` enabled, `get_user_by_id` does not call the
+implementation's `get_user_by_id`. The ids requested within a short window
+(`CONTRACTS_USER_BATCH_WINDOW_MS`, or the same event-loop tick when 0) are
+collected and fetched with a single `batch_get_users` call of at most
+`CONTRACTS_USER_BATCH_MAX` distinct ids, whose results are handed back to the
+individual requests. The loader is used only when the implementation
+overrides `batch_get_users`, which should cost about as much as one
+`get_user_by_id`; otherwise ids are loaded one by one as without the flag.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+from fastapi import HTTPException
+
+from contracts.apis.users_api_base import BaseUsersApi
+from contracts.dispatcher import dispatcher
+from contracts.models.error import Error
+from contracts.models.user_batch_get_request import UserBatchGetRequest
+from contracts.settings import settings
+
+# maxItems of UserBatchGetRequest.ids
+MAX_BATCH_GET = 100
+
+# HTTP status of the errors `batch_get_users` may report for single items
+_ERROR_STATUS = {
+    "ERR_ACCESS_DENIED": 403,
+    "ERR_INVALID_ARG": 400,
+    "ERR_INVALID_CREDENTIALS": 401,
+    "ERR_NOT_FOUND": 404,
+}
+
+
+class BatchLoader:
+    """Collects keys requested close together and loads them in one call.
+
+    :param load_many: Loads a list of distinct keys, returning one result per
+        key in the same order; a result that is an exception is raised to
+        the callers of that key
+    :param window: Seconds the first key of a batch waits for others; 0
+        dispatches at the end of the current event-loop tick
+    :param max_batch: Dispatch as soon as this many distinct keys are queued
+    :param enabled: Whether routes should use the loader at all
+    """
+
+    def __init__(
+        self,
+        load_many: Callable[[List[Hashable]], Awaitable[List[Any]]],
+        window: float = 0.002,
+        max_batch: int = 100,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.load_many = load_many
+        self.window = window
+        self.max_batch = max_batch
+        self.enabled = enabled
+        self.clock = clock
+        self.loads = 0
+        self.batches = 0
+        self.batched_keys = 0
+        self.max_batch_size = 0
+        self.total_delay = 0.0
+        self.max_delay = 0.0
+        self._pending: Dict[Hashable, List["asyncio.Future[Any]"]] = {}
+        self._opened_at = 0.0
+        self._timer: Optional[asyncio.Handle] = None
+        self._running: Set["asyncio.Task[None]"] = set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loads": self.loads,
+            "batches": self.batches,
+            "mean_batch_size": (
+                self.batched_keys / self.batches if self.batches else 0.0
+            ),
+            "max_batch_size": self.max_batch_size,
+            "mean_delay_ms": (
+                1000 * self.total_delay / self.batches if self.batches else 0.0
+            ),
+            "max_delay_ms": 1000 * self.max_delay,
+        }
+
+    async def load(self, key: Hashable) -> Any:
+        """Return the result for `key` once its batch has been loaded"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending:
+            self._opened_at = self.clock()
+            if self.window > 0:
+                self._timer = loop.call_later(self.window, self._dispatch)
+            else:
+                self._timer = loop.call_soon(self._dispatch)
+        self._pending.setdefault(key, []).append(future)
+        self.loads += 1
+        if len(self._pending) >= self.max_batch:
+            self._dispatch()
+        return await future
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        delay = self.clock() - self._opened_at
+        self.batches += 1
+        self.batched_keys += len(batch)
+        self.max_batch_size = max(self.max_batch_size, len(batch))
+        self.total_delay += delay
+        self.max_delay = max(self.max_delay, delay)
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: Dict[Hashable, List["asyncio.Future[Any]"]]) -> None:
+        keys = list(batch)
+        try:
+            results = await self.load_many(keys)
+            if len(results) != len(keys):
+                raise RuntimeError(
+                    "loaded %d results for %d keys" % (len(results), len(keys))
+                )
+        except Exception as exc:
+            results = [exc] * len(keys)
+        for key, result in zip(keys, results):
+            for future in batch[key]:
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+def _item_error(error: Optional[Error]) -> HTTPException:
+    if error is None:
+        return HTTPException(status_code=404, detail="User not found")
+    return HTTPException(
+        status_code=_ERROR_STATUS.get(error.code, 500),
+        detail=error.message or error.code,
+    )
+
+
+async def batch_get_users(ids: List[str]) -> List[Any]:
+    """Fetch `ids` through the implementation's `batch_get_users`, returning
+    the user or the `HTTPException` to raise for every id.
+
+    Results are matched to ids by `UserBatchResult.id` (or the user's id),
+    not by position; an id without a result is not found."""
+    response = await dispatcher.handler(BaseUsersApi, "batch_get_users")(
+        UserBatchGetRequest(ids=ids)
+    )
+    found: Dict[str, Any] = {}
+    for item in response.results:
+        if item.user is not None:
+            found[item.id or item.user.id] = item.user
+        elif item.id is not None:
+            found[item.id] = _item_error(item.error)
+    return [found[id] if id in found else _item_error(None) for id in ids]
+
+
+def provides_batch_get(impl: Any) -> bool:
+    """Whether `impl` overrides the `batch_get_users` stub of `BaseUsersApi`"""
+    method = getattr(type(impl), "batch_get_users", None)
+    return method is not None and method is not BaseUsersApi.batch_get_users
+
+
+def uses_user_loader() -> bool:
+    """Whether `get_user_by_id` should load through `user_loader`"""
+    return user_loader.enabled and provides_batch_get(
+        dispatcher.instance(BaseUsersApi)
+    )
+
+
+user_loader = BatchLoader(
+    batch_get_users,
+    window=settings.user_batch_window_ms / 1000,
+    max_batch=min(settings.user_batch_max, MAX_BATCH_GET),
+    enabled=settings.user_batch,
+)
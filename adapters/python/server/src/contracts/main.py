@@ -12,18 +12,87 @@
 """  # noqa: E501
 
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from contracts.apis.authentication_api import router as AuthenticationApiRouter
+from contracts.apis.authentication_api_base import BaseAuthenticationApi
 from contracts.apis.health_api import router as HealthApiRouter
+from contracts.apis.health_api_base import BaseHealthApi
 from contracts.apis.users_api import router as UsersApiRouter
+from contracts.apis.users_api_base import BaseUsersApi
+from contracts.cache import response_cache
+from contracts.coalescing import single_flight
+from contracts.compression import CompressionMiddleware, compression_stats
+from contracts.dispatcher import dispatcher
+from contracts.loader import user_loader
+from contracts.metrics import MetricsMiddleware, metrics, metrics_endpoint
+from contracts.query import users_request_payloads
+from contracts.registry import registry
+from contracts.settings import settings
+from contracts.timing import timed_impl
+from contracts.tokens import token_verifier
+from contracts.tracing import MemoryExporter, TracingMiddleware, traces_endpoint, tracer
+
+
+API_BASES = (BaseAuthenticationApi, BaseHealthApi, BaseUsersApi)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    registry.load(API_BASES)
+    await dispatcher.startup(API_BASES)
+    try:
+        yield
+    finally:
+        await dispatcher.shutdown()
+        tracer.exporter.flush()
+
 
 app = FastAPI(
     title="Contracts Blueprint API",
     description="# Contracts Blueprint API  A simple API blueprint demonstrating enterprise-grade OpenAPI specifications with multi-language code generation support for Go, Python, and TypeScript.  This API provides basic authentication and user management functionality.  ## Features - JWT-based authentication - User CRUD operations - Multi-language SDK generation - Comprehensive error handling  ## Error Codes - &#x60;ERR_INTERNAL&#x60;: Internal server error - &#x60;ERR_INVALID_ARG&#x60;: Invalid argument(s) provided - &#x60;ERR_NOT_FOUND&#x60;: Resource not found - &#x60;ERR_ALREADY_EXISTS&#x60;: Resource already exists - &#x60;ERR_ACCESS_DENIED&#x60;: Access denied - &#x60;ERR_INVALID_CREDENTIALS&#x60;: Invalid authentication credentials - &#x60;ERR_VALIDATION_FAILED&#x60;: Request validation failed ",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if settings.fast_json else JSONResponse,
 )
 
 app.include_router(AuthenticationApiRouter)
 app.include_router(HealthApiRouter)
 app.include_router(UsersApiRouter)
+
+if settings.compression:
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=settings.compression_min_size
+    )
+
+if settings.tracing:
+    app.add_middleware(TracingMiddleware)
+    if isinstance(tracer.exporter, MemoryExporter):
+        app.add_api_route("/traces", traces_endpoint, include_in_schema=False)
+
+if settings.metrics:
+    # Added last, so it is outermost and sees the bytes actually sent
+    app.add_middleware(MetricsMiddleware)
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+    metrics.register("token_cache", token_verifier.stats, gauges=["size"])
+    metrics.register(
+        "response_cache",
+        response_cache.stats,
+        gauges=["hit_ratio", "entries", "bytes", "max_bytes"],
+    )
+    metrics.register("single_flight", single_flight.stats, label="operation")
+    metrics.register(
+        "user_batch",
+        user_loader.stats,
+        gauges=["mean_batch_size", "max_batch_size", "mean_delay_ms", "max_delay_ms"],
+    )
+    metrics.register("compression", compression_stats.stats, label="encoding")
+    metrics.register("query_cache", users_request_payloads.stats, gauges=["size"])
+    if settings.tracing:
+        metrics.register("tracing", tracer.stats)
+
+if settings.metrics or settings.tracing:
+    dispatcher.instrument = timed_impl
@@ -0,0 +1,350 @@
+# coding: utf-8
+
+"""Per-operation metrics in the Prometheus text format.
+
+Enabled by `CONTRACTS_METRICS`, in which case `contracts.main` installs
+`MetricsMiddleware`, a pure ASGI middleware, and serves `/metrics`. For every
+operationId it keeps
+
+* `contracts_request_duration_seconds`: latency histogram, from the request
+  reaching the middleware to the last byte of the response being sent;
+* `contracts_request_phase_seconds`: the same time split into `auth` (the
+  bearer-token dependency), `validation` (reading, decoding and validating
+  the request, other dependencies), `impl` (awaiting the implementation)
+  and `serialization` (the rest: rendering and sending the response, plus
+  the adapter's own work around the call such as cache lookups);
+* `contracts_response_size_bytes`: histogram of the bytes sent, after
+  compression;
+* `contracts_requests_in_flight` and `contracts_requests_total` by status.
+
+The counters of the token cache, response cache, single-flight, user batch
+loader, compression and query cache are exported alongside. Metrics are kept per
+process; scrape every worker of `contracts.serve`. When `CONTRACTS_METRICS_TOKEN`
+is set, `/metrics` and `/traces` require it as a bearer token; otherwise they
+are open, and must not be reachable from outside the deployment.
+
+Routes are metered by `MeteredRoute`, the route class of the generated
+routers, which records the request's phases in its `contracts.timing.Sample`.
+When neither metrics nor tracing are on it adds nothing to the request
+path. A call
+shared by several requests (`contracts.coalescing`, `contracts.loader`)
+counts as `impl` time of the request that started it only.
+"""
+
+import functools
+import hmac
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from fastapi import Request, Response
+from starlette.responses import PlainTextResponse
+
+from contracts.negotiation import NegotiatedRoute
+from contracts.settings import settings
+from contracts.timing import Sample, current_sample, timed, timed_impl  # noqa: F401
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+PHASES = ("auth", "validation", "impl", "serialization")
+
+Message = Dict[str, Any]
+# Name, stats callable, label and gauge names of a registered collector
+Collector = Tuple[str, Callable[[], Dict[str, Any]], str, FrozenSet[str]]
+
+
+def operation_id(name: str) -> str:
+    """operationId of the generated endpoint `name`, e.g. `getUserById`"""
+    head, *rest = name.split("_")
+    return head + "".join(word.capitalize() for word in rest)
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def expose(self, name: str, labels: str, lines: List[str]) -> None:
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(
+                '%s_bucket{%s,le="%s"} %d' % (name, labels, _number(bound), cumulative)
+            )
+        lines.append('%s_bucket{%s,le="+Inf"} %d' % (name, labels, self.count))
+        lines.append("%s_sum{%s} %s" % (name, labels, _number(self.sum)))
+        lines.append("%s_count{%s} %d" % (name, labels, self.count))
+
+
+class OperationMetrics:
+    """Metrics of one operation"""
+
+    __slots__ = ("duration", "size", "phases", "in_flight", "statuses")
+
+    def __init__(self) -> None:
+        self.duration = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.phases = {phase: Histogram(LATENCY_BUCKETS) for phase in PHASES}
+        self.in_flight = 0
+        self.statuses: Dict[int, int] = {}
+
+
+class Metrics:
+    """Metric families of the server, keyed by operationId"""
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.operations: Dict[str, OperationMetrics] = {}
+        self.collectors: List[Collector] = []
+
+    def start(self, operation: str) -> None:
+        recorded = self.operations.get(operation)
+        if recorded is None:
+            recorded = self.operations[operation] = OperationMetrics()
+        recorded.in_flight += 1
+
+    def observe(
+        self, sample: Sample, status: int, size: int, duration: float, ended: float
+    ) -> None:
+        recorded = self.operations[sample.operation]
+        recorded.in_flight -= 1
+        recorded.statuses[status] = recorded.statuses.get(status, 0) + 1
+        recorded.duration.observe(duration)
+        recorded.size.observe(size)
+        phases = recorded.phases
+        phases["auth"].observe(sample.auth)
+        if sample.endpoint_started is None:
+            phases["validation"].observe(
+                sample.handler_ended - sample.handler_started - sample.auth
+            )
+            return
+        phases["validation"].observe(
+            sample.endpoint_started - sample.handler_started - sample.auth
+        )
+        phases["impl"].observe(sample.impl)
+        phases["serialization"].observe(ended - sample.endpoint_started - sample.impl)
+
+    def register(
+        self,
+        name: str,
+        stats: Callable[[], Dict[str, Any]],
+        label: str = "key",
+        gauges: Iterable[str] = (),
+    ) -> None:
+        """Export the values of `stats()` as `contracts_<name>_<key>`. The
+        values of a statistic keyed by operation or encoding are dictionaries
+        themselves; they become series labelled `label`. Keys listed in
+        `gauges` are typed as gauges, the others as counters."""
+        self.collectors.append((name, stats, label, frozenset(gauges)))
+
+    def expose(self) -> str:
+        lines: List[str] = []
+        operations = sorted(self.operations.items())
+        self._family(
+            lines, "contracts_request_duration_seconds", "histogram", "Request latency"
+        )
+        for operation, recorded in operations:
+            recorded.duration.expose(
+                "contracts_request_duration_seconds",
+                _labels(operation=operation),
+                lines,
+            )
+        self._family(
+            lines,
+            "contracts_request_phase_seconds",
+            "histogram",
+            "Request latency by phase",
+        )
+        for operation, recorded in operations:
+            for phase, histogram in recorded.phases.items():
+                labels = _labels(operation=operation, phase=phase)
+                histogram.expose("contracts_request_phase_seconds", labels, lines)
+        self._family(
+            lines,
+            "contracts_response_size_bytes",
+            "histogram",
+            "Response body bytes sent",
+        )
+        for operation, recorded in operations:
+            recorded.size.expose(
+                "contracts_response_size_bytes", _labels(operation=operation), lines
+            )
+        self._family(
+            lines, "contracts_requests_in_flight", "gauge", "Requests being served"
+        )
+        for operation, recorded in operations:
+            labels = _labels(operation=operation)
+            lines.append(
+                "contracts_requests_in_flight{%s} %d" % (labels, recorded.in_flight)
+            )
+        self._family(
+            lines, "contracts_requests_total", "counter", "Requests served by status"
+        )
+        for operation, recorded in operations:
+            for status, count in sorted(recorded.statuses.items()):
+                labels = _labels(operation=operation, status=status)
+                lines.append("contracts_requests_total{%s} %d" % (labels, count))
+        for name, stats, label, gauges in self.collectors:
+            _expose_stats(lines, name, stats(), label, gauges)
+        lines.append("")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _family(lines: List[str], name: str, kind: str, help: str) -> None:
+        lines.append("# HELP %s %s" % (name, help))
+        lines.append("# TYPE %s %s" % (name, kind))
+
+    def clear(self) -> None:
+        self.operations.clear()
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(**labels: Any) -> str:
+    return ",".join('%s="%s"' % (name, value) for name, value in labels.items())
+
+
+def _expose_stats(
+    lines: List[str],
+    collector: str,
+    stats: Dict[str, Any],
+    label: str,
+    gauges: frozenset,
+) -> None:
+    # The series of one family must be adjacent, whatever the nesting of `stats`
+    families: Dict[str, List[str]] = {}
+    for key, value in stats.items():
+        if isinstance(value, dict):
+            labels = "{%s}" % _labels(**{label: key})
+            for name, number in value.items():
+                sample = "%s %s" % (labels, _number(number))
+                families.setdefault(name, []).append(sample)
+        else:
+            families.setdefault(key, []).append(" %s" % _number(value))
+    for key, series in families.items():
+        name = "contracts_%s_%s" % (collector, key)
+        kind = "gauge" if key in gauges else "counter"
+        help = ("%s %s" % (collector, key)).replace("_", " ").capitalize()
+        Metrics._family(lines, name, kind, help)
+        lines.extend(name + sample for sample in series)
+
+
+metrics = Metrics(enabled=settings.metrics)
+
+
+class MetricsMiddleware:
+    """Time every request, and count it under its operationId.
+
+    :param app: The ASGI application to wrap
+    :param metrics: Where the measurements are recorded
+    """
+
+    def __init__(self, app: Callable, metrics: Metrics = metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Message, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        sample = Sample(self.metrics)
+        token = current_sample.set(sample)
+        status = 500
+        size = 0
+
+        async def metered_send(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            elif message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, metered_send)
+        finally:
+            current_sample.reset(token)
+            if sample.operation is not None:
+                ended = time.perf_counter()
+                self.metrics.observe(sample, status, size, ended - started, ended)
+
+
+class MeteredRoute(NegotiatedRoute):
+    """API route that records its phases in the request's `Sample`"""
+
+    def get_route_handler(self) -> Callable:
+        if not (metrics.enabled or settings.tracing):
+            return super().get_route_handler()
+        endpoint = self.dependant.call
+
+        @functools.wraps(endpoint)
+        async def metered_endpoint(*args: Any, **kwargs: Any) -> Any:
+            sample = current_sample.get()
+            if sample is None:
+                return await endpoint(*args, **kwargs)
+            sample.endpoint_started = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                sample.endpoint_ended = time.perf_counter()
+
+        self.dependant.call = metered_endpoint
+        handler = super().get_route_handler()
+        operation = operation_id(self.name)
+
+        async def route_handler(request: Request) -> Response:
+            sample = current_sample.get()
+            if sample is None:
+                return await handler(request)
+            sample.operation = operation
+            if sample.metrics is not None:
+                sample.metrics.start(operation)
+            sample.handler_started = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                sample.handler_ended = time.perf_counter()
+
+        return route_handler
+
+
+def unauthorized(request: Request) -> Optional[Response]:
+    """Return the 401 response for a request to an operational endpoint
+    (`/metrics`, `/traces`) without the `CONTRACTS_METRICS_TOKEN` bearer
+    token, or None when it may be served"""
+    if not settings.metrics_token:
+        return None
+    expected = "Bearer %s" % settings.metrics_token
+    given = request.headers.get("authorization", "")
+    if hmac.compare_digest(given.encode("utf-8"), expected.encode("utf-8")):
+        return None
+    return PlainTextResponse(
+        "Unauthorized", status_code=401, headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Serve the metrics of this process in the Prometheus text format"""
+    denied = unauthorized(request)
+    if denied is not None:
+        return denied
+    return PlainTextResponse(metrics.expose(), media_type=CONTENT_TYPE)
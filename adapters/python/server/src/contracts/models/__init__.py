@@ -0,0 +1,85 @@
+# coding: utf-8
+
+"""Lazy exports of the generated models.
+
+Written by generators/python/postprocess_models.py. Each model module is
+imported on first access to one of its names.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+    "AuthRequestPayload": "contracts.models.auth_request_payload",
+    "AuthTokenRefreshRequestPayload": "contracts.models.auth_token_refresh_request_payload",
+    "AuthenticateUser200Response": "contracts.models.authenticate_user200_response",
+    "Error": "contracts.models.error",
+    "GetHealthStatus200Response": "contracts.models.get_health_status200_response",
+    "GetUserList200Response": "contracts.models.get_user_list200_response",
+    "LogoutUser200Response": "contracts.models.logout_user200_response",
+    "Order": "contracts.models.order",
+    "PaginationMeta": "contracts.models.pagination_meta",
+    "RegisterRequestPayload": "contracts.models.register_request_payload",
+    "TokenModel": "contracts.models.extra_models",
+    "TokenResponse": "contracts.models.token_response",
+    "User": "contracts.models.user",
+    "UserBatchCreateRequest": "contracts.models.user_batch_create_request",
+    "UserBatchGetRequest": "contracts.models.user_batch_get_request",
+    "UserBatchResponse": "contracts.models.user_batch_response",
+    "UserBatchResult": "contracts.models.user_batch_result",
+    "UserBatchUpdateItem": "contracts.models.user_batch_update_item",
+    "UserBatchUpdateRequest": "contracts.models.user_batch_update_request",
+    "UserCreateRequest": "contracts.models.user_create_request",
+    "UserRole": "contracts.models.user_role",
+    "UserSortField": "contracts.models.user_sort_field",
+    "UserStatus": "contracts.models.user_status",
+    "UserUpdateEmailRequest": "contracts.models.user_update_email_request",
+    "UserUpdateRequest": "contracts.models.user_update_request",
+    "UsersRequestPayload": "contracts.models.users_request_payload",
+    "UsersRequestPayloadFilter": "contracts.models.users_request_payload_filter",
+}
+
+__all__ = sorted(_EXPORTS)
+
+if TYPE_CHECKING:
+    from contracts.models.auth_request_payload import AuthRequestPayload
+    from contracts.models.auth_token_refresh_request_payload import AuthTokenRefreshRequestPayload
+    from contracts.models.authenticate_user200_response import AuthenticateUser200Response
+    from contracts.models.error import Error
+    from contracts.models.get_health_status200_response import GetHealthStatus200Response
+    from contracts.models.get_user_list200_response import GetUserList200Response
+    from contracts.models.logout_user200_response import LogoutUser200Response
+    from contracts.models.order import Order
+    from contracts.models.pagination_meta import PaginationMeta
+    from contracts.models.register_request_payload import RegisterRequestPayload
+    from contracts.models.extra_models import TokenModel
+    from contracts.models.token_response import TokenResponse
+    from contracts.models.user import User
+    from contracts.models.user_batch_create_request import UserBatchCreateRequest
+    from contracts.models.user_batch_get_request import UserBatchGetRequest
+    from contracts.models.user_batch_response import UserBatchResponse
+    from contracts.models.user_batch_result import UserBatchResult
+    from contracts.models.user_batch_update_item import UserBatchUpdateItem
+    from contracts.models.user_batch_update_request import UserBatchUpdateRequest
+    from contracts.models.user_create_request import UserCreateRequest
+    from contracts.models.user_role import UserRole
+    from contracts.models.user_sort_field import UserSortField
+    from contracts.models.user_status import UserStatus
+    from contracts.models.user_update_email_request import UserUpdateEmailRequest
+    from contracts.models.user_update_request import UserUpdateRequest
+    from contracts.models.users_request_payload import UsersRequestPayload
+    from contracts.models.users_request_payload_filter import UsersRequestPayloadFilter
+
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
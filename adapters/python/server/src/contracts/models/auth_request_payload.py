@@ -15,7 +15,6 @@
 from __future__ import annotations
 import pprint
 import re  # noqa: F401
-import json
 
 
 
@@ -23,6 +22,7 @@ import json
 from pydantic import BaseModel, ConfigDict, Field, StrictBool, StrictStr
 from typing import Any, ClassVar, Dict, List, Optional
 from typing_extensions import Annotated
+from contracts.serialization import dumps, loads
 try:
     from typing import Self
 except ImportError:
@@ -38,6 +38,7 @@ class AuthRequestPayload(BaseModel):
     __properties: ClassVar[List[str]] = ["email", "password", "isRememberMe"]
 
     model_config = {
+        "defer_build": True,
         "populate_by_name": True,
         "validate_assignment": True,
         "protected_namespaces": (),
@@ -50,13 +51,12 @@ class AuthRequestPayload(BaseModel):
 
     def to_json(self) -> str:
         """Returns the JSON representation of the model using alias"""
-        # TODO: pydantic v2: use .model_dump_json(by_alias=True, exclude_unset=True) instead
-        return json.dumps(self.to_dict())
+        return dumps(self.to_dict())
 
     @classmethod
     def from_json(cls, json_str: str) -> Self:
         """Create an instance of AuthRequestPayload from a JSON string"""
-        return cls.from_dict(json.loads(json_str))
+        return cls.from_dict(loads(json_str))
 
     def to_dict(self) -> Dict[str, Any]:
         """Return the dictionary representation of the model using alias.
@@ -15,13 +15,13 @@
 from __future__ import annotations
 import pprint
 import re  # noqa: F401
-import json
 
 
 
 
 from pydantic import BaseModel, ConfigDict, StrictBool
 from typing import Any, ClassVar, Dict, List, Optional
+from contracts.serialization import dumps, loads
 try:
     from typing import Self
 except ImportError:
@@ -35,6 +35,7 @@ class LogoutUser200Response(BaseModel):
     __properties: ClassVar[List[str]] = ["success"]
 
     model_config = {
+        "defer_build": True,
         "populate_by_name": True,
         "validate_assignment": True,
         "protected_namespaces": (),
@@ -47,13 +48,12 @@ class LogoutUser200Response(BaseModel):
 
     def to_json(self) -> str:
         """Returns the JSON representation of the model using alias"""
-        # TODO: pydantic v2: use .model_dump_json(by_alias=True, exclude_unset=True) instead
-        return json.dumps(self.to_dict())
+        return dumps(self.to_dict())
 
     @classmethod
     def from_json(cls, json_str: str) -> Self:
         """Create an instance of LogoutUser200Response from a JSON string"""
-        return cls.from_dict(json.loads(json_str))
+        return cls.from_dict(loads(json_str))
 
     def to_dict(self) -> Dict[str, Any]:
         """Return the dictionary representation of the model using alias.
@@ -15,14 +15,14 @@
 from __future__ import annotations
 import pprint
 import re  # noqa: F401
-import json
 
 
 
 
-from pydantic import BaseModel, ConfigDict, Field
-from typing import Any, ClassVar, Dict, List
+from pydantic import BaseModel, ConfigDict, Field, StrictStr
+from typing import Any, ClassVar, Dict, List, Optional
 from typing_extensions import Annotated
+from contracts.serialization import dumps, loads
 try:
     from typing import Self
 except ImportError:
@@ -34,10 +34,12 @@ class PaginationMeta(BaseModel):
     """ # noqa: E501
     limit: Annotated[int, Field(le=100, strict=True, ge=1)] = Field(description="Number of items per page")
     offset: Annotated[int, Field(strict=True, ge=0)] = Field(description="Offset of records to skip")
-    total: Annotated[int, Field(strict=True, ge=0)] = Field(description="Total number of items")
-    __properties: ClassVar[List[str]] = ["limit", "offset", "total"]
+    total: Optional[Annotated[int, Field(strict=True, ge=0)]] = Field(default=None, description="Total number of items. May be omitted or estimated when paginating with a cursor.")
+    next_cursor: Optional[StrictStr] = Field(default=None, description="Opaque keyset pagination cursor. Returned as `meta.nextCursor` while more records follow; pass it back unchanged to fetch the next page, with `offset` set to 0.", alias="nextCursor")
+    __properties: ClassVar[List[str]] = ["limit", "offset", "total", "nextCursor"]
 
     model_config = {
+        "defer_build": True,
         "populate_by_name": True,
         "validate_assignment": True,
         "protected_namespaces": (),
@@ -50,13 +52,12 @@ class PaginationMeta(BaseModel):
 
     def to_json(self) -> str:
         """Returns the JSON representation of the model using alias"""
-        # TODO: pydantic v2: use .model_dump_json(by_alias=True, exclude_unset=True) instead
-        return json.dumps(self.to_dict())
+        return dumps(self.to_dict())
 
     @classmethod
     def from_json(cls, json_str: str) -> Self:
         """Create an instance of PaginationMeta from a JSON string"""
-        return cls.from_dict(json.loads(json_str))
+        return cls.from_dict(loads(json_str))
 
     def to_dict(self) -> Dict[str, Any]:
         """Return the dictionary representation of the model using alias.
@@ -88,7 +89,8 @@ class PaginationMeta(BaseModel):
         _obj = cls.model_validate({
             "limit": obj.get("limit"),
             "offset": obj.get("offset"),
-            "total": obj.get("total")
+            "total": obj.get("total"),
+            "nextCursor": obj.get("nextCursor")
         })
         return _obj
 
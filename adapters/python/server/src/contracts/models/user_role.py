@@ -13,13 +13,13 @@
 
 
 from __future__ import annotations
-import json
 import pprint
 import re  # noqa: F401
 from enum import Enum
 
 
 
+from contracts.serialization import loads
 try:
     from typing import Self
 except ImportError:
@@ -41,6 +41,6 @@ class UserRole(str, Enum):
     @classmethod
     def from_json(cls, json_str: str) -> Self:
         """Create an instance of UserRole from a JSON string"""
-        return cls(json.loads(json_str))
+        return cls(loads(json_str))
 
 
@@ -13,13 +13,13 @@
 
 
 from __future__ import annotations
-import json
 import pprint
 import re  # noqa: F401
 from enum import Enum
 
 
 
+from contracts.serialization import loads
 try:
     from typing import Self
 except ImportError:
@@ -39,6 +39,6 @@ class UserSortField(str, Enum):
     @classmethod
     def from_json(cls, json_str: str) -> Self:
         """Create an instance of UserSortField from a JSON string"""
-        return cls(json.loads(json_str))
+        return cls(loads(json_str))
 
 
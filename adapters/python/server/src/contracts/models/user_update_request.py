@@ -15,7 +15,6 @@
 from __future__ import annotations
 import pprint
 import re  # noqa: F401
-import json
 
 
 
@@ -25,6 +24,7 @@ from typing import Any, ClassVar, Dict, List, Optional
 from typing_extensions import Annotated
 from contracts.models.user_role import UserRole
 from contracts.models.user_status import UserStatus
+from contracts.serialization import dumps, loads
 try:
     from typing import Self
 except ImportError:
@@ -34,34 +34,16 @@ class UserUpdateRequest(BaseModel):
     """
     Request payload for updating user information
     """ # noqa: E501
-    first_name: Optional[Annotated[str, Field(strict=True)]] = Field(default='', description="Name (either first name or last name) of the user.", alias="firstName")
-    last_name: Optional[Annotated[str, Field(strict=True)]] = Field(default='', description="Name (either first name or last name) of the user.", alias="lastName")
+    first_name: Optional[Annotated[str, Field(strict=True, max_length=50)]] = Field(default='', description="Name (either first name or last name) of the user.", alias="firstName")
+    last_name: Optional[Annotated[str, Field(strict=True, max_length=50)]] = Field(default='', description="Name (either first name or last name) of the user.", alias="lastName")
     role: Optional[UserRole] = None
     status: Optional[UserStatus] = None
     avatar_url: Optional[Annotated[str, Field(strict=True, max_length=500)]] = Field(default=None, description="User avatar URL", alias="avatarUrl")
     __properties: ClassVar[List[str]] = ["firstName", "lastName", "role", "status", "avatarUrl"]
-
-    @field_validator('first_name')
-    def first_name_validate_regular_expression(cls, value):
-        """Validates the regular expression"""
-        if value is None:
-            return value
-
-        if not re.match(r"^.{0,50}$", value):
-            raise ValueError(r"must validate the regular expression /^.{0,50}$/")
-        return value
-
-    @field_validator('last_name')
-    def last_name_validate_regular_expression(cls, value):
-        """Validates the regular expression"""
-        if value is None:
-            return value
-
-        if not re.match(r"^.{0,50}$", value):
-            raise ValueError(r"must validate the regular expression /^.{0,50}$/")
-        return value
+    __nullable_fields__: ClassVar[List[str]] = ["avatar_url"]
 
     model_config = {
+        "defer_build": True,
         "populate_by_name": True,
         "validate_assignment": True,
         "protected_namespaces": (),
@@ -74,13 +56,12 @@ class UserUpdateRequest(BaseModel):
 
     def to_json(self) -> str:
         """Returns the JSON representation of the model using alias"""
-        # TODO: pydantic v2: use .model_dump_json(by_alias=True, exclude_unset=True) instead
-        return json.dumps(self.to_dict())
+        return dumps(self.to_dict())
 
     @classmethod
     def from_json(cls, json_str: str) -> Self:
         """Create an instance of UserUpdateRequest from a JSON string"""
-        return cls.from_dict(json.loads(json_str))
+        return cls.from_dict(loads(json_str))
 
     def to_dict(self) -> Dict[str, Any]:
         """Return the dictionary representation of the model using alias.
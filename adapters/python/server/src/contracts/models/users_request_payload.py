@@ -0,0 +1,107 @@
+# coding: utf-8
+
+"""
+    Contracts Blueprint API
+
+    # Contracts Blueprint API  A simple API blueprint demonstrating enterprise-grade OpenAPI specifications with multi-language code generation support for Go, Python, and TypeScript.  This API provides basic authentication and user management functionality.  ## Features - JWT-based authentication - User CRUD operations - Multi-language SDK generation - Comprehensive error handling  ## Error Codes - `ERR_INTERNAL`: Internal server error - `ERR_INVALID_ARG`: Invalid argument(s) provided - `ERR_NOT_FOUND`: Resource not found - `ERR_ALREADY_EXISTS`: Resource already exists - `ERR_ACCESS_DENIED`: Access denied - `ERR_INVALID_CREDENTIALS`: Invalid authentication credentials - `ERR_VALIDATION_FAILED`: Request validation failed 
+
+    The version of the OpenAPI document: 1.0.0
+    Generated by OpenAPI Generator (https://openapi-generator.tech)
+
+    Do not edit the class manually.
+"""  # noqa: E501
+
+
+from __future__ import annotations
+import pprint
+import re  # noqa: F401
+
+
+
+
+from pydantic import BaseModel, ConfigDict, Field, StrictStr
+from typing import Any, ClassVar, Dict, List, Optional
+from typing_extensions import Annotated
+from contracts.models.order import Order
+from contracts.models.user_sort_field import UserSortField
+from contracts.models.users_request_payload_filter import UsersRequestPayloadFilter
+from contracts.serialization import dumps, loads
+try:
+    from typing import Self
+except ImportError:
+    from typing_extensions import Self
+
+class UsersRequestPayload(BaseModel):
+    """
+    Users request payload.
+    """ # noqa: E501
+    limit: Annotated[int, Field(le=100, strict=True, ge=1)] = Field(description="Limit of records count to return.")
+    offset: Annotated[int, Field(strict=True, ge=0)] = Field(description="Offset of records to skip.")
+    cursor: Optional[StrictStr] = Field(default=None, description="Opaque keyset pagination cursor. Returned as `meta.nextCursor` while more records follow; pass it back unchanged to fetch the next page, with `offset` set to 0.")
+    filter: Optional[UsersRequestPayloadFilter] = None
+    sort_by: Optional[List[UserSortField]] = Field(default=None, description="Fields to sort the results by.", alias="sortBy")
+    order_by: Optional[List[Order]] = Field(default=None, description="Order of sorting (ascending/descending). `sortBy` and `orderBy` arrays have always the same length, and each element or `sortBy` array corresponds to the appropriate element of `orderBy` array.", alias="orderBy")
+    __properties: ClassVar[List[str]] = ["limit", "offset", "cursor", "filter", "sortBy", "orderBy"]
+
+    model_config = {
+        "defer_build": True,
+        "populate_by_name": True,
+        "validate_assignment": True,
+        "protected_namespaces": (),
+    }
+
+
+    def to_str(self) -> str:
+        """Returns the string representation of the model using alias"""
+        return pprint.pformat(self.model_dump(by_alias=True))
+
+    def to_json(self) -> str:
+        """Returns the JSON representation of the model using alias"""
+        return dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, json_str: str) -> Self:
+        """Create an instance of UsersRequestPayload from a JSON string"""
+        return cls.from_dict(loads(json_str))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the dictionary representation of the model using alias.
+
+        This has the following differences from calling pydantic's
+        `self.model_dump(by_alias=True)`:
+
+        * `None` is only added to the output dict for nullable fields that
+          were set at model initialization. Other fields with value `None`
+          are ignored.
+        """
+        _dict = self.model_dump(
+            by_alias=True,
+            exclude={
+            },
+            exclude_none=True,
+        )
+        # override the default output from pydantic by calling `to_dict()` of filter
+        if self.filter:
+            _dict['filter'] = self.filter.to_dict()
+        return _dict
+
+    @classmethod
+    def from_dict(cls, obj: Dict) -> Self:
+        """Create an instance of UsersRequestPayload from a dict"""
+        if obj is None:
+            return None
+
+        if not isinstance(obj, dict):
+            return cls.model_validate(obj)
+
+        _obj = cls.model_validate({
+            "limit": obj.get("limit") if obj.get("limit") is not None else 20,
+            "offset": obj.get("offset") if obj.get("offset") is not None else 0,
+            "cursor": obj.get("cursor"),
+            "filter": UsersRequestPayloadFilter.from_dict(obj.get("filter")) if obj.get("filter") is not None else None,
+            "sortBy": obj.get("sortBy"),
+            "orderBy": obj.get("orderBy")
+        })
+        return _obj
+
+
@@ -0,0 +1,92 @@
+# coding: utf-8
+
+"""MessagePack content negotiation.
+
+The generated routers use `NegotiatedRoute` (through its subclass
+`contracts.metrics.MeteredRoute`). When the optional `msgpack` package is
+installed:
+
+* a request body sent with `Content-Type: application/msgpack` is decoded
+  and validated exactly as the equivalent JSON body would be;
+* a client whose `Accept` header prefers `application/msgpack` over JSON
+  gets model responses encoded with MessagePack (see `render_msgpack`).
+
+JSON stays the default, and error responses and streamed lists are always
+JSON.
+"""
+
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+from contracts.responses import JSON, MSGPACK, media_type, msgpack
+
+_MSGPACK_TYPES = (MSGPACK, "application/x-msgpack", "application/vnd.msgpack")
+
+
+def _essence(value: str) -> str:
+    return value.split(";", 1)[0].strip().lower()
+
+
+def preferred_media_type(accept: Optional[str]) -> str:
+    """Return `MSGPACK` if `accept` ranks it above JSON, else `JSON`"""
+    if not accept or msgpack is None or "msgpack" not in accept:
+        return JSON
+    weights = {}
+    for item in accept.split(","):
+        name, _, params = item.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+    packed = max(weights.get(name, 0.0) for name in _MSGPACK_TYPES)
+    plain = weights.get(JSON, weights.get("application/*", weights.get("*/*", 0.0)))
+    return MSGPACK if packed > 0 and packed > plain else JSON
+
+
+async def _decode_msgpack(request: Request) -> Request:
+    body = await request.body()
+    if not body:
+        return request
+    try:
+        data = msgpack.unpackb(body, timestamp=3)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid MessagePack body")
+    scope = dict(request.scope)
+    scope["headers"] = [
+        (name, value)
+        for name, value in request.scope["headers"]
+        if name != b"content-type"
+    ] + [(b"content-type", JSON.encode("ascii"))]
+    decoded = Request(scope, request.receive)
+    # Starlette caches the body and its JSON parse on these attributes
+    decoded._body = body
+    decoded._json = data
+    return decoded
+
+
+class NegotiatedRoute(APIRoute):
+    """API route that accepts and produces MessagePack as well as JSON"""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        if msgpack is None:
+            return handler
+
+        async def route_handler(request: Request) -> Response:
+            content_type = request.headers.get("content-type")
+            if content_type and _essence(content_type) in _MSGPACK_TYPES:
+                request = await _decode_msgpack(request)
+            token = media_type.set(preferred_media_type(request.headers.get("accept")))
+            try:
+                return await handler(request)
+            finally:
+                media_type.reset(token)
+
+        return route_handler
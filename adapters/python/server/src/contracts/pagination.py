@@ -0,0 +1,72 @@
+# coding: utf-8
+
+"""Keyset pagination cursors for `GET /v1/users`.
+
+A cursor encodes the sort key and id of the last record of a page. An
+implementation of `BaseUsersApi.get_user_list` decodes it and resumes with
+`WHERE (sort key, id) > (:key, :id) ORDER BY sort key, id LIMIT :limit`,
+which costs the same on every page, unlike `OFFSET`. Cursors are opaque to
+clients but not signed; never trust their content beyond ordering.
+"""
+
+import base64
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from contracts.models.user import User
+from contracts.models.user_sort_field import UserSortField
+
+MAX_CURSOR_LENGTH = 1024
+
+
+class InvalidCursorError(ValueError):
+    """Raised for a cursor that was not produced by `encode_cursor`"""
+
+
+def encode_cursor(sort_key: Sequence[Any], id: str) -> str:
+    """Encode the `(sort key, id)` position of a record as an opaque cursor"""
+    payload = json.dumps(
+        [list(sort_key), id], separators=(",", ":"), ensure_ascii=False
+    )
+    return (
+        base64.urlsafe_b64encode(payload.encode("utf-8")).rstrip(b"=").decode("ascii")
+    )
+
+
+def decode_cursor(cursor: str) -> Tuple[List[Any], str]:
+    """Return the `(sort key, id)` position encoded in `cursor`"""
+    if len(cursor) > MAX_CURSOR_LENGTH:
+        raise InvalidCursorError("cursor is too long")
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_key, id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (TypeError, ValueError) as e:
+        raise InvalidCursorError("malformed cursor") from e
+    if not isinstance(sort_key, list) or not isinstance(id, str):
+        raise InvalidCursorError("malformed cursor")
+    return sort_key, id
+
+
+def user_sort_key(user: User, sort_by: Sequence[UserSortField]) -> List[Any]:
+    """Return the values `user` is ordered by for the given sort fields"""
+    key: List[Any] = []
+    for field in sort_by:
+        if field == UserSortField.FULL_NAME:
+            key.append(("%s %s" % (user.first_name, user.last_name)).casefold())
+        else:
+            raise ValueError("unsupported sort field %r" % field)
+    return key
+
+
+def next_cursor(
+    rows: Sequence[User], limit: int, sort_by: Sequence[UserSortField]
+) -> Optional[str]:
+    """Return the cursor of the page following `rows`.
+
+    Fetch `limit + 1` rows and pass them all; `None` is returned when no
+    record follows the page.
+    """
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor(user_sort_key(last, sort_by), last.id)
@@ -0,0 +1,285 @@
+# coding: utf-8
+
+"""Decoding of the `UsersRequestPayload` query parameter of `GET /v1/users`.
+
+The spec serializes the payload object into the query
+(`content: application/json`), which the generator turns into an untyped
+argument. `users_request_payload` is the dependency the router declares
+instead; it hands `BaseUsersApi.get_user_list` a validated
+`UsersRequestPayload`. Both styles clients use are accepted:
+
+* JSON in the query:
+  `?UsersRequestPayload={"limit":20,"offset":0,"sortBy":["FULL_NAME"]}`;
+* `deepObject`: `?UsersRequestPayload[limit]=20&UsersRequestPayload[offset]=0
+  &UsersRequestPayload[filter][statuses]=ACTIVE`, repeating a key (with or
+  without a trailing `[]`) for every item of an array. Values are converted
+  to the types the schema declares before validation.
+
+When both are present the JSON parameter wins. The parameter is required:
+a request without it is answered with 400. Requests that exceed
+`CONTRACTS_QUERY_MAX_LENGTH` characters or nest deeper than
+`CONTRACTS_QUERY_MAX_DEPTH` levels are rejected before anything is parsed.
+
+Validated payloads are kept in an LRU of `CONTRACTS_QUERY_CACHE_SIZE`
+entries keyed by the canonical query (the JSON string, or the deepObject
+pairs sorted by key), so a repeated query, like the refresh of a dashboard,
+is neither parsed nor validated again. The instances are shared between
+requests: treat them as read-only.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from contracts.models.users_request_payload import UsersRequestPayload
+from contracts.settings import settings
+
+DEFAULT_MAX_LENGTH = 4096
+DEFAULT_MAX_DEPTH = 8
+DEFAULT_CACHE_SIZE = 1024
+
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+_BRACKET = re.compile(r"[\[\]{}]")
+_SEGMENT = re.compile(r"\[([^\[\]]*)\]")
+_INTEGER = re.compile(r"-?\d+\Z")
+
+
+def json_depth(text: str) -> int:
+    """Deepest nesting of objects and arrays in the JSON document `text`,
+    found without parsing it"""
+    depth = deepest = 0
+    for bracket in _BRACKET.findall(_STRING.sub("", text)):
+        if bracket in "[{":
+            depth += 1
+            if depth > deepest:
+                deepest = depth
+        else:
+            depth -= 1
+    return deepest
+
+
+class QueryDecoder:
+    """Decodes and validates an object serialized into the query.
+
+    :param model: The model the object is validated as
+    :param name: Name of the query parameter
+    :param max_length: Longest query accepted, in characters
+    :param max_depth: Deepest nesting of objects and arrays accepted
+    :param cache_size: Number of validated objects kept; 0 disables the cache
+    """
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        name: str,
+        max_length: int = DEFAULT_MAX_LENGTH,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.adapter = TypeAdapter(model)
+        self.name = name
+        self.max_length = max_length
+        self.max_depth = max_depth
+        self.cache_size = cache_size
+        self._prefix = name + "["
+        self._schema: Optional[Dict[str, Any]] = None
+        self._cache: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def decode(self, request: Request) -> Optional[Any]:
+        """Return the object in the query of `request`, or None if it has none"""
+        raw = request.query_params.get(self.name)
+        if raw is not None:
+            return self.decode_json(raw)
+        pairs = [
+            (key, value)
+            for key, value in request.query_params.multi_items()
+            if key.startswith(self._prefix)
+        ]
+        if pairs:
+            return self.decode_deep_object(pairs)
+        return None
+
+    def decode_json(self, raw: str) -> Any:
+        """Validate the JSON-encoded object `raw`"""
+        if len(raw) > self.max_length:
+            raise self._error("string_too_long", "Query parameter is too long", raw)
+        decoded = self._cached(raw)
+        if decoded is not None:
+            return decoded
+        if json_depth(raw) > self.max_depth:
+            raise self._error("too_deep", "Query parameter is nested too deeply", raw)
+        try:
+            decoded = self.adapter.validate_json(raw)
+        except ValidationError as e:
+            raise self._invalid(e) from None
+        return self._store(raw, decoded)
+
+    def decode_deep_object(self, pairs: Sequence[Tuple[str, str]]) -> Any:
+        """Validate the object given by the `deepObject` style `pairs`"""
+        if sum(len(key) + len(value) for key, value in pairs) > self.max_length:
+            raise self._error("string_too_long", "Query parameter is too long", None)
+        # Stable, so repeated keys keep the order of their items
+        key = tuple(sorted(pairs, key=lambda pair: pair[0]))
+        decoded = self._cached(key)
+        if decoded is not None:
+            return decoded
+        document: Dict[str, Any] = {}
+        for name, value in key:
+            path = self._path(name)
+            if path is None:
+                raise self._error("value_error", "Malformed deepObject key", name)
+            if len(path) > self.max_depth:
+                raise self._error(
+                    "too_deep", "Query parameter is nested too deeply", name
+                )
+            if not _insert(document, path, value):
+                raise self._error("value_error", "Conflicting deepObject keys", name)
+        try:
+            decoded = self.adapter.validate_python(
+                _coerce(document, self.schema, self.schema)
+            )
+        except ValidationError as e:
+            raise self._invalid(e) from None
+        return self._store(key, decoded)
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        """JSON schema of the model, which deepObject values are converted by"""
+        if self._schema is None:
+            self._schema = self.adapter.json_schema(by_alias=True)
+        return self._schema
+
+    def _path(self, key: str) -> Optional[List[str]]:
+        rest = key[len(self.name):]
+        path = _SEGMENT.findall(rest)
+        if not path or "".join("[%s]" % segment for segment in path) != rest:
+            return None
+        if path[-1] == "":
+            path.pop()
+        if not path or "" in path:
+            return None
+        return path
+
+    def _cached(self, key: Hashable) -> Optional[Any]:
+        if not self.cache_size:
+            return None
+        decoded = self._cache.get(key)
+        if decoded is None:
+            self.misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self.hits += 1
+        return decoded
+
+    def _store(self, key: Hashable, decoded: Any) -> Any:
+        if self.cache_size:
+            self._cache[key] = decoded
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return decoded
+
+    def _error(self, type: str, msg: str, input: Any) -> RequestValidationError:
+        return RequestValidationError(
+            [{"type": type, "loc": ("query", self.name), "msg": msg, "input": input}]
+        )
+
+    def _invalid(self, error: ValidationError) -> RequestValidationError:
+        errors = []
+        for detail in error.errors(include_url=False):
+            detail["loc"] = ("query", self.name) + tuple(detail["loc"])
+            detail.pop("ctx", None)
+            errors.append(detail)
+        return RequestValidationError(errors)
+
+
+def _insert(document: Dict[str, Any], path: List[str], value: str) -> bool:
+    """Set `path` of `document` to `value`, collecting repeated leaves in a
+    list; False if `path` conflicts with what is already there"""
+    node = document
+    for segment in path[:-1]:
+        child = node.setdefault(segment, {})
+        if not isinstance(child, dict):
+            return False
+        node = child
+    leaf = path[-1]
+    if leaf not in node:
+        node[leaf] = value
+    elif isinstance(node[leaf], list):
+        node[leaf].append(value)
+    elif isinstance(node[leaf], str):
+        node[leaf] = [node[leaf], value]
+    else:
+        return False
+    return True
+
+
+def _coerce(value: Any, schema: Dict[str, Any], root: Dict[str, Any]) -> Any:
+    """Convert the strings of a deepObject document to the types `schema`
+    declares; anything that does not fit is left for validation to reject"""
+    while "$ref" in schema:
+        schema = root["$defs"][schema["$ref"].rsplit("/", 1)[-1]]
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+        if len(options) == 1:
+            return _coerce(value, options[0], root)
+        return value
+    kind = schema.get("type")
+    if kind == "object" and isinstance(value, dict):
+        properties = schema.get("properties", {})
+        return {
+            key: _coerce(item, properties[key], root) if key in properties else item
+            for key, item in value.items()
+        }
+    if kind == "array":
+        items = value if isinstance(value, list) else [value]
+        return [_coerce(item, schema.get("items", {}), root) for item in items]
+    if not isinstance(value, str):
+        return value
+    if kind == "integer" and _INTEGER.match(value):
+        return int(value)
+    if kind == "number":
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    if kind == "boolean" and value in ("true", "false"):
+        return value == "true"
+    return value
+
+
+users_request_payloads = QueryDecoder(
+    UsersRequestPayload,
+    "UsersRequestPayload",
+    max_length=settings.query_max_length,
+    max_depth=settings.query_max_depth,
+    cache_size=settings.query_cache_size,
+)
+
+
+async def users_request_payload(
+    request: Request,
+    raw: Optional[str] = Query(
+        None,
+        alias="UsersRequestPayload",
+        description="Filter, sort and pagination query to fetch records.",
+    ),
+) -> UsersRequestPayload:
+    """Dependency decoding the required `UsersRequestPayload` query parameter"""
+    if raw is not None:
+        return users_request_payloads.decode_json(raw)
+    payload = users_request_payloads.decode(request)
+    if payload is None:
+        raise HTTPException(status_code=400, detail="UsersRequestPayload is required")
+    return payload
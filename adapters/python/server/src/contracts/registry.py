@@ -0,0 +1,103 @@
+# coding: utf-8
+
+"""Discovery of the modules providing API implementations.
+
+Implementations register themselves by subclassing a `Base*Api` class, which
+only happens once their module is imported. `ImplementationRegistry` decides
+which modules to import and imports each of them at most once, when the
+application lifespan starts rather than when the routers are imported:
+
+* `CONTRACTS_IMPL_MODULES`, a comma-separated list of module names, replaces
+  the scan of `contracts.impl` when set;
+* otherwise the `contracts.impl` package is scanned once and the result is
+  cached;
+* distributions can also declare entry points in the `contracts.impl` group.
+  An entry point named after a base API (e.g. `BaseUsersApi`) is only loaded
+  when that API is started; other entry points are always loaded.
+"""
+
+import importlib
+import pkgutil
+import sys
+from typing import Iterable, List, Optional, Sequence, Set
+
+from contracts.settings import settings
+
+ENTRY_POINT_GROUP = "contracts.impl"
+
+
+def _entry_points(group: str) -> list:
+    if sys.version_info >= (3, 10):
+        from importlib.metadata import entry_points
+
+        return list(entry_points(group=group))
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # Python 3.7
+        try:
+            from importlib_metadata import entry_points
+        except ImportError:
+            return []
+    return list(entry_points().get(group, ()))
+
+
+class ImplementationRegistry:
+    """Imports implementation modules on demand, scanning for them once.
+
+    :param package: Package scanned for implementation modules
+    :param modules: Explicit module names, replacing the package scan
+    :param group: Entry point group of third-party implementations
+    """
+
+    def __init__(
+        self,
+        package: str = "contracts.impl",
+        modules: Optional[Sequence[str]] = None,
+        group: str = ENTRY_POINT_GROUP,
+    ) -> None:
+        self.package = package
+        self.explicit = list(modules) if modules else None
+        self.group = group
+        self._modules: Optional[List[str]] = None
+        self._entry_points: Optional[list] = None
+        self._loaded: Set[str] = set()
+
+    def modules(self) -> List[str]:
+        """Names of the implementation modules, computed on first use"""
+        if self._modules is None:
+            if self.explicit is not None:
+                self._modules = list(self.explicit)
+            else:
+                package = importlib.import_module(self.package)
+                self._modules = [
+                    name
+                    for _, name, _ in pkgutil.iter_modules(
+                        package.__path__, package.__name__ + "."
+                    )
+                ]
+        return self._modules
+
+    def entry_points(self) -> list:
+        if self._entry_points is None:
+            self._entry_points = _entry_points(self.group)
+        return self._entry_points
+
+    def load(self, bases: Iterable[type] = ()) -> None:
+        """Import every implementation module and the entry points
+        registered for `bases` that have not been imported yet"""
+        for name in self.modules():
+            if name not in self._loaded:
+                importlib.import_module(name)
+                self._loaded.add(name)
+        names = {base.__name__ for base in bases}
+        for entry_point in self.entry_points():
+            key = "%s=%s" % (entry_point.name, entry_point.value)
+            if key in self._loaded:
+                continue
+            if entry_point.name.startswith("Base") and entry_point.name not in names:
+                continue
+            entry_point.load()
+            self._loaded.add(key)
+
+
+registry = ImplementationRegistry(modules=settings.impl_modules)
@@ -0,0 +1,154 @@
+# coding: utf-8
+
+"""Trusted responses: serialize handler output once, without re-validation.
+
+Implementations already return validated model instances, yet FastAPI checks
+them against the route's `response_model` again and serializes the result
+through `jsonable_encoder`. Routes decorated with `trusted_response` render the
+returned model straight to JSON bytes instead, using the same rules as the
+generated `to_dict()` (aliases, `None` omitted except for nullable fields that
+were explicitly set). Setting `CONTRACTS_VERIFY_RESPONSES` restores FastAPI's
+full response validation, e.g. in staging.
+
+Routes served by `contracts.negotiation.NegotiatedRoute` may also answer in
+MessagePack when the client asks for it; `media_type` holds the type chosen
+for the current request.
+"""
+
+import functools
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Tuple, Union, get_args, get_origin
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from contracts.serialization import dumps
+from contracts.settings import settings
+from contracts.timing import timed
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+
+# Media type of the response to the current request
+media_type: ContextVar[str] = ContextVar("media_type", default=JSON)
+
+# Per model class: nullable fields as (name, alias) and the nested model
+# fields that lead to nullable fields as (name, alias, is_list, model class)
+_Plan = Tuple[List[Tuple[str, str]], List[Tuple[str, str, bool, type]]]
+_plans: Dict[type, _Plan] = {}
+
+
+def _nested_model(annotation: Any) -> Tuple[Any, bool]:
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _nested_model(args[0]) if len(args) == 1 else (None, False)
+    if origin in (list, List):
+        model, _ = _nested_model(get_args(annotation)[0])
+        return model, True
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+def _plan(cls: type) -> _Plan:
+    try:
+        return _plans[cls]
+    except KeyError:
+        pass
+    nullable: List[Tuple[str, str]] = []
+    nested: List[Tuple[str, str, bool, type]] = []
+    # registered before recursing so self-referencing models terminate
+    _plans[cls] = (nullable, nested)
+    for name, field in cls.model_fields.items():
+        alias = field.alias or name
+        if name in getattr(cls, "__nullable_fields__", ()):
+            nullable.append((name, alias))
+        model, many = _nested_model(field.annotation)
+        if model is not None and any(_plan(model)):
+            nested.append((name, alias, many, model))
+    return _plans[cls]
+
+
+def _restore_nulls(model: BaseModel, data: Dict[str, Any]) -> None:
+    nullable, nested = _plan(type(model))
+    fields_set = model.model_fields_set
+    for name, alias in nullable:
+        if name in fields_set and getattr(model, name) is None:
+            data[alias] = None
+    for name, alias, many, _ in nested:
+        value = getattr(model, name)
+        if value is None:
+            continue
+        if many:
+            for item, item_data in zip(value, data[alias]):
+                if item is not None:
+                    _restore_nulls(item, item_data)
+        else:
+            _restore_nulls(value, data[alias])
+
+
+def render(model: BaseModel) -> bytes:
+    """Serialize `model` to JSON bytes following the `to_dict()` rules"""
+    data = model.model_dump(by_alias=True, exclude_none=True)
+    _restore_nulls(model, data)
+    if orjson is not None:
+        return orjson.dumps(data)
+    return dumps(data).encode("utf-8")
+
+
+def _isoformat(obj: Any) -> Any:
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError("Object of type %s is not serializable" % type(obj).__name__)
+
+
+def render_msgpack(model: BaseModel) -> bytes:
+    """Serialize `model` to MessagePack following the `to_dict()` rules;
+    datetimes are ISO 8601 strings, as in JSON"""
+    data = model.model_dump(by_alias=True, exclude_none=True)
+    _restore_nulls(model, data)
+    return msgpack.packb(data, default=_isoformat)
+
+
+def render_as(model: BaseModel, media: str) -> bytes:
+    """Serialize `model` to `media`, one of `JSON` and `MSGPACK`"""
+    with timed("render", "serialization %s" % type(model).__name__):
+        if media == MSGPACK:
+            return render_msgpack(model)
+        return render(model)
+
+
+def negotiated_headers() -> Dict[str, str]:
+    """Headers of a response whose body depends on the `Accept` header"""
+    return {"Vary": "Accept"} if msgpack is not None else {}
+
+
+def trusted_response(endpoint: Callable) -> Callable:
+    """Decorate a route so the model it returns skips response validation"""
+    if settings.verify_responses:
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def route(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        if isinstance(result, BaseModel):
+            media = media_type.get()
+            return Response(
+                content=render_as(result, media),
+                media_type=media,
+                headers=negotiated_headers(),
+            )
+        return result
+
+    return route
@@ -2,7 +2,7 @@
 
 from typing import List
 
-from fastapi import Depends, Security  # noqa: F401
+from fastapi import Depends, HTTPException, Security  # noqa: F401
 from fastapi.openapi.models import OAuthFlowImplicit, OAuthFlows  # noqa: F401
 from fastapi.security import (  # noqa: F401
     HTTPAuthorizationCredentials,
@@ -16,21 +16,45 @@ from fastapi.security import (  # noqa: F401
 )
 from fastapi.security.api_key import APIKeyCookie, APIKeyHeader, APIKeyQuery  # noqa: F401
 
+from starlette.concurrency import run_in_threadpool
+
 from contracts.models.extra_models import TokenModel
+from contracts.settings import settings
+from contracts.timing import timed
+from contracts.tokens import InvalidTokenError, token_verifier
 
 
 bearer_auth = HTTPBearer()
 
 
-def get_token_bearerAuth(credentials: HTTPAuthorizationCredentials = Depends(bearer_auth)) -> TokenModel:
+async def get_token_bearerAuth(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_auth),
+) -> TokenModel:
     """
     Check and retrieve authentication information from custom bearer token.
 
+    Runs on the event loop. Tokens missing from the cache are verified inline
+    too, unless `CONTRACTS_TOKEN_EXECUTOR` moves that work to the threadpool.
+
     :param credentials Credentials provided by Authorization header
     :type credentials: HTTPAuthorizationCredentials
-    :return: Decoded token information or None if token is invalid
+    :return: Decoded token information, or None if no verification keys are configured
     :rtype: TokenModel | None
     """
 
-    ...
+    if not token_verifier.enabled:
+        return None
+    token = credentials.credentials
+    try:
+        with timed("auth"):
+            if not settings.token_executor:
+                return token_verifier.verify(token)
+            model = token_verifier.cached(token)
+            if model is None:
+                model = await run_in_threadpool(token_verifier.decode, token)
+            return model
+    except InvalidTokenError as exc:
+        raise HTTPException(
+            status_code=401, detail=str(exc), headers={"WWW-Authenticate": "Bearer"}
+        )
 
@@ -0,0 +1,39 @@
+# coding: utf-8
+
+"""JSON encoding shared by the generated models.
+
+With `CONTRACTS_FAST_JSON` enabled, `dumps`/`loads` are backed by orjson;
+otherwise the standard library `json` module is used.
+"""
+
+import json
+from typing import Any, Union
+
+from contracts.settings import settings
+
+
+def _default(obj: Any) -> Any:
+    # model_dump() keeps datetimes as objects; emit them the way orjson does
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError("Object of type %s is not JSON serializable" % type(obj).__name__)
+
+
+if settings.fast_json:
+    import orjson
+
+    def dumps(obj: Any) -> str:
+        """Serialize `obj` to a JSON string"""
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """Deserialize a JSON document"""
+        return orjson.loads(data)
+else:
+    def dumps(obj: Any) -> str:
+        """Serialize `obj` to a JSON string"""
+        return json.dumps(obj, default=_default)
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """Deserialize a JSON document"""
+        return json.loads(data)
@@ -0,0 +1,258 @@
+# coding: utf-8
+
+"""Production entry point: a pre-forking uvicorn server.
+
+    python -m contracts.serve --host 0.0.0.0 --port 8000 [--workers N]
+
+The application and the implementation modules are imported, and the model
+schemas built, once in the parent process, which then binds the listening
+socket, runs `gc.freeze()` and forks the workers. The workers therefore
+start without importing or building anything and share the parent's memory
+pages copy-on-write; freezing keeps the garbage collector from touching (and
+so copying) the objects created beforehand. Each worker runs the application's lifespan, so
+implementations are instantiated, and get their own connections, after the
+fork.
+
+The worker count defaults to `CONTRACTS_WORKERS`, or else the number of CPUs
+the process may run on. uvloop and httptools are used when installed.
+SIGTERM or SIGINT shuts down gracefully: workers stop accepting
+connections, finish the requests in flight and run the lifespan shutdown;
+those still running after `--graceful-timeout` seconds are killed. Workers
+that die on their own are replaced.
+"""
+
+import argparse
+import gc
+import importlib.util
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from pydantic import BaseModel
+from uvicorn.importer import ImportFromStringError, import_from_string
+
+from contracts.settings import settings
+
+logger = logging.getLogger("contracts.serve")
+
+# A worker exiting sooner than this after being started is considered to be
+# crashing on startup; it is replaced only after a pause
+MIN_UPTIME = 1.0
+
+
+def default_workers() -> int:
+    """Number of CPUs this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover
+        return os.cpu_count() or 1
+
+
+def event_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def bind(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def preload() -> None:
+    """Import the implementation modules the lifespan would import in every
+    worker, and build the validators and serializers the models defer to
+    their first use, so that they are shared too"""
+    import contracts.models as models
+    from contracts.main import API_BASES
+    from contracts.registry import registry
+
+    registry.load(API_BASES)
+    for name in models.__all__:
+        model = getattr(models, name)
+        if isinstance(model, type) and issubclass(model, BaseModel):
+            model.model_rebuild()
+
+
+class Supervisor:
+    """Forks the workers serving `app` on `sock` and keeps them running.
+
+    :param app: The imported ASGI application
+    :param sock: Bound, listening socket shared by all workers
+    :param workers: Number of worker processes
+    :param graceful_timeout: Seconds workers get to finish on shutdown
+    :param config: Further keyword arguments of `uvicorn.Config`
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        sock: socket.socket,
+        workers: int,
+        graceful_timeout: float = 30.0,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.config = config or {}
+        self.children: Dict[int, float] = {}
+        self.stopping = False
+
+    def serve(self) -> None:
+        """Serve in this process, without forking"""
+        config = uvicorn.Config(
+            self.app,
+            loop=event_loop(),
+            http=http_protocol(),
+            lifespan="on",
+            **self.config,
+        )
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+    def run(self) -> int:
+        """Fork the workers and supervise them until a shutdown signal"""
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self._stop)
+        preload()
+        gc.collect()
+        gc.freeze()
+        for _ in range(self.workers):
+            self._spawn()
+        while not self.stopping:
+            self._reap()
+            time.sleep(0.1)
+        self._shutdown()
+        return 0
+
+    def _spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, signal.SIG_DFL)
+            code = 0
+            try:
+                self.serve()
+            except BaseException:
+                logger.exception("Worker %d failed", os.getpid())
+                code = 1
+            finally:
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+        logger.info("Started worker [%d]", pid)
+
+    def _reap(self) -> List[int]:
+        exited = []
+        while self.children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                break
+            started = self.children.pop(pid, None)
+            if started is None:
+                continue
+            exited.append(pid)
+            if self.stopping:
+                continue
+            logger.warning(
+                "Worker [%d] exited with wait status %d, replacing it", pid, status
+            )
+            if time.monotonic() - started < MIN_UPTIME:
+                time.sleep(MIN_UPTIME)
+            self._spawn()
+        return exited
+
+    def _stop(self, signum: int, frame: Any) -> None:
+        self.stopping = True
+
+    def _shutdown(self) -> None:
+        logger.info("Shutting down %d workers", len(self.children))
+        for pid in self.children:
+            self._signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout
+        while self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+        for pid in list(self.children):
+            logger.warning("Worker [%d] did not stop in time, killing it", pid)
+            self._signal(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            del self.children[pid]
+
+    @staticmethod
+    def _signal(pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m contracts.serve", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument(
+        "--app", default="contracts.main:app", help="ASGI application to serve"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.workers or default_workers(),
+        help="worker processes, by default CONTRACTS_WORKERS or the CPU count",
+    )
+    parser.add_argument("--graceful-timeout", type=float, default=30.0)
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--no-access-log", dest="access_log", action="store_false")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=args.log_level.upper(), format="%(levelname)s:     %(message)s"
+    )
+    try:
+        app = import_from_string(args.app)
+    except ImportFromStringError as error:
+        parser.error(str(error))
+    sock = bind(args.host, args.port, args.backlog)
+    logger.info(
+        "Serving %s on http://%s:%d with %d worker(s), %s and %s",
+        args.app,
+        args.host,
+        args.port,
+        args.workers,
+        event_loop(),
+        http_protocol(),
+    )
+    supervisor = Supervisor(
+        app,
+        sock,
+        args.workers,
+        graceful_timeout=args.graceful_timeout,
+        config={
+            "log_level": args.log_level,
+            "access_log": args.access_log,
+            "backlog": args.backlog,
+        },
+    )
+    if args.workers <= 1 or not hasattr(os, "fork"):
+        supervisor.serve()
+        return 0
+    return supervisor.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# coding: utf-8
+
+import os
+from typing import List, Mapping, Optional
+
+from pydantic import BaseModel
+
+
+def env_flag(
+    name: str, default: bool = False, environ: Optional[Mapping[str, str]] = None
+) -> bool:
+    """Read a boolean flag such as `1`, `true`, `yes` or `on` from the environment"""
+    value = (os.environ if environ is None else environ).get(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_str(name: str, environ: Optional[Mapping[str, str]] = None) -> Optional[str]:
+    """Read an optional string from the environment, treating blank values as unset"""
+    value = (os.environ if environ is None else environ).get(name)
+    if value is None or value.strip() == "":
+        return None
+    return value.strip()
+
+
+def env_list(
+    name: str, environ: Optional[Mapping[str, str]] = None
+) -> Optional[List[str]]:
+    """Read an optional comma-separated list from the environment"""
+    value = env_str(name, environ)
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class Settings(BaseModel):
+    """Runtime options of the server adapter, read from `CONTRACTS_*` variables"""
+
+    fast_json: bool = False
+    verify_responses: bool = False
+    jwt_secret: Optional[str] = None
+    jwt_keys_file: Optional[str] = None
+    jwt_issuer: Optional[str] = None
+    jwt_audience: Optional[str] = None
+    token_cache_size: int = 10000
+    token_cache_ttl: float = 3600.0
+    token_executor: bool = False
+    impl_modules: Optional[List[str]] = None
+    response_cache: bool = False
+    response_cache_bytes: int = 64 * 1024 * 1024
+    response_cache_ttl: float = 30.0
+    single_flight: Optional[List[str]] = None
+    user_batch: bool = False
+    user_batch_window_ms: float = 2.0
+    user_batch_max: int = 100
+    compression: bool = False
+    compression_min_size: int = 1024
+    workers: Optional[int] = None
+    metrics: bool = False
+    metrics_token: Optional[str] = None
+    tracing: bool = False
+    trace_exporter: str = "memory"
+    trace_buffer: int = 1000
+    trace_file: str = "traces.jsonl"
+    trace_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    trace_service_name: str = "contracts"
+    trace_slow_ms: float = 250.0
+    trace_sample_rate: float = 0.01
+    query_max_length: int = 4096
+    query_max_depth: int = 8
+    query_cache_size: int = 1024
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "Settings":
+        return cls(
+            fast_json=env_flag("CONTRACTS_FAST_JSON", environ=environ),
+            verify_responses=env_flag("CONTRACTS_VERIFY_RESPONSES", environ=environ),
+            jwt_secret=env_str("CONTRACTS_JWT_SECRET", environ),
+            jwt_keys_file=env_str("CONTRACTS_JWT_KEYS_FILE", environ),
+            jwt_issuer=env_str("CONTRACTS_JWT_ISSUER", environ),
+            jwt_audience=env_str("CONTRACTS_JWT_AUDIENCE", environ),
+            token_cache_size=env_str("CONTRACTS_TOKEN_CACHE_SIZE", environ) or 10000,
+            token_cache_ttl=env_str("CONTRACTS_TOKEN_CACHE_TTL", environ) or 3600.0,
+            token_executor=env_flag("CONTRACTS_TOKEN_EXECUTOR", environ=environ),
+            impl_modules=env_list("CONTRACTS_IMPL_MODULES", environ),
+            response_cache=env_flag("CONTRACTS_RESPONSE_CACHE", environ=environ),
+            response_cache_bytes=(
+                env_str("CONTRACTS_RESPONSE_CACHE_BYTES", environ) or 64 * 1024 * 1024
+            ),
+            response_cache_ttl=env_str("CONTRACTS_RESPONSE_CACHE_TTL", environ) or 30.0,
+            single_flight=env_list("CONTRACTS_SINGLE_FLIGHT", environ),
+            user_batch=env_flag("CONTRACTS_USER_BATCH", environ=environ),
+            user_batch_window_ms=(
+                env_str("CONTRACTS_USER_BATCH_WINDOW_MS", environ) or 2.0
+            ),
+            user_batch_max=env_str("CONTRACTS_USER_BATCH_MAX", environ) or 100,
+            compression=env_flag("CONTRACTS_COMPRESSION", environ=environ),
+            compression_min_size=(
+                env_str("CONTRACTS_COMPRESSION_MIN_SIZE", environ) or 1024
+            ),
+            workers=env_str("CONTRACTS_WORKERS", environ),
+            metrics=env_flag("CONTRACTS_METRICS", environ=environ),
+            metrics_token=env_str("CONTRACTS_METRICS_TOKEN", environ),
+            tracing=env_flag("CONTRACTS_TRACING", environ=environ),
+            trace_exporter=env_str("CONTRACTS_TRACE_EXPORTER", environ) or "memory",
+            trace_buffer=env_str("CONTRACTS_TRACE_BUFFER", environ) or 1000,
+            trace_file=env_str("CONTRACTS_TRACE_FILE", environ) or "traces.jsonl",
+            trace_otlp_endpoint=(
+                env_str("CONTRACTS_TRACE_OTLP_ENDPOINT", environ)
+                or "http://localhost:4318/v1/traces"
+            ),
+            trace_service_name=env_str("OTEL_SERVICE_NAME", environ) or "contracts",
+            trace_slow_ms=env_str("CONTRACTS_TRACE_SLOW_MS", environ) or 250.0,
+            trace_sample_rate=env_str("CONTRACTS_TRACE_SAMPLE_RATE", environ) or 0.01,
+            query_max_length=env_str("CONTRACTS_QUERY_MAX_LENGTH", environ) or 4096,
+            query_max_depth=env_str("CONTRACTS_QUERY_MAX_DEPTH", environ) or 8,
+            query_cache_size=env_str("CONTRACTS_QUERY_CACHE_SIZE", environ) or 1024,
+        )
+
+
+settings = Settings.from_env()
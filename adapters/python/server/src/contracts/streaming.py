@@ -0,0 +1,85 @@
+# coding: utf-8
+
+"""Incremental serialization of list responses.
+
+List operations may return a `ListStream` instead of a fully built response
+model. The route then answers with a `StreamingResponse` that writes
+`{"data":[...],"meta":...}` while the implementation is still producing
+items, so neither the whole page nor its serialized form is ever held in
+memory. Items are pulled from the iterator only when the previous chunk has
+been handed to the server, which propagates the client's backpressure to the
+implementation; at most `chunk_size` bytes plus one item are buffered.
+
+Once the first chunk is sent the status code is committed, so an exception
+raised by the iterator aborts the response instead of producing an error body.
+"""
+
+import inspect
+from typing import AsyncIterator, Awaitable, Callable, Optional, Union
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from contracts.responses import render
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+Meta = Union[
+    BaseModel,
+    Callable[[], Optional[BaseModel]],
+    Callable[[], Awaitable[Optional[BaseModel]]],
+    None,
+]
+
+
+class ListStream:
+    """A list response whose items are produced by an async iterator.
+
+    :param data: Items of the page, serialized in iteration order
+    :param meta: Pagination metadata, or a callable evaluated after the last
+        item, e.g. to report a `nextCursor` derived from it
+    :param chunk_size: Number of bytes collected before a chunk is sent
+    """
+
+    def __init__(
+        self,
+        data: AsyncIterator[BaseModel],
+        meta: Meta = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        self.data = data
+        self.meta = meta
+        self.chunk_size = chunk_size
+
+    async def _meta(self) -> Optional[BaseModel]:
+        meta = self.meta
+        if callable(meta):
+            meta = meta()
+            if inspect.isawaitable(meta):
+                meta = await meta
+        return meta
+
+    async def iter_bytes(self) -> AsyncIterator[bytes]:
+        """Yield the JSON document in chunks of roughly `chunk_size` bytes"""
+        buffer = bytearray(b'{"data":[')
+        first = True
+        async for item in self.data:
+            if not first:
+                buffer += b","
+            buffer += render(item)
+            first = False
+            if len(buffer) >= self.chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+        buffer += b"]"
+        meta = await self._meta()
+        if meta is not None:
+            buffer += b',"meta":'
+            buffer += render(meta)
+        buffer += b"}"
+        yield bytes(buffer)
+
+    def response(self, status_code: int = 200) -> StreamingResponse:
+        return StreamingResponse(
+            self.iter_bytes(), status_code=status_code, media_type="application/json"
+        )
@@ -0,0 +1,91 @@
+# coding: utf-8
+
+"""Timings of the request being served, shared by metrics and tracing.
+
+`contracts.metrics.MetricsMiddleware` or `contracts.tracing.TracingMiddleware`
+puts a `Sample` in `current_sample` for every request; the route, the bearer
+token dependency, the implementation calls and response rendering fill it in.
+Outside a sampled request `current_sample` is None and `timed` does nothing.
+"""
+
+import functools
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+
+class Sample:
+    """Timings of one request, as `time.perf_counter()` values and sums
+
+    :param metrics: The `Metrics` to record the request in, if any
+    """
+
+    __slots__ = (
+        "metrics",
+        "operation",
+        "handler_started",
+        "endpoint_started",
+        "endpoint_ended",
+        "handler_ended",
+        "auth",
+        "impl",
+        "render",
+        "spans",
+    )
+
+    def __init__(self, metrics: Any = None) -> None:
+        self.metrics = metrics
+        self.operation: Optional[str] = None
+        self.handler_started = 0.0
+        self.endpoint_started: Optional[float] = None
+        self.endpoint_ended: Optional[float] = None
+        self.handler_ended = 0.0
+        self.auth = 0.0
+        self.impl = 0.0
+        self.render = 0.0
+        # (name, started, ended) of every timed block, when traced
+        self.spans: Optional[List[Tuple[str, float, float]]] = None
+
+
+current_sample: ContextVar[Optional[Sample]] = ContextVar(
+    "current_sample", default=None
+)
+
+
+class timed:
+    """Charge the time spent in the block to `phase` (`auth`, `impl` or
+    `render`) of the current request, and record it as a span called `name`
+    when the request is traced"""
+
+    __slots__ = ("phase", "name", "sample", "started")
+
+    def __init__(self, phase: str, name: Optional[str] = None) -> None:
+        self.phase = phase
+        self.name = name or phase
+
+    def __enter__(self) -> None:
+        self.sample = current_sample.get()
+        if self.sample is not None:
+            self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        sample = self.sample
+        if sample is not None:
+            ended = time.perf_counter()
+            setattr(
+                sample, self.phase, getattr(sample, self.phase) + ended - self.started
+            )
+            if sample.spans is not None:
+                sample.spans.append((self.name, self.started, ended))
+
+
+def timed_impl(call: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Wrap an implementation method so that awaiting it counts as `impl`"""
+    name = "impl %s" % getattr(call, "__name__", "call")
+
+    @functools.wraps(call)
+    async def impl(*args: Any, **kwargs: Any) -> Any:
+        with timed("impl", name):
+            return await call(*args, **kwargs)
+
+    return impl
@@ -0,0 +1,304 @@
+# coding: utf-8
+
+"""Local verification of bearer JWTs.
+
+`TokenVerifier` checks the signature and registered claims of a JWT against
+keys loaded once at startup from `CONTRACTS_JWT_SECRET` or a JWKS file
+(`CONTRACTS_JWT_KEYS_FILE`), without any network round trip. HMAC keys
+(`HS256`, `HS384`, `HS512`) are verified with the standard library; RSA, EC
+and OKP keys need the optional `PyJWT[crypto]` package.
+
+Verified claims are kept in a bounded LRU cache keyed by the SHA-256 digest of
+the token, until the token's `exp` (capped at `max_ttl` seconds). Repeated
+requests with the same token therefore pay for one hash instead of a
+signature check. Revoked tokens are remembered by the digest of their
+signing input (the header and payload segments), so rejecting them is a
+single set lookup whatever the size of the revocation list, and a revoked
+token cannot come back with another valid signature. Segments must be
+canonical base64url, without padding, so each set of claims has exactly one
+encoding.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+from contracts.models.extra_models import TokenModel
+from contracts.serialization import loads
+from contracts.settings import Settings, settings
+
+DEFAULT_CACHE_SIZE = 10000
+DEFAULT_MAX_TTL = 3600.0
+
+_BASE64URL = re.compile(r"[A-Za-z0-9_-]*")
+
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+class InvalidTokenError(ValueError):
+    """Raised when a bearer token is malformed, badly signed, expired or revoked"""
+
+
+def _b64decode(segment: str) -> bytes:
+    """Decode an unpadded base64url segment, rejecting every encoding but the
+    canonical one: padding, characters outside the alphabet and non-zero
+    trailing bits would otherwise give one token many spellings"""
+    if not _BASE64URL.fullmatch(segment):
+        raise InvalidTokenError("token is not base64url encoded")
+    try:
+        decoded = base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+    except (binascii.Error, ValueError):
+        raise InvalidTokenError("token is not base64url encoded")
+    if base64.urlsafe_b64encode(decoded).rstrip(b"=") != segment.encode("ascii"):
+        raise InvalidTokenError("token is not canonically base64url encoded")
+    return decoded
+
+
+def _numeric_claim(claims: Dict[str, Any], name: str) -> Optional[float]:
+    value = claims.get(name)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise InvalidTokenError("token claim %r is not a number" % name)
+    return float(value)
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def _signing_digest(token: str) -> bytes:
+    """Digest of the signed part of `token`, shared by all its signatures"""
+    return _digest(token.rpartition(".")[0])
+
+
+class VerificationKey:
+    """A key accepted for one or more JWS algorithms"""
+
+    def __init__(
+        self,
+        kid: Optional[str],
+        algorithms: Tuple[str, ...],
+        verify: Callable[[str, bytes, bytes], bool],
+    ) -> None:
+        self.kid = kid
+        self.algorithms = algorithms
+        self._verify = verify
+
+    def verify(self, algorithm: str, signing_input: bytes, signature: bytes) -> bool:
+        if algorithm not in self.algorithms:
+            return False
+        return self._verify(algorithm, signing_input, signature)
+
+    @classmethod
+    def from_secret(
+        cls, secret: bytes, kid: Optional[str] = None, algorithm: Optional[str] = None
+    ) -> "VerificationKey":
+        def verify(algorithm: str, signing_input: bytes, signature: bytes) -> bool:
+            digest = _HMAC_DIGESTS[algorithm]
+            expected = hmac.new(secret, signing_input, digest).digest()
+            return hmac.compare_digest(expected, signature)
+
+        algorithms = (algorithm,) if algorithm else tuple(_HMAC_DIGESTS)
+        return cls(kid, algorithms, verify)
+
+    @classmethod
+    def from_jwk(cls, jwk: Mapping[str, Any]) -> "VerificationKey":
+        kid = jwk.get("kid")
+        if jwk.get("kty") == "oct":
+            secret = _b64decode(jwk["k"].rstrip("="))
+            return cls.from_secret(secret, kid, jwk.get("alg"))
+        try:
+            import jwt
+        except ImportError:
+            raise RuntimeError(
+                "%s keys require the PyJWT[crypto] package" % jwk.get("kty")
+            )
+        key = jwt.PyJWK(dict(jwk))
+        algorithm = key.algorithm_name
+        implementation = jwt.get_algorithm_by_name(algorithm)
+
+        def verify(algorithm: str, signing_input: bytes, signature: bytes) -> bool:
+            return implementation.verify(signing_input, key.key, signature)
+
+        return cls(kid, (algorithm,), verify)
+
+
+def load_keys(
+    secret: Optional[str] = None, keys_file: Optional[str] = None
+) -> List[VerificationKey]:
+    """Build the verification keys from a shared secret and/or a JWKS file"""
+    keys = []
+    if secret:
+        keys.append(VerificationKey.from_secret(secret.encode("utf-8")))
+    if keys_file:
+        with open(keys_file, "rb") as stream:
+            document = loads(stream.read())
+        for jwk in document.get("keys", [document]):
+            keys.append(VerificationKey.from_jwk(jwk))
+    return keys
+
+
+class TokenVerifier:
+    """Verifies bearer JWTs and caches the decoded claims.
+
+    :param keys: Keys a token may be signed with; a token header `kid` selects
+        among them
+    :param issuer: Required `iss` claim, if any
+    :param audience: Required `aud` claim, if any
+    :param cache_size: Maximum number of verified tokens kept in the cache
+    :param max_ttl: Upper bound in seconds on how long a verified token is
+        cached, also applied to tokens without `exp`
+    :param clock: Returns the current UNIX time
+    """
+
+    def __init__(
+        self,
+        keys: List[VerificationKey],
+        issuer: Optional[str] = None,
+        audience: Optional[str] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        max_ttl: float = DEFAULT_MAX_TTL,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.keys = keys
+        self.issuer = issuer
+        self.audience = audience
+        self.cache_size = cache_size
+        self.max_ttl = max_ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[bytes, Tuple[float, TokenModel]]" = OrderedDict()
+        self._revoked: Set[bytes] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "TokenVerifier":
+        return cls(
+            load_keys(settings.jwt_secret, settings.jwt_keys_file),
+            issuer=settings.jwt_issuer,
+            audience=settings.jwt_audience,
+            cache_size=settings.token_cache_size,
+            max_ttl=settings.token_cache_ttl,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.keys)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
+
+    def revoke(self, token: str) -> None:
+        """Reject `token` from now on, even if it is cached or signed again"""
+        with self._lock:
+            self._revoked.add(_signing_digest(token))
+            self._cache.pop(_digest(token), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+    def cached(self, token: str) -> Optional[TokenModel]:
+        """Return the cached claims of `token`, or None if it has to be
+        verified. Raises `InvalidTokenError` if the token was revoked."""
+        digest = _digest(token)
+        revoked = _signing_digest(token)
+        with self._lock:
+            if revoked in self._revoked:
+                raise InvalidTokenError("token has been revoked")
+            entry = self._cache.get(digest)
+            if entry is None:
+                return None
+            if entry[0] <= self.clock():
+                del self._cache[digest]
+                return None
+            self._cache.move_to_end(digest)
+            self.hits += 1
+            return entry[1]
+
+    def verify(self, token: str) -> TokenModel:
+        """Return the claims of `token`, raising `InvalidTokenError` if it
+        cannot be trusted"""
+        model = self.cached(token)
+        if model is None:
+            model = self.decode(token)
+        return model
+
+    def decode(self, token: str) -> TokenModel:
+        """Check the signature and claims of `token` without consulting the
+        cache, and cache the result"""
+        digest = _digest(token)
+        now = self.clock()
+        with self._lock:
+            self.misses += 1
+        claims = self._decode(token, now)
+        expires_at = now + self.max_ttl
+        if claims.get("exp") is not None:
+            expires_at = min(expires_at, float(claims["exp"]))
+        model = TokenModel(sub=claims["sub"])
+        with self._lock:
+            if _signing_digest(token) in self._revoked:
+                raise InvalidTokenError("token has been revoked")
+            self._cache[digest] = (expires_at, model)
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return model
+
+    def _decode(self, token: str, now: float) -> Dict[str, Any]:
+        try:
+            header_segment, payload_segment, signature_segment = token.split(".")
+        except ValueError:
+            raise InvalidTokenError("token is not a JWS compact serialization")
+        try:
+            header = loads(_b64decode(header_segment))
+            claims = loads(_b64decode(payload_segment))
+        except ValueError:
+            raise InvalidTokenError("token segments are not JSON")
+        if not isinstance(header, dict) or not isinstance(claims, dict):
+            raise InvalidTokenError("token segments are not JSON objects")
+
+        algorithm = header.get("alg")
+        kid = header.get("kid")
+        signing_input = ("%s.%s" % (header_segment, payload_segment)).encode("ascii")
+        signature = _b64decode(signature_segment)
+        candidates = [
+            key for key in self.keys if kid is None or key.kid is None or key.kid == kid
+        ]
+        if not any(
+            key.verify(algorithm, signing_input, signature) for key in candidates
+        ):
+            raise InvalidTokenError("token signature is invalid")
+
+        expires = _numeric_claim(claims, "exp")
+        if expires is not None and expires <= now:
+            raise InvalidTokenError("token has expired")
+        not_before = _numeric_claim(claims, "nbf")
+        if not_before is not None and not_before > now:
+            raise InvalidTokenError("token is not valid yet")
+        if self.issuer is not None and claims.get("iss") != self.issuer:
+            raise InvalidTokenError("token issuer is not accepted")
+        if self.audience is not None:
+            audience = claims.get("aud")
+            audiences = audience if isinstance(audience, list) else [audience]
+            if self.audience not in audiences:
+                raise InvalidTokenError("token audience is not accepted")
+        if not isinstance(claims.get("sub"), str):
+            raise InvalidTokenError("token has no subject")
+        return claims
+
+
+token_verifier = TokenVerifier.from_settings(settings)
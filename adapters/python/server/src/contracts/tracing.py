@@ -0,0 +1,599 @@
+# coding: utf-8
+
+"""Request tracing with W3C Trace Context and tail-based sampling.
+
+Enabled by `CONTRACTS_TRACING`, in which case `contracts.main` installs
+`TracingMiddleware`. Every API request becomes a trace: a server span
+named after the operationId, continuing the trace of an incoming `traceparent`
+header, with child spans for
+
+* `validation`: reading, decoding and validating the request, with the
+  bearer-token check as an `auth` child;
+* `handler`: the route itself, with an `impl <method>` child per
+  implementation call and a `serialization <Model>` child per response
+  model rendered;
+* `serialization`: producing and sending the response after the route
+  returned (FastAPI's own serialization, streamed lists).
+
+Sampling is decided when the request is over: requests slower than
+`CONTRACTS_TRACE_SLOW_MS`, failed ones (5xx) and those whose caller sampled
+the trace are always kept, the others with probability
+`CONTRACTS_TRACE_SAMPLE_RATE`. Kept traces go to the exporter chosen by
+`CONTRACTS_TRACE_EXPORTER`:
+
+* `memory`: a ring buffer of the latest `CONTRACTS_TRACE_BUFFER` traces,
+  served as JSON at `/traces`, behind `CONTRACTS_METRICS_TOKEN` when set;
+* `jsonl`: one JSON span per line appended to `CONTRACTS_TRACE_FILE`;
+* `otlp`: OTLP/HTTP JSON posted to `CONTRACTS_TRACE_OTLP_ENDPOINT` (an
+  OpenTelemetry collector) from a background thread.
+
+Implementations calling other services can forward `traceparent()`, which
+passes the caller's sampled flag on unchanged, so that every service makes
+its own tail-based decision.
+"""
+
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from fastapi import Query, Request, Response
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+
+from contracts.metrics import unauthorized
+from contracts.settings import Settings, settings
+from contracts.timing import Sample, current_sample
+
+Message = Dict[str, Any]
+
+_TRACEPARENT = re.compile(
+    r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})(-.*)?$"
+)
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+SAMPLED = 0x01
+
+SERVER = "server"
+INTERNAL = "internal"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str, int]]:
+    """Return the trace id, parent span id and flags of a `traceparent`
+    header, or None if it is missing or invalid"""
+    if not value:
+        return None
+    match = _TRACEPARENT.match(value.strip().lower())
+    if match is None:
+        return None
+    version, trace_id, parent_id, flags, rest = match.groups()
+    if version == "ff" or (version == "00" and rest):
+        return None
+    if trace_id == _INVALID_TRACE_ID or parent_id == _INVALID_SPAN_ID:
+        return None
+    return trace_id, parent_id, int(flags, 16)
+
+
+def format_traceparent(trace_id: str, span_id: str, flags: int = SAMPLED) -> str:
+    return "00-%s-%s-%02x" % (trace_id, span_id, flags)
+
+
+def new_trace_id() -> str:
+    return "%032x" % random.getrandbits(128)
+
+
+def new_span_id() -> str:
+    return "%016x" % random.getrandbits(64)
+
+
+class Span:
+    """A finished span; times are nanoseconds since the epoch"""
+
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "kind",
+        "start",
+        "end",
+        "attributes",
+    )
+
+    def __init__(
+        self,
+        trace_id: str,
+        span_id: str,
+        parent_id: Optional[str],
+        name: str,
+        kind: str,
+        start: int,
+        end: int,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.attributes = attributes or {}
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end - self.start) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": self.start,
+            "endTimeUnixNano": self.end,
+            "durationMs": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+        }
+
+
+class MemoryExporter:
+    """Keep the latest `size` traces in memory"""
+
+    def __init__(self, size: int = 1000) -> None:
+        self.buffer: Deque[List[Span]] = deque(maxlen=size)
+
+    def export(self, spans: List[Span]) -> None:
+        self.buffer.append(spans)
+
+    def traces(self) -> List[List[Dict[str, Any]]]:
+        """The buffered traces, newest first"""
+        return [[span.to_dict() for span in spans] for spans in reversed(self.buffer)]
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        return True
+
+    def clear(self) -> None:
+        self.buffer.clear()
+
+
+class QueuedExporter:
+    """Hand spans to a background thread, which passes them to `post` in
+    batches, so that exporting never blocks the event loop
+
+    Spans are dropped, and counted in `dropped`, when the queue is full or
+    `post` fails.
+
+    :param batch_size: Most spans posted at once
+    :param interval: Seconds a span may wait for its batch to fill
+    :param max_queue: Most spans waiting to be posted
+    """
+
+    name = "span-exporter"
+
+    def __init__(
+        self, batch_size: int = 512, interval: float = 1.0, max_queue: int = 10000
+    ) -> None:
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Span]" = queue.Queue(max_queue)
+        self._worker: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._pending = 0
+        self._idle = threading.Condition()
+
+    def export(self, spans: List[Span]) -> None:
+        # Started lazily, and again after a fork: threads do not survive it
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._worker = threading.Thread(
+                target=self._run, name=self.name, daemon=True
+            )
+            self._worker.start()
+        for span in spans:
+            with self._idle:
+                self._pending += 1
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                self.dropped += 1
+                self._done(1)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until the queued spans have been posted; False on timeout"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def post(self, spans: List[Span]) -> bool:
+        raise NotImplementedError
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self.post(batch)
+            except Exception:
+                self.dropped += len(batch)
+            self._done(len(batch))
+
+    def _done(self, count: int) -> None:
+        with self._idle:
+            self._pending -= count
+            self._idle.notify_all()
+
+
+class JsonLinesExporter(QueuedExporter):
+    """Append every span as one line of JSON to `path`
+
+    A batch of spans is written with a single `write`, so the workers of
+    `contracts.serve` can share the file.
+    """
+
+    name = "jsonl-exporter"
+
+    def __init__(self, path: str, batch_size: int = 512, interval: float = 0.2) -> None:
+        super().__init__(batch_size, interval)
+        self.path = path
+        self._file: Any = None
+
+    def post(self, spans: List[Span]) -> bool:
+        lines = "".join(
+            json.dumps(span.to_dict(), separators=(",", ":")) + "\n" for span in spans
+        )
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(lines)
+        self._file.flush()
+        return True
+
+
+_OTLP_KINDS = {INTERNAL: 1, SERVER: 2}
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_payload(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """Encode spans as an OTLP/HTTP JSON `ExportTraceServiceRequest`"""
+    encoded = []
+    for span in spans:
+        item = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": _OTLP_KINDS[span.kind],
+            "startTimeUnixNano": str(span.start),
+            "endTimeUnixNano": str(span.end),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in span.attributes.items()
+            ],
+        }
+        if span.parent_id is not None:
+            item["parentSpanId"] = span.parent_id
+        if span.attributes.get("http.response.status_code", 0) >= 500:
+            item["status"] = {"code": 2}
+        encoded.append(item)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": service_name}}
+                    ]
+                },
+                "scopeSpans": [
+                    {"scope": {"name": "contracts.tracing"}, "spans": encoded}
+                ],
+            }
+        ]
+    }
+
+
+class OtlpExporter(QueuedExporter):
+    """Post spans to an OTLP/HTTP endpoint, in batches, from a background thread
+
+    Spans are dropped, and counted in `dropped`, when the queue is full or
+    the collector cannot be reached.
+
+    :param endpoint: URL of the collector's traces endpoint
+    :param service_name: The `service.name` resource attribute
+    :param batch_size: Most spans posted at once
+    :param interval: Seconds a span may wait for its batch to fill
+    """
+
+    name = "otlp-exporter"
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str = "contracts",
+        batch_size: int = 512,
+        interval: float = 1.0,
+        max_queue: int = 10000,
+        timeout: float = 5.0,
+    ) -> None:
+        super().__init__(batch_size, interval, max_queue)
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def post(self, spans: List[Span]) -> bool:
+        body = json.dumps(otlp_payload(spans, self.service_name)).encode("utf-8")
+        try:
+            request = urllib.request.Request(
+                self.endpoint,
+                data=body,
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+            return True
+        except Exception:
+            # Not only OSError: http.client.HTTPException, ValueError for a
+            # malformed endpoint; none of them may stop the thread
+            self.dropped += len(spans)
+            return False
+
+
+class Tracer:
+    """Builds the spans of finished requests and keeps a sample of them
+
+    :param exporter: Where kept traces go
+    :param slow_threshold: Seconds from which a request is always kept
+    :param sample_rate: Probability of keeping any other request
+    """
+
+    def __init__(
+        self,
+        exporter: Any = None,
+        slow_threshold: float = 0.25,
+        sample_rate: float = 0.01,
+        enabled: bool = False,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.exporter = exporter if exporter is not None else MemoryExporter()
+        self.slow_threshold = slow_threshold
+        self.sample_rate = sample_rate
+        self.enabled = enabled
+        self.rng = rng
+        self.traces = 0
+        self.kept = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "Tracer":
+        if settings.trace_exporter == "jsonl":
+            exporter: Any = JsonLinesExporter(settings.trace_file)
+        elif settings.trace_exporter == "otlp":
+            exporter = OtlpExporter(
+                settings.trace_otlp_endpoint, settings.trace_service_name
+            )
+        elif settings.trace_exporter == "memory":
+            exporter = MemoryExporter(settings.trace_buffer)
+        else:
+            raise ValueError("Unknown trace exporter %r" % settings.trace_exporter)
+        return cls(
+            exporter,
+            slow_threshold=settings.trace_slow_ms / 1000,
+            sample_rate=settings.trace_sample_rate,
+            enabled=settings.tracing,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {"traces": self.traces, "kept": self.kept}
+
+    def keep(self, duration: float, status: int, flags: int) -> bool:
+        """Tail-based sampling decision for a finished request"""
+        if duration >= self.slow_threshold or status >= 500 or flags & SAMPLED:
+            return True
+        return self.rng() < self.sample_rate
+
+    def finish(
+        self, trace: "Trace", sample: Sample, status: int, size: int, ended: float
+    ) -> None:
+        self.traces += 1
+        if not self.keep(ended - trace.started, status, trace.flags):
+            return
+        self.kept += 1
+        self.exporter.export(trace.spans(sample, status, size, ended))
+
+
+class Trace:
+    """Identity and clock of a request's trace"""
+
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "flags",
+        "started",
+        "epoch",
+        "method",
+        "path",
+    )
+
+    def __init__(self, scope: Message, traceparent: Optional[str]) -> None:
+        parent = parse_traceparent(traceparent)
+        if parent is None:
+            self.trace_id, self.parent_id, self.flags = new_trace_id(), None, 0
+        else:
+            self.trace_id, self.parent_id, self.flags = parent
+        self.span_id = new_span_id()
+        self.started = time.perf_counter()
+        self.epoch = time.time_ns()
+        self.method = scope.get("method", "")
+        self.path = scope.get("path", "")
+
+    def traceparent(self) -> str:
+        """`traceparent` header for calls made while serving the request"""
+        return format_traceparent(self.trace_id, self.span_id, self.flags)
+
+    def _nanos(self, perf: float) -> int:
+        return self.epoch + int((perf - self.started) * 1e9)
+
+    def _span(
+        self,
+        name: str,
+        parent: Optional[str],
+        start: float,
+        end: float,
+        **attributes: Any
+    ) -> Span:
+        return Span(
+            self.trace_id,
+            new_span_id(),
+            parent,
+            name,
+            INTERNAL,
+            self._nanos(start),
+            self._nanos(end),
+            attributes,
+        )
+
+    def spans(self, sample: Sample, status: int, size: int, ended: float) -> List[Span]:
+        root = Span(
+            self.trace_id,
+            self.span_id,
+            self.parent_id,
+            sample.operation,
+            SERVER,
+            self._nanos(self.started),
+            self._nanos(ended),
+            {
+                "http.request.method": self.method,
+                "url.path": self.path,
+                "http.response.status_code": status,
+                "http.response.body.size": size,
+            },
+        )
+        spans = [root]
+        phases: List[Span] = []
+        endpoint_started = sample.endpoint_started
+        if endpoint_started is None:
+            phases.append(
+                self._span(
+                    "validation",
+                    root.span_id,
+                    sample.handler_started,
+                    sample.handler_ended,
+                )
+            )
+        else:
+            endpoint_ended = sample.endpoint_ended or sample.handler_ended
+            phases.append(
+                self._span(
+                    "validation", root.span_id, sample.handler_started, endpoint_started
+                )
+            )
+            phases.append(
+                self._span("handler", root.span_id, endpoint_started, endpoint_ended)
+            )
+            phases.append(
+                self._span("serialization", root.span_id, endpoint_ended, ended)
+            )
+        spans.extend(phases)
+        for name, start, end in sample.spans or ():
+            nanos = self._nanos(start)
+            parent = next(
+                (phase.span_id for phase in phases if phase.start <= nanos < phase.end),
+                root.span_id,
+            )
+            spans.append(self._span(name, parent, start, end))
+        return spans
+
+
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+def traceparent() -> Optional[str]:
+    """`traceparent` header to forward on outgoing calls, or None outside a
+    traced request"""
+    trace = current_trace.get()
+    return trace.traceparent() if trace is not None else None
+
+
+tracer = Tracer.from_settings(settings)
+
+
+class TracingMiddleware:
+    """Trace every request, continuing the caller's trace.
+
+    Install it inside `MetricsMiddleware` when both are used, so they share
+    the request's `Sample`.
+
+    :param app: The ASGI application to wrap
+    :param tracer: Decides which traces are kept and exports them
+    """
+
+    def __init__(self, app: Callable, tracer: Tracer = tracer) -> None:
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Message, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trace = Trace(scope, Headers(scope=scope).get("traceparent"))
+        sample = current_sample.get()
+        sample_token = None
+        if sample is None:
+            sample = Sample()
+            sample_token = current_sample.set(sample)
+        sample.spans = []
+        trace_token = current_trace.set(trace)
+        status = 500
+        size = 0
+
+        async def traced_send(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            elif message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, traced_send)
+        finally:
+            current_trace.reset(trace_token)
+            if sample_token is not None:
+                current_sample.reset(sample_token)
+            if sample.operation is not None:
+                self.tracer.finish(trace, sample, status, size, time.perf_counter())
+
+
+async def traces_endpoint(
+    request: Request, limit: int = Query(100, ge=1)
+) -> Response:
+    """Serve the traces kept in memory by this process, newest first; they
+    show request paths, so the `/metrics` token guards them too"""
+    denied = unauthorized(request)
+    if denied is not None:
+        return denied
+    return JSONResponse(tracer.exporter.traces()[:limit])
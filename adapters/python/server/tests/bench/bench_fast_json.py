@@ -0,0 +1,88 @@
+# coding: utf-8
+
+"""Compare the stdlib and orjson JSON pipelines on a 1k-user list page.
+
+Run from the server adapter root:
+
+    PYTHONPATH=src python tests/bench/bench_fast_json.py
+"""
+
+import json
+import timeit
+from datetime import datetime, timezone
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from contracts.models.get_user_list200_response import GetUserList200Response
+from contracts.models.pagination_meta import PaginationMeta
+from contracts.models.user import User
+from contracts.serialization import _default
+
+USERS = 1000
+ROUNDS = 50
+
+
+def build_page(size: int) -> GetUserList200Response:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return GetUserList200Response(
+        data=[
+            User(
+                id="user-%d" % i,
+                email="user%d@example.com" % i,
+                first_name="First%d" % i,
+                last_name="Last%d" % i,
+                role="BUYER",
+                status="ACTIVE",
+                avatar_url="https://example.com/avatars/%d.jpg" % i,
+                created_at=now,
+                updated_at=now,
+            )
+            for i in range(size)
+        ],
+        meta=PaginationMeta(limit=100, offset=0, total=size),
+    )
+
+
+def report(name: str, baseline: float, candidate: float) -> None:
+    print(
+        "%-22s json %8.2f ms  orjson %8.2f ms  speedup %5.2fx"
+        % (name, baseline * 1000, candidate * 1000, baseline / candidate)
+    )
+
+
+def main() -> None:
+    page = build_page(USERS)
+    as_dict = page.to_dict()
+    document = orjson.dumps(as_dict)
+    encoded = jsonable_encoder(page)
+
+    def bench(fn) -> float:
+        return min(timeit.repeat(fn, number=1, repeat=ROUNDS))
+
+    print("GetUserList200Response with %d users, best of %d" % (USERS, ROUNDS))
+    report(
+        "to_json",
+        bench(lambda: json.dumps(page.to_dict(), default=_default)),
+        bench(lambda: orjson.dumps(page.to_dict()).decode("utf-8")),
+    )
+    report(
+        "encode only",
+        bench(lambda: json.dumps(as_dict, default=_default)),
+        bench(lambda: orjson.dumps(as_dict)),
+    )
+    report(
+        "from_json",
+        bench(lambda: GetUserList200Response.from_dict(json.loads(document))),
+        bench(lambda: GetUserList200Response.from_dict(orjson.loads(document))),
+    )
+    report(
+        "response render",
+        bench(lambda: JSONResponse(encoded)),
+        bench(lambda: ORJSONResponse(encoded)),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+# coding: utf-8
+
+r"""HTTP load harness for the generated server.
+
+Starts `contracts.main:app` under uvicorn with the canned implementations of
+`load_stub_impl.py`, drives a weighted mix of every operation and reports
+throughput and p50/p95/p99 latency per operationId. Because the stubs do no
+work, the numbers are the cost of the generated stack itself.
+
+Two load models are supported:
+
+* closed loop (`--concurrency N`): N clients each send a request as soon as
+  the previous one is answered;
+* open loop (`--rate R`): requests are started R times per second whatever
+  the server does, and latency is measured from the scheduled start, so a
+  stalled server is not hidden by fewer requests being sent.
+
+Run from the server adapter root:
+
+    PYTHONPATH=src python tests/bench/bench_load.py --duration 10 --concurrency 32
+    PYTHONPATH=src python tests/bench/bench_load.py --rate 500 \
+        --mix getUserById=10,getUserList=1
+    PYTHONPATH=src python tests/bench/bench_load.py --url http://localhost:8000 --json
+
+Requires uvicorn and httpx. With `--url` no server is started and any
+implementation can be measured.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import pathlib
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+BENCH_DIR = pathlib.Path(__file__).resolve().parent
+SERVER_ROOT = BENCH_DIR.parents[1]
+USER_ID = "123e4567-e89b-12d3-a456-426614174000"
+TOKEN = "Bearer load-test"
+
+NEW_USER = {
+    "email": "user@example.com",
+    "firstName": "John",
+    "lastName": "Doe",
+    "password": "SecurePassword123!",
+}
+CHANGES = {"firstName": "Jane", "lastName": "Doe"}
+
+# operationId -> (method, path, query, JSON body)
+OPERATIONS: Dict[str, Tuple[str, str, Optional[Dict[str, str]], Any]] = {
+    "authenticateUser": (
+        "POST",
+        "/v1/auth/login",
+        None,
+        {"email": "user@example.com", "password": "SecurePassword123!"},
+    ),
+    "logoutUser": ("POST", "/v1/auth/logout", None, None),
+    "refreshTokens": (
+        "POST",
+        "/v1/auth/refresh",
+        None,
+        {"refreshToken": "refresh-token"},
+    ),
+    "registerUser": ("POST", "/v1/auth/register", None, NEW_USER),
+    "getHealthStatus": ("GET", "/v1/health", None, None),
+    "getUserList": (
+        "GET",
+        "/v1/users",
+        {"UsersRequestPayload": '{"limit":20,"offset":0}'},
+        None,
+    ),
+    "createUser": ("POST", "/v1/users", None, NEW_USER),
+    "deleteUserById": ("DELETE", "/v1/users/%s" % USER_ID, None, None),
+    "getUserById": ("GET", "/v1/users/%s" % USER_ID, None, None),
+    "updateUserById": ("PUT", "/v1/users/%s" % USER_ID, None, CHANGES),
+    "updateUserEmail": (
+        "PUT",
+        "/v1/users/%s/email" % USER_ID,
+        None,
+        {"newEmail": "new@example.com", "password": "SecurePassword123!"},
+    ),
+    "batchGetUsers": ("POST", "/v1/users:batchGet", None, {"ids": [USER_ID] * 10}),
+    "batchCreateUsers": (
+        "POST",
+        "/v1/users:batchCreate",
+        None,
+        {"items": [NEW_USER] * 10},
+    ),
+    "batchUpdateUsers": (
+        "PATCH",
+        "/v1/users:batchUpdate",
+        None,
+        {"items": [{"id": USER_ID, "changes": CHANGES}] * 10},
+    ),
+}
+
+
+def parse_mix(text: Optional[str]) -> Dict[str, float]:
+    if not text:
+        return {operation: 1.0 for operation in OPERATIONS}
+    mix = {}
+    for item in text.split(","):
+        operation, _, weight = item.partition("=")
+        operation = operation.strip()
+        if operation not in OPERATIONS:
+            raise SystemExit(
+                "unknown operationId %r, expected one of %s"
+                % (operation, ", ".join(OPERATIONS))
+            )
+        mix[operation] = float(weight or 1)
+    return mix
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = {
+            operation: [] for operation in OPERATIONS
+        }
+        self.errors: Dict[str, int] = {operation: 0 for operation in OPERATIONS}
+
+    def record(self, operation: str, latency: float, ok: bool) -> None:
+        self.latencies[operation].append(latency)
+        if not ok:
+            self.errors[operation] += 1
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        rows = {}
+        everything = []
+        for operation, samples in self.latencies.items():
+            if not samples:
+                continue
+            everything.extend(samples)
+            rows[operation] = summarize(samples, self.errors[operation], elapsed)
+        rows["total"] = summarize(everything, sum(self.errors.values()), elapsed)
+        return rows
+
+
+def summarize(samples: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "rps": round(len(samples) / elapsed, 1),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 3),
+    }
+
+
+async def send(client: httpx.AsyncClient, operation: str) -> bool:
+    method, path, query, body = OPERATIONS[operation]
+    response = await client.request(method, path, params=query, json=body)
+    await response.aread()
+    return response.status_code < 400
+
+
+def chooser(mix: Dict[str, float], seed: int) -> Callable[[], str]:
+    rng = random.Random(seed)
+    operations = list(mix)
+    weights = [mix[operation] for operation in operations]
+    return lambda: rng.choices(operations, weights)[0]
+
+
+async def closed_loop(
+    client, choose, recorder: Recorder, concurrency: int, deadline: float
+) -> None:
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            operation = choose()
+            started = time.perf_counter()
+            ok = await send(client, operation)
+            recorder.record(operation, time.perf_counter() - started, ok)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def open_loop(
+    client, choose, recorder: Recorder, rate: float, deadline: float
+) -> None:
+    interval = 1.0 / rate
+    pending = set()
+
+    async def one(operation: str, scheduled: float) -> None:
+        try:
+            ok = await send(client, operation)
+        except httpx.HTTPError:
+            ok = False
+        recorder.record(operation, time.perf_counter() - scheduled, ok)
+
+    scheduled = time.perf_counter()
+    while scheduled < deadline:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.ensure_future(one(choose(), scheduled))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        scheduled += interval
+    if pending:
+        await asyncio.gather(*pending)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(SERVER_ROOT / "src"), str(BENCH_DIR), env.get("PYTHONPATH")])
+    )
+    env["CONTRACTS_IMPL_MODULES"] = "load_stub_impl"
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "contracts.main:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+    return subprocess.Popen(command, env=env)
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while True:
+            try:
+                if (await client.get("/v1/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.perf_counter() > deadline:
+                raise SystemExit("server at %s did not become ready" % base_url)
+            await asyncio.sleep(0.1)
+
+
+async def drive(args, base_url: str) -> Dict[str, Any]:
+    mix = parse_mix(args.mix)
+    choose = chooser(mix, args.seed)
+    limits = httpx.Limits(
+        max_connections=args.concurrency if not args.rate else None,
+        max_keepalive_connections=None,
+    )
+    async with httpx.AsyncClient(
+        base_url=base_url, headers={"Authorization": TOKEN}, limits=limits, timeout=30.0
+    ) as client:
+        warmup = Recorder()
+        await closed_loop(
+            client, choose, warmup, args.concurrency, time.perf_counter() + args.warmup
+        )
+        recorder = Recorder()
+        started = time.perf_counter()
+        deadline = started + args.duration
+        if args.rate:
+            await open_loop(client, choose, recorder, args.rate, deadline)
+        else:
+            await closed_loop(client, choose, recorder, args.concurrency, deadline)
+        elapsed = time.perf_counter() - started
+    return {
+        "config": {
+            "url": base_url,
+            "duration_s": args.duration,
+            "mode": "open" if args.rate else "closed",
+            "rate": args.rate,
+            "concurrency": None if args.rate else args.concurrency,
+            "workers": None if args.url else args.workers,
+            "mix": mix,
+        },
+        "operations": recorder.report(elapsed),
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    config = result["config"]
+    load = (
+        "%s req/s open loop" % config["rate"]
+        if config["rate"]
+        else "%d concurrent" % config["concurrency"]
+    )
+    print("%s, %s, %ss" % (config["url"], load, config["duration_s"]))
+    print(
+        "%-18s %9s %7s %9s %9s %9s %9s"
+        % ("operationId", "requests", "errors", "req/s", "p50 ms", "p95 ms", "p99 ms")
+    )
+    for operation, row in result["operations"].items():
+        print(
+            "%-18s %9d %7d %9.1f %9.2f %9.2f %9.2f"
+            % (
+                operation,
+                row["requests"],
+                row["errors"],
+                row["rps"],
+                row["p50_ms"],
+                row["p95_ms"],
+                row["p99_ms"],
+            )
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--url", help="measure a running server instead of starting one"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="uvicorn worker processes"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="seconds of measured load"
+    )
+    parser.add_argument(
+        "--warmup", type=float, default=2.0, help="seconds of unmeasured load first"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="clients of the closed loop"
+    )
+    parser.add_argument(
+        "--rate", type=float, help="requests per second of the open loop"
+    )
+    parser.add_argument(
+        "--mix", help="operationId=weight pairs, default every operation equally"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        port = free_port()
+        base_url = "http://127.0.0.1:%d" % port
+        server = start_server(port, args.workers)
+    try:
+        asyncio.run(wait_until_ready(base_url))
+        result = asyncio.run(drive(args, base_url))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
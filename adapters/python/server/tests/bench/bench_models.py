@@ -0,0 +1,300 @@
+# coding: utf-8
+
+"""Serialization and validation benchmarks of the generated models.
+
+Times `from_dict`, `from_json`, `to_dict`, `to_json`, `model_validate`,
+`model_validate_json`, `model_dump` and `model_dump_json` on `User`,
+`GetUserList200Response` (10, 1k and 100k users), `Error` and
+`UserCreateRequest` from `contracts.models`, and the pydantic-native
+operations on the matching classes of `adapters/python/models.py` (which
+has no list response class, so an equivalent `data`/`meta` model is built
+from its `User` and `PaginationMeta`).
+
+Results are written as JSON so runs before and after a generator upgrade
+can be compared:
+
+    PYTHONPATH=src python tests/bench/bench_models.py --output before.json
+    PYTHONPATH=src python tests/bench/bench_models.py --compare before.json
+
+Run from the server adapter root.
+"""
+
+import argparse
+import importlib.util
+import json
+import pathlib
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import pydantic
+from pydantic import BaseModel
+
+from contracts.models.error import Error
+from contracts.models.get_user_list200_response import GetUserList200Response
+from contracts.models.user import User
+from contracts.models.user_create_request import UserCreateRequest
+from contracts.serialization import dumps
+from contracts.settings import settings
+
+SERVER_ROOT = pathlib.Path(__file__).resolve().parents[2]
+REFERENCE_MODELS = SERVER_ROOT.parent / "models.py"
+SIZES = (10, 1000, 100000)
+REPEAT = 5
+MIN_TIME = 0.05
+REGRESSION = 1.10
+
+GENERATED_OPERATIONS = ("from_dict", "from_json", "to_dict", "to_json")
+PYDANTIC_OPERATIONS = (
+    "model_validate",
+    "model_validate_json",
+    "model_dump",
+    "model_dump_json",
+)
+
+
+def load_reference_models():
+    spec = importlib.util.spec_from_file_location("reference_models", REFERENCE_MODELS)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def user_payload(i: int) -> Dict[str, Any]:
+    return {
+        "id": "123e4567-e89b-12d3-a456-%012d" % i,
+        "email": "user%d@example.com" % i,
+        "firstName": "First%d" % i,
+        "lastName": "Last%d" % i,
+        "role": "BUYER",
+        "status": "ACTIVE",
+        "avatarUrl": "https://example.com/avatars/%d.jpg" % i,
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": "2024-01-02T00:00:00Z",
+        "lastLoginAt": None,
+    }
+
+
+def page_payload(size: int) -> Dict[str, Any]:
+    return {
+        "data": [user_payload(i) for i in range(size)],
+        "meta": {"limit": 100, "offset": 0, "total": size},
+    }
+
+
+ERROR_PAYLOAD = {
+    "code": "ERR_NOT_FOUND",
+    "message": "The requested resource was not found",
+    "details": {"userId": "123e4567-e89b-12d3-a456-426614174000"},
+    "timestamp": "2024-01-15T10:30:00Z",
+}
+
+CREATE_PAYLOAD = {
+    "email": "user@example.com",
+    "firstName": "John",
+    "lastName": "Doe",
+    "password": "SecurePassword123!",
+    "role": "BUYER",
+    "status": "ACTIVE",
+}
+
+
+def cases(sizes) -> List[Dict[str, Any]]:
+    reference = load_reference_models()
+
+    class ReferenceUserList(BaseModel):
+        data: List[reference.User]
+        meta: reference.PaginationMeta
+
+    result = [
+        {
+            "model": "User",
+            "size": 1,
+            "payload": user_payload(0),
+            "contracts": User,
+            "reference": reference.User,
+        },
+        {
+            "model": "Error",
+            "size": 1,
+            "payload": ERROR_PAYLOAD,
+            "contracts": Error,
+            "reference": reference.Error,
+        },
+        {
+            "model": "UserCreateRequest",
+            "size": 1,
+            "payload": CREATE_PAYLOAD,
+            "contracts": UserCreateRequest,
+            "reference": reference.UserCreateRequest,
+        },
+    ]
+    for size in sizes:
+        result.append(
+            {
+                "model": "GetUserList200Response",
+                "size": size,
+                "payload": page_payload(size),
+                "contracts": GetUserList200Response,
+                "reference": ReferenceUserList,
+            }
+        )
+    return result
+
+
+def operations(
+    cls: type, payload: Dict[str, Any], generated: bool
+) -> Dict[str, Callable[[], Any]]:
+    document = dumps(payload)
+    instance = cls.model_validate(payload)
+    ops = {
+        "model_validate": lambda: cls.model_validate(payload),
+        "model_validate_json": lambda: cls.model_validate_json(document),
+        "model_dump": lambda: instance.model_dump(by_alias=True, exclude_none=True),
+        "model_dump_json": lambda: instance.model_dump_json(
+            by_alias=True, exclude_none=True
+        ),
+    }
+    if generated:
+        ops.update(
+            {
+                "from_dict": lambda: cls.from_dict(payload),
+                "from_json": lambda: cls.from_json(document),
+                "to_dict": lambda: instance.to_dict(),
+                "to_json": lambda: instance.to_json(),
+            }
+        )
+    return ops
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= MIN_TIME or number >= 1 << 20:
+            break
+        number *= 2
+    samples = [elapsed] + timer.repeat(repeat=repeat - 1, number=number)
+    per_call = [sample / number * 1e6 for sample in samples]
+    return {
+        "best_us": round(min(per_call), 3),
+        "mean_us": round(statistics.mean(per_call), 3),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run(sizes, repeat: int, only: Optional[str]) -> List[Dict[str, Any]]:
+    results = []
+    for case in cases(sizes):
+        for source, generated in (("contracts", True), ("reference", False)):
+            ops = operations(case[source], case["payload"], generated)
+            for operation in GENERATED_OPERATIONS + PYDANTIC_OPERATIONS:
+                if operation not in ops or (only and operation != only):
+                    continue
+                entry = {
+                    "source": source,
+                    "model": case["model"],
+                    "size": case["size"],
+                    "operation": operation,
+                }
+                entry.update(measure(ops[operation], repeat))
+                results.append(entry)
+                print(
+                    "%-9s %-22s %7d %-20s %14.2f us"
+                    % (
+                        source,
+                        case["model"],
+                        case["size"],
+                        operation,
+                        entry["best_us"],
+                    ),
+                    file=sys.stderr,
+                )
+    return results
+
+
+def key(entry: Dict[str, Any]) -> tuple:
+    return entry["source"], entry["model"], entry["size"], entry["operation"]
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str) -> int:
+    with open(baseline_path) as stream:
+        baseline = {key(entry): entry for entry in json.load(stream)["results"]}
+    regressions = 0
+    print(
+        "%-9s %-22s %7s %-20s %12s %12s %7s"
+        % ("source", "model", "size", "operation", "before us", "after us", "ratio")
+    )
+    for entry in results:
+        before = baseline.get(key(entry))
+        if before is None:
+            continue
+        ratio = entry["best_us"] / before["best_us"]
+        flag = "  <- slower" if ratio > REGRESSION else ""
+        regressions += ratio > REGRESSION
+        print(
+            "%-9s %-22s %7d %-20s %12.2f %12.2f %6.2fx%s"
+            % (
+                entry["source"],
+                entry["model"],
+                entry["size"],
+                entry["operation"],
+                before["best_us"],
+                entry["best_us"],
+                ratio,
+                flag,
+            )
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes", default=",".join(str(size) for size in SIZES), help="list page sizes"
+    )
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--operation", help="only time this operation")
+    parser.add_argument(
+        "--output", help="write the JSON results to this file instead of stdout"
+    )
+    parser.add_argument(
+        "--compare", help="JSON results of an earlier run to compare against"
+    )
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    document = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "pydantic": pydantic.VERSION,
+            "generator": (SERVER_ROOT / ".openapi-generator" / "VERSION")
+            .read_text()
+            .strip(),
+            "fast_json": settings.fast_json,
+            "platform": platform.platform(),
+        },
+        "results": run(sizes, args.repeat, args.operation),
+    }
+    if args.output:
+        with open(args.output, "w") as stream:
+            json.dump(document, stream, indent=2)
+    elif not args.compare:
+        print(json.dumps(document, indent=2))
+    if args.compare:
+        regressions = compare(document["results"], args.compare)
+        print(
+            "%d operations slower by more than %d%%"
+            % (regressions, (REGRESSION - 1) * 100)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# coding: utf-8
+
+"""Compare JSON and MessagePack for a page of users.
+
+Builds a `GetUserList200Response` of 1k users (`--size`) and reports, for
+both media types, the payload size (raw and gzip-compressed), the server's
+encoding cost (`render`/`render_msgpack`), the client's decoding cost, and
+decoding followed by model validation, as a caller using the generated
+models would do. JSON decoding is also timed with the standard library, for
+callers without orjson.
+
+Run from the server adapter root:
+
+    PYTHONPATH=src python tests/bench/bench_msgpack.py [--size 1000] [--json]
+
+Requires the optional `msgpack` package; orjson is used for JSON when
+installed, as the server does.
+"""
+
+import argparse
+import gzip
+import json
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict
+
+import msgpack
+
+from contracts.models.get_user_list200_response import GetUserList200Response
+from contracts.models.pagination_meta import PaginationMeta
+from contracts.models.user import User
+from contracts.responses import render, render_msgpack
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+REPEAT = 5
+
+
+def make_page(size: int) -> GetUserList200Response:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    users = [
+        User(
+            id="123e4567-e89b-12d3-a456-%012d" % i,
+            email="user%d@example.com" % i,
+            first_name="First%d" % i,
+            last_name="Last%d" % i,
+            role="BUYER",
+            status="ACTIVE",
+            avatar_url="https://example.com/avatars/%d.jpg" % i,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(size)
+    ]
+    return GetUserList200Response(
+        data=users, meta=PaginationMeta(limit=100, offset=0, total=size)
+    )
+
+
+def best_ms(fn: Callable[[], Any]) -> float:
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=REPEAT, number=number)) / number * 1000
+
+
+def run(size: int) -> Dict[str, Dict[str, Any]]:
+    page = make_page(size)
+    json_loads = orjson.loads if orjson is not None else json.loads
+    encoded = {"json": render(page), "msgpack": render_msgpack(page)}
+    decoders = {"json": json_loads, "msgpack": msgpack.unpackb}
+    encoders = {"json": render, "msgpack": render_msgpack}
+    assert msgpack.unpackb(encoded["msgpack"]) == json_loads(encoded["json"])
+
+    report = {}
+    for media, body in encoded.items():
+        decode = decoders[media]
+        encode = encoders[media]
+        report[media] = {
+            "bytes": len(body),
+            "gzip_bytes": len(gzip.compress(body, 5)),
+            "encode_ms": round(best_ms(lambda: encode(page)), 3),
+            "decode_ms": round(best_ms(lambda: decode(body)), 3),
+            "decode_validate_ms": round(
+                best_ms(lambda: GetUserList200Response.model_validate(decode(body))), 3
+            ),
+        }
+    report["json"]["validate_json_ms"] = round(
+        best_ms(lambda: GetUserList200Response.model_validate_json(encoded["json"])), 3
+    )
+    report["json"]["stdlib_decode_ms"] = round(
+        best_ms(lambda: json.loads(encoded["json"])), 3
+    )
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=1000, help="users in the page")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = run(args.size)
+    if args.json:
+        print(json.dumps({"size": args.size, "media_types": report}, indent=2))
+        return
+    print("GetUserList200Response with %d users, best of %d" % (args.size, REPEAT))
+    print(
+        "%-8s %9s %9s %10s %10s %12s"
+        % ("media", "bytes", "gzip", "encode ms", "decode ms", "decode+val ms")
+    )
+    for media, row in report.items():
+        print(
+            "%-8s %9d %9d %10.3f %10.3f %12.3f"
+            % (
+                media,
+                row["bytes"],
+                row["gzip_bytes"],
+                row["encode_ms"],
+                row["decode_ms"],
+                row["decode_validate_ms"],
+            )
+        )
+    print("json model_validate_json: %.3f ms" % report["json"]["validate_json_ms"])
+    print("json stdlib json.loads:   %.3f ms" % report["json"]["stdlib_decode_ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# coding: utf-8
+
+"""Time validation of the models carrying `Name` fields.
+
+Run from the server adapter root:
+
+    PYTHONPATH=src python tests/bench/bench_name_validation.py
+"""
+
+import timeit
+
+from contracts.models.get_user_list200_response import GetUserList200Response
+from contracts.models.user import User
+from contracts.models.user_create_request import UserCreateRequest
+
+USERS = 1000
+ROUNDS = 50
+
+
+def user_payload(i: int) -> dict:
+    return {
+        "id": "user-%d" % i,
+        "email": "user%d@example.com" % i,
+        "firstName": "First%d" % i,
+        "lastName": "Last%d" % i,
+        "role": "BUYER",
+        "status": "ACTIVE",
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": "2024-01-01T00:00:00Z",
+    }
+
+
+def main() -> None:
+    users = [user_payload(i) for i in range(USERS)]
+    page = {"data": users, "meta": {"limit": 100, "offset": 0, "total": USERS}}
+    create = {
+        "email": "user@example.com",
+        "firstName": "John",
+        "lastName": "Doe",
+        "password": "SecurePassword123!",
+        "role": "BUYER",
+        "status": "ACTIVE",
+    }
+
+    def bench(name: str, fn, number: int = 1) -> None:
+        best = min(timeit.repeat(fn, number=number, repeat=ROUNDS)) / number
+        print("%-40s %10.2f us" % (name, best * 1e6))
+
+    print("best of %d" % ROUNDS)
+    bench("User.model_validate", lambda: User.model_validate(users[0]), 1000)
+    bench(
+        "UserCreateRequest.model_validate",
+        lambda: UserCreateRequest.model_validate(create),
+        1000,
+    )
+    bench(
+        "GetUserList200Response.model_validate (1k)",
+        lambda: GetUserList200Response.model_validate(page),
+    )
+
+
+if __name__ == "__main__":
+    main()
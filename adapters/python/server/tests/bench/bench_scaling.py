@@ -0,0 +1,192 @@
+# coding: utf-8
+
+"""Throughput of `contracts.serve` by number of workers.
+
+Serves the canned implementations of `load_stub_impl.py` with
+`python -m contracts.serve` at each worker count of `--workers` in turn and
+drives it with the closed loop of `bench_load.py`. The load comes from
+`--clients` client processes, each with its share of `--concurrency`, so the
+client is not the bottleneck of a multi-worker server. Reports, per worker
+count, the total throughput, the speedup over the first worker count and
+p50/p99 latency.
+
+Run from the server adapter root:
+
+    PYTHONPATH=src python tests/bench/bench_scaling.py --workers 1,2,4,8 --clients 4
+
+The speedup is bounded by the CPUs shared by the server and the clients;
+`default_workers()` shows how many this machine offers. Requires uvicorn
+and httpx.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+from bench_load import (
+    BENCH_DIR,
+    SERVER_ROOT,
+    TOKEN,
+    Recorder,
+    chooser,
+    closed_loop,
+    free_port,
+    parse_mix,
+    summarize,
+    wait_until_ready,
+)
+from contracts.serve import default_workers
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(SERVER_ROOT / "src"), str(BENCH_DIR), env.get("PYTHONPATH")])
+    )
+    env["CONTRACTS_IMPL_MODULES"] = "load_stub_impl"
+    command = [
+        sys.executable,
+        "-m",
+        "contracts.serve",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+    return subprocess.Popen(command, env=env)
+
+
+async def client(
+    base_url: str,
+    mix: Dict[str, float],
+    seed: int,
+    concurrency: int,
+    warmup: float,
+    duration: float,
+) -> Tuple[List[float], int]:
+    choose = chooser(mix, seed)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=None)
+    async with httpx.AsyncClient(
+        base_url=base_url, headers={"Authorization": TOKEN}, limits=limits, timeout=30.0
+    ) as session:
+        await closed_loop(
+            session, choose, Recorder(), concurrency, time.perf_counter() + warmup
+        )
+        recorder = Recorder()
+        await closed_loop(
+            session, choose, recorder, concurrency, time.perf_counter() + duration
+        )
+    latencies = [
+        latency for samples in recorder.latencies.values() for latency in samples
+    ]
+    return latencies, sum(recorder.errors.values())
+
+
+def run_client(args: tuple) -> Tuple[List[float], int]:
+    return asyncio.run(client(*args))
+
+
+def measure(args, workers: int) -> Dict[str, Any]:
+    port = free_port()
+    base_url = "http://127.0.0.1:%d" % port
+    server = start_server(port, workers)
+    try:
+        asyncio.run(wait_until_ready(base_url))
+        mix = parse_mix(args.mix)
+        share = max(1, args.concurrency // args.clients)
+        jobs = [
+            (base_url, mix, args.seed + index, share, args.warmup, args.duration)
+            for index in range(args.clients)
+        ]
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.map(run_client, jobs)
+    finally:
+        server.terminate()
+        server.wait()
+    samples = [latency for latencies, _ in results for latency in latencies]
+    errors = sum(errors for _, errors in results)
+    return summarize(samples, errors, args.duration)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--workers", default="1,2,4,8", help="comma-separated worker counts to measure"
+    )
+    parser.add_argument(
+        "--clients", type=int, default=4, help="client processes generating the load"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=64,
+        help="clients of the closed loop, in total",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=10.0,
+        help="seconds of measured load per worker count",
+    )
+    parser.add_argument(
+        "--warmup", type=float, default=2.0, help="seconds of unmeasured load first"
+    )
+    parser.add_argument(
+        "--mix", default="getUserById=10,getUserList=2,getHealthStatus=1",
+        help="operationId=weight pairs",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    rows = {}
+    for workers in [int(count) for count in args.workers.split(",")]:
+        rows[workers] = measure(args, workers)
+    baseline = next(iter(rows.values()))["rps"] or 1.0
+    for row in rows.values():
+        row["speedup"] = round(row["rps"] / baseline, 2)
+
+    if args.json:
+        print(
+            json.dumps(
+                {"cpus": default_workers(), "config": vars(args), "workers": rows},
+                indent=2,
+            )
+        )
+        return
+    print(
+        "%d CPUs, %d client processes, %d concurrent, %ss per worker count"
+        % (default_workers(), args.clients, args.concurrency, args.duration)
+    )
+    print(
+        "%-8s %9s %7s %9s %8s %9s %9s"
+        % ("workers", "requests", "errors", "req/s", "speedup", "p50 ms", "p99 ms")
+    )
+    for workers, row in rows.items():
+        print(
+            "%-8d %9d %7d %9.1f %8.2f %9.2f %9.2f"
+            % (
+                workers,
+                row["requests"],
+                row["errors"],
+                row["rps"],
+                row["speedup"],
+                row["p50_ms"],
+                row["p99_ms"],
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
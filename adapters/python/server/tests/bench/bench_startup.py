@@ -0,0 +1,62 @@
+# coding: utf-8
+
+"""Measure worker startup: importing `contracts.main` and running the
+application lifespan, each in a fresh interpreter.
+
+Run from the server adapter root:
+
+    PYTHONPATH=src python tests/bench/bench_startup.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+RUNS = 20
+
+PROBE = """
+import asyncio
+import time
+
+started = time.perf_counter()
+import contracts.main as main
+imported = time.perf_counter()
+
+
+async def lifespan():
+    async with main.lifespan(main.app):
+        return time.perf_counter()
+
+
+ready = asyncio.run(lifespan())
+print(imported - started, ready - imported)
+"""
+
+
+def probe() -> tuple:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        check=True,
+        capture_output=True,
+        env=os.environ,
+        text=True,
+    ).stdout
+    imported, ready = output.split()
+    return float(imported), float(ready)
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS
+    samples = [probe() for _ in range(runs)]
+    imports = [sample[0] * 1000 for sample in samples]
+    lifespans = [sample[1] * 1000 for sample in samples]
+    totals = [a + b for a, b in zip(imports, lifespans)]
+    print("median of %d fresh interpreters" % runs)
+    print("import contracts.main %8.1f ms" % statistics.median(imports))
+    print("lifespan startup      %8.1f ms" % statistics.median(lifespans))
+    print("total                 %8.1f ms" % statistics.median(totals))
+
+
+if __name__ == "__main__":
+    main()
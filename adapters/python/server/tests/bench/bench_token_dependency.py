@@ -0,0 +1,101 @@
+# coding: utf-8
+
+"""Measure requests/sec of a secured route with a sync and an async token
+dependency.
+
+Both variants verify the same cached HS256 token with `TokenVerifier`; they
+only differ in whether FastAPI has to hand the dependency to the threadpool.
+Requests are sent concurrently through an in-process ASGI transport, so the
+numbers isolate the framework overhead from the network.
+
+Run from the server adapter root:
+
+    PYTHONPATH=src python tests/bench/bench_token_dependency.py
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import time
+
+import httpx
+from fastapi import Depends, FastAPI, Security
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from contracts import security_api
+from contracts.models.extra_models import TokenModel
+from contracts.tokens import TokenVerifier, VerificationKey
+
+SECRET = b"bench-secret"
+REQUESTS = 5000
+CONCURRENCY = 64
+ROUNDS = 3
+
+bearer_auth = HTTPBearer()
+
+
+def make_token() -> str:
+    def segment(raw: bytes) -> str:
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+    signing_input = "%s.%s" % (
+        segment(b'{"alg":"HS256","typ":"JWT"}'),
+        segment(b'{"sub":"bench"}'),
+    )
+    signature = hmac.new(SECRET, signing_input.encode("ascii"), hashlib.sha256).digest()
+    return "%s.%s" % (signing_input, segment(signature))
+
+
+def sync_token(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_auth),
+) -> TokenModel:
+    return security_api.token_verifier.verify(credentials.credentials)
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync")
+    async def sync_route(token: TokenModel = Security(sync_token)) -> dict:
+        return {"sub": token.sub}
+
+    @app.get("/async")
+    async def async_route(
+        token: TokenModel = Security(security_api.get_token_bearerAuth),
+    ) -> dict:
+        return {"sub": token.sub}
+
+    return app
+
+
+async def run(client: httpx.AsyncClient, path: str, headers: dict) -> float:
+    remaining = iter(range(REQUESTS))
+
+    async def worker() -> None:
+        for _ in remaining:
+            response = await client.get(path, headers=headers)
+            assert response.status_code == 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    return REQUESTS / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    security_api.token_verifier = TokenVerifier([VerificationKey.from_secret(SECRET)])
+    headers = {"Authorization": "Bearer %s" % make_token()}
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        print(
+            "%d requests, %d concurrent, best of %d" % (REQUESTS, CONCURRENCY, ROUNDS)
+        )
+        for path in ("/sync", "/async"):
+            best = max([await run(client, path, headers) for _ in range(ROUNDS)])
+            print("%-8s %8.0f req/s" % (path, best))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,189 @@
+# coding: utf-8
+
+"""Time `filter.text` searches of the in-memory reference users store.
+
+Loads 1M synthetic users (`--users`) into `InMemoryUsersApi`, with names
+drawn from Zipf-like pools so that some are shared by many users, and times
+`get_user_list` for queries picked from the loaded users: a whole email, a
+last name, a first name, a four-character prefix, three characters of a
+name and a two-character query, with and without a status or role filter,
+and pages sorted by `FULL_NAME` at a deep offset, after the cursor of a
+random user and with filters. Reports the p50/p99 latency of each kind and
+the mean number of matches (`meta.total`).
+
+Run from the server adapter root:
+
+    PYTHONPATH=src python tests/bench/bench_user_search.py [--users 1000000] [--json]
+
+Loading 1M users takes about a minute and 2 GB of memory.
+"""
+
+import argparse
+import itertools
+import json
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from contracts.impl.reference.users import InMemoryUsersApi
+from contracts.models.user import User
+from contracts.models.user_sort_field import UserSortField
+from contracts.models.users_request_payload import UsersRequestPayload
+from contracts.pagination import encode_cursor, user_sort_key
+
+SEED = 7
+QUERIES = 200
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+DOMAINS = ["example.com", "mail.test", "corp.example", "users.test"]
+STATUSES = ["ACTIVE"] * 7 + ["PENDING", "FROZEN", "DELETED"]
+ROLES = ["BUYER"] * 8 + ["TEAM_LEAD", "ADMIN"]
+ONSETS = list("bcdfghjklmnpqrstvwxz") + [
+    "br", "ch", "cl", "dr", "fr", "gl", "gr", "kr",
+    "ph", "pl", "sh", "sk", "st", "th", "tr", "wh",
+]
+VOWELS = list("aeiouy") + ["ai", "au", "ea", "ee", "ie", "oa", "oo", "ou"]
+CODAS = list("dklmnrstxz") + ["ck", "ng", "nd", "rd", "rt", "sh", "ss", "th"]
+
+
+def make_name(rng: random.Random) -> str:
+    syllables = rng.randint(2, 3)
+    name = "".join(rng.choice(ONSETS) + rng.choice(VOWELS) for _ in range(syllables))
+    if rng.random() < 0.4:
+        name += rng.choice(CODAS)
+    return name.capitalize()
+
+
+def zipf_weights(size: int) -> List[float]:
+    """Cumulative weights making the first names of a pool the most common"""
+    weights = [1.0 / (rank + 10) for rank in range(size)]
+    return list(itertools.accumulate(weights))
+
+
+def make_users(count: int, rng: random.Random) -> List[User]:
+    first_names = [make_name(rng) for _ in range(2000)]
+    last_names = [make_name(rng) for _ in range(50000)]
+    firsts = rng.choices(
+        first_names, cum_weights=zipf_weights(len(first_names)), k=count
+    )
+    lasts = rng.choices(last_names, cum_weights=zipf_weights(len(last_names)), k=count)
+    return [
+        User.model_construct(
+            id="%08x-0000-4000-8000-%012x" % (i, i),
+            email="%s.%s%d@%s" % (first.lower(), last.lower(), i, rng.choice(DOMAINS)),
+            first_name=first,
+            last_name=last,
+            role=rng.choice(ROLES),
+            status=rng.choice(STATUSES),
+            created_at=NOW,
+            updated_at=NOW,
+        )
+        for i, (first, last) in enumerate(zip(firsts, lasts))
+    ]
+
+
+def call(api: InMemoryUsersApi, payload: UsersRequestPayload) -> Any:
+    coroutine = api.get_user_list(payload)
+    try:
+        coroutine.send(None)
+    except StopIteration as e:
+        return e.value
+    raise RuntimeError("get_user_list awaited")
+
+
+def query_kinds(rng: random.Random) -> Dict[str, Callable[[User], Dict[str, Any]]]:
+    def text(value: str) -> Dict[str, Any]:
+        return {"filter": {"text": value}}
+
+    def by_name(**payload: Any) -> Dict[str, Any]:
+        return dict(payload, sortBy=["FULL_NAME"])
+
+    def after(user: User) -> str:
+        return encode_cursor(user_sort_key(user, [UserSortField.FULL_NAME]), user.id)
+
+    def three_chars(user: User) -> Dict[str, Any]:
+        start = rng.randint(0, len(user.last_name) - 3)
+        return text(user.last_name[start:start + 3])
+
+    return {
+        "email": lambda user: text(user.email),
+        "last name": lambda user: text(user.last_name),
+        "first name": lambda user: text(user.first_name),
+        "prefix (4)": lambda user: text(user.last_name[:4]),
+        "three chars": three_chars,
+        "two chars": lambda user: text(user.last_name[:2]),
+        "last name + status": lambda user: {
+            "filter": {"text": user.last_name, "statuses": ["FROZEN"]}
+        },
+        "email + role": lambda user: {
+            "filter": {"text": user.email, "roles": [user.role]}
+        },
+        "status only": lambda user: {"filter": {"statuses": ["PENDING"]}},
+        "name, offset 10000": lambda user: by_name(offset=10000),
+        "name, cursor": lambda user: by_name(cursor=after(user)),
+        "name desc, cursor": lambda user: by_name(cursor=after(user), orderBy=["DESC"]),
+        "name + status": lambda user: by_name(
+            cursor=after(user), filter={"statuses": ["PENDING"]}
+        ),
+        "name + last name": lambda user: by_name(filter={"text": user.last_name}),
+    }
+
+
+def run(count: int) -> Dict[str, Any]:
+    rng = random.Random(SEED)
+    api = InMemoryUsersApi()
+    started = time.perf_counter()
+    api.load(make_users(count, rng))
+    loaded = time.perf_counter() - started
+    users = [user for user in api.users if user is not None]
+
+    report: Dict[str, Any] = {}
+    for kind, build in query_kinds(rng).items():
+        timings = []
+        totals = 0
+        for _ in range(QUERIES):
+            payload = UsersRequestPayload.model_validate(
+                dict({"limit": 20, "offset": 0}, **build(rng.choice(users)))
+            )
+            started = time.perf_counter()
+            page = call(api, payload)
+            timings.append(time.perf_counter() - started)
+            totals += page.meta.total
+        timings.sort()
+        report[kind] = {
+            "p50_ms": round(timings[len(timings) // 2] * 1000, 3),
+            "p99_ms": round(timings[int(len(timings) * 0.99)] * 1000, 3),
+            "mean_matches": round(totals / QUERIES, 1),
+        }
+    return {
+        "users": count,
+        "load_s": round(loaded, 1),
+        "grams": len(api.text.postings),
+        "queries": report,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=1000000, help="users loaded")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    result = run(args.users)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(
+        "%d users loaded in %.1f s, %d grams; %d queries of each kind"
+        % (result["users"], result["load_s"], result["grams"], QUERIES)
+    )
+    print("%-20s %9s %9s %13s" % ("query", "p50 ms", "p99 ms", "mean matches"))
+    for kind, row in result["queries"].items():
+        print(
+            "%-20s %9.3f %9.3f %13.1f"
+            % (kind, row["p50_ms"], row["p99_ms"], row["mean_matches"])
+        )
+
+
+if __name__ == "__main__":
+    main()
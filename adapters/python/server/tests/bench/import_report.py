@@ -0,0 +1,77 @@
+# coding: utf-8
+
+"""Report the import time of every `contracts` module, in milliseconds.
+
+Each run imports the target in a fresh interpreter under `-X importtime`; the
+report shows the median self and cumulative time per module. Pass `--json`
+to get a document that can be stored and compared across releases.
+
+Run from the server adapter root:
+
+    PYTHONPATH=src python tests/bench/import_report.py [module] [--runs N] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+PREFIX = "contracts"
+
+
+def sample(module: str) -> Dict[str, List[int]]:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import %s" % module],
+        check=True,
+        capture_output=True,
+        env=os.environ,
+        text=True,
+    ).stderr
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        if name == PREFIX or name.startswith(PREFIX + "."):
+            timings[name] = [int(own), int(cumulative)]
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("module", nargs="?", default="contracts.main")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    samples = [sample(args.module) for _ in range(args.runs)]
+    report = {}
+    for name in samples[0]:
+        own = [run[name][0] for run in samples if name in run]
+        cumulative = [run[name][1] for run in samples if name in run]
+        report[name] = {
+            "self_ms": round(statistics.median(own) / 1000, 2),
+            "cumulative_ms": round(statistics.median(cumulative) / 1000, 2),
+        }
+
+    if args.json:
+        print(
+            json.dumps(
+                {"module": args.module, "runs": args.runs, "modules": report}, indent=2
+            )
+        )
+        return
+    print("import %s, median of %d runs" % (args.module, args.runs))
+    print("%-55s %9s %9s" % ("module", "self ms", "cumul ms"))
+    for name, timing in sorted(
+        report.items(), key=lambda item: -item[1]["cumulative_ms"]
+    ):
+        print("%-55s %9.2f %9.2f" % (name, timing["self_ms"], timing["cumulative_ms"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# coding: utf-8
+
+"""In-memory stub implementations used by `bench_load.py`.
+
+Every operation returns a response built once in `startup()`, so a load test
+against these measures the generated FastAPI stack (routing, validation,
+security dependency, serialization) and nothing else. Registered through
+`CONTRACTS_IMPL_MODULES=load_stub_impl`.
+"""
+
+from datetime import datetime, timezone
+
+from contracts.apis.authentication_api_base import BaseAuthenticationApi
+from contracts.apis.health_api_base import BaseHealthApi
+from contracts.apis.users_api_base import BaseUsersApi
+from contracts.models.authenticate_user200_response import AuthenticateUser200Response
+from contracts.models.get_health_status200_response import GetHealthStatus200Response
+from contracts.models.get_user_list200_response import GetUserList200Response
+from contracts.models.logout_user200_response import LogoutUser200Response
+from contracts.models.pagination_meta import PaginationMeta
+from contracts.models.token_response import TokenResponse
+from contracts.models.user import User
+from contracts.models.user_batch_response import UserBatchResponse
+from contracts.models.user_batch_result import UserBatchResult
+
+PAGE_SIZE = 20
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_user(index: int) -> User:
+    return User(
+        id="123e4567-e89b-12d3-a456-%012d" % index,
+        email="user%d@example.com" % index,
+        first_name="First%d" % index,
+        last_name="Last%d" % index,
+        role="BUYER",
+        status="ACTIVE",
+        avatar_url="https://example.com/avatars/%d.jpg" % index,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+class StubAuthenticationApi(BaseAuthenticationApi):
+    async def startup(self) -> None:
+        self.tokens = TokenResponse(
+            access_token="access-token",
+            refresh_token="refresh-token",
+            access_token_expires_in_seconds=3600,
+            refresh_token_expires_in_seconds=86400,
+        )
+        self.login = AuthenticateUser200Response(
+            user=make_user(0), **self.tokens.model_dump()
+        )
+        self.logout = LogoutUser200Response(success=True)
+
+    async def authenticate_user(self, auth_request_payload):
+        return self.login
+
+    async def logout_user(self):
+        return self.logout
+
+    async def refresh_tokens(self, auth_token_refresh_request_payload):
+        return self.tokens
+
+    async def register_user(self, register_request_payload):
+        return self.login
+
+
+class StubHealthApi(BaseHealthApi):
+    async def startup(self) -> None:
+        self.health = GetHealthStatus200Response(
+            status="healthy", timestamp=NOW, version="1.0.0"
+        )
+
+    async def get_health_status(self):
+        return self.health
+
+
+class StubUsersApi(BaseUsersApi):
+    async def startup(self) -> None:
+        self.user = make_user(0)
+        self.page = GetUserList200Response(
+            data=[make_user(i) for i in range(PAGE_SIZE)],
+            meta=PaginationMeta(limit=PAGE_SIZE, offset=0, total=1000),
+        )
+        self.batch = UserBatchResponse(
+            results=[
+                UserBatchResult(id=user.id, user=user) for user in self.page.data[:10]
+            ]
+        )
+        self.deleted = LogoutUser200Response(success=True)
+
+    async def batch_create_users(self, user_batch_create_request):
+        return self.batch
+
+    async def batch_get_users(self, user_batch_get_request):
+        return self.batch
+
+    async def batch_update_users(self, user_batch_update_request):
+        return self.batch
+
+    async def create_user(self, user_create_request):
+        return self.user
+
+    async def delete_user_by_id(self, userId):
+        return self.deleted
+
+    async def get_user_by_id(self, userId):
+        return self.user
+
+    async def get_user_list(self, users_request_payload):
+        return self.page
+
+    async def update_user_by_id(self, userId, user_update_request):
+        return self.user
+
+    async def update_user_email(self, userId, user_update_email_request):
+        return self.user
@@ -2,6 +2,10 @@ import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from contracts.apis.users_api import router as users_router
+from contracts.apis.users_api_base import BaseUsersApi
+from contracts.cache import response_cache
+from contracts.dispatcher import dispatcher
 from contracts.main import app as application
 
 
@@ -14,4 +18,30 @@ def app() -> FastAPI:
 
 @pytest.fixture
 def client(app) -> TestClient:
-    return TestClient(app)
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def users_client(monkeypatch):
+    """Build a client of the users router served by the given implementation,
+    which need not subclass `BaseUsersApi`"""
+
+    def build(impl) -> TestClient:
+        monkeypatch.setitem(dispatcher._instances, BaseUsersApi, impl)
+        monkeypatch.setattr(dispatcher, "_handlers", {})
+        monkeypatch.setattr(dispatcher, "_started", True)
+        app = FastAPI()
+        app.include_router(users_router)
+        return TestClient(app)
+
+    return build
+
+
+@pytest.fixture
+def enabled_cache(monkeypatch):
+    """Turn on the response cache, which is disabled by default, and empty it
+    afterwards"""
+    monkeypatch.setattr(response_cache, "max_bytes", 1024 * 1024)
+    yield response_cache
+    response_cache.clear()
@@ -0,0 +1,147 @@
+# coding: utf-8
+
+from datetime import datetime, timezone
+
+from contracts.cache import LISTS, ResponseCache, canonical
+from contracts.models.extra_models import TokenModel
+from contracts.models.user import User
+from contracts.models.users_request_payload import UsersRequestPayload
+
+HEADERS = {"Authorization": "Bearer special-key"}
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_user(user_id: str, first_name: str = "John") -> User:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return User(
+        id=user_id,
+        email="%s@example.com" % user_id,
+        first_name=first_name,
+        last_name="Doe",
+        role="BUYER",
+        status="ACTIVE",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_canonical_payload_ignores_member_order():
+    first = UsersRequestPayload.from_json('{"limit": 10, "offset": 0}')
+    second = UsersRequestPayload.from_json('{"offset":0,"limit":10}')
+
+    assert canonical(first) == canonical(second)
+    assert canonical({"b": 1, "a": [2]}) == canonical({"a": [2], "b": 1})
+
+
+def test_canonical_keeps_strings_verbatim():
+    pairs = ((" 42", "42"), ("1.0", "1.00"), ("1e2", "100.0"), (" true", "true"))
+    for left, right in pairs:
+        assert canonical(left) != canonical(right)
+
+
+def test_key_is_scoped_to_the_caller():
+    cache = ResponseCache(max_bytes=1024)
+
+    alice = cache.key("get_user_by_id", TokenModel(sub="alice"), "user-1")
+    cache.put(alice, b"{}", '"a"')
+
+    assert cache.get(
+        cache.key("get_user_by_id", TokenModel(sub="alice"), "user-1")
+    ) == (b"{}", '"a"')
+    assert (
+        cache.get(cache.key("get_user_by_id", TokenModel(sub="bob"), "user-1")) is None
+    )
+    assert ResponseCache(max_bytes=0).key("get_user_by_id", None, "user-1") is None
+
+
+def test_evicts_least_recently_used_by_bytes_and_expires():
+    clock = Clock()
+    cache = ResponseCache(max_bytes=2 * (100 + 3 + 256), ttl=10, clock=clock)
+    keys = [cache.key("op", None, str(i)) for i in range(3)]
+    cache.put(keys[0], b"x" * 100, '"0"')
+    cache.put(keys[1], b"x" * 100, '"1"')
+    cache.get(keys[0])
+    cache.put(keys[2], b"x" * 100, '"2"')
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+    clock.now = 10
+    assert cache.get(keys[2]) is None
+    assert cache.stats()["entries"] == 1
+
+
+def test_invalidation_drops_tagged_entries_and_racing_fills():
+    cache = ResponseCache(max_bytes=4096)
+    user = cache.key("get_user_by_id", None, "user-1")
+    page = cache.key("get_user_list", None, None)
+    other = cache.key("get_user_by_id", None, "user-2")
+    cache.put(user, b"1", '"1"', ("user-1",))
+    cache.put(page, b"[]", '"p"', (LISTS,))
+    cache.put(other, b"2", '"2"', ("user-2",))
+
+    stale = cache.key("get_user_by_id", None, "user-3")
+    cache.invalidate(LISTS, "user-1")
+    cache.put(stale, b"3", '"3"', ("user-3",))
+
+    assert cache.get(user) is None
+    assert cache.get(page) is None
+    assert cache.get(other) is not None
+    assert cache.get(cache.key("get_user_by_id", None, "user-3")) is None
+    assert cache.stats()["invalidations"] == 2
+
+
+class CountingUsersApi:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.first_name = "John"
+
+    async def get_user_version(self, userId):
+        return None
+
+    async def get_user_by_id(self, userId):
+        self.calls += 1
+        return make_user(userId, self.first_name)
+
+    async def update_user_by_id(self, userId, user_update_request):
+        self.first_name = user_update_request.first_name
+        return make_user(userId, self.first_name)
+
+
+def test_route_serves_hits_until_a_write(users_client, enabled_cache):
+    impl = CountingUsersApi()
+    client = users_client(impl)
+
+    first = client.get("/v1/users/user-1", headers=HEADERS)
+    second = client.get("/v1/users/user-1", headers=HEADERS)
+    assert impl.calls == 1
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    revalidated = client.get(
+        "/v1/users/user-1", headers={**HEADERS, "If-None-Match": first.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+
+    client.put("/v1/users/user-1", headers=HEADERS, json={"firstName": "Jane"})
+    third = client.get("/v1/users/user-1", headers=HEADERS)
+    assert impl.calls == 2
+    assert third.json()["firstName"] == "Jane"
+    assert enabled_cache.stats()["hits"] == 2
+
+
+def test_route_keys_ids_verbatim(users_client, enabled_cache):
+    impl = CountingUsersApi()
+    client = users_client(impl)
+
+    assert client.get("/v1/users/42", headers=HEADERS).json()["id"] == "42"
+    assert client.get("/v1/users/%2042", headers=HEADERS).json()["id"] == " 42"
+    assert impl.calls == 2
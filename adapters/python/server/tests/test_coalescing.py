@@ -0,0 +1,136 @@
+# coding: utf-8
+
+import asyncio
+
+import pytest
+
+from contracts.coalescing import SingleFlight
+from contracts.streaming import ListStream
+
+
+class SlowLookup:
+    def __init__(self, error: Exception = None) -> None:
+        self.calls = 0
+        self.error = error
+        self.release = None
+
+    async def __call__(self, user_id: str):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return {"id": user_id, "call": self.calls}
+
+
+def run_concurrently(
+    flight: SingleFlight, lookup: SlowLookup, args, operation="get_user_by_id"
+):
+    async def scenario():
+        lookup.release = asyncio.Event()
+        tasks = [
+            asyncio.ensure_future(flight.run(operation, lookup, arg)) for arg in args
+        ]
+        await asyncio.sleep(0)
+        lookup.release.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    return asyncio.run(scenario())
+
+
+def test_identical_calls_share_one_result():
+    flight = SingleFlight(["get_user_by_id"])
+    lookup = SlowLookup()
+
+    results = run_concurrently(flight, lookup, ["user-1"] * 5 + ["user-2"])
+
+    assert lookup.calls == 2
+    assert all(result is results[0] for result in results[:5])
+    assert results[5]["id"] == "user-2"
+    assert flight.stats() == {"get_user_by_id": {"calls": 2, "collapsed": 4}}
+
+
+def test_ids_that_differ_as_strings_are_not_coalesced():
+    flight = SingleFlight(["get_user_by_id"])
+    lookup = SlowLookup()
+
+    results = run_concurrently(flight, lookup, [" 42", "42", "42.0"])
+
+    assert lookup.calls == 3
+    assert [result["id"] for result in results] == [" 42", "42", "42.0"]
+
+
+def test_waiters_share_the_error():
+    flight = SingleFlight(["get_user_by_id"])
+    error = LookupError("gone")
+    lookup = SlowLookup(error)
+
+    results = run_concurrently(flight, lookup, ["user-1"] * 3)
+
+    assert lookup.calls == 1
+    assert results == [error] * 3
+
+
+def test_unlisted_operations_are_not_coalesced():
+    flight = SingleFlight(["get_user_list"])
+    lookup = SlowLookup()
+
+    run_concurrently(flight, lookup, ["user-1"] * 3)
+
+    assert lookup.calls == 3
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    flight = SingleFlight(["get_user_by_id"])
+    lookup = SlowLookup()
+
+    async def scenario():
+        lookup.release = asyncio.Event()
+        first = asyncio.ensure_future(flight.run("get_user_by_id", lookup, "user-1"))
+        second = asyncio.ensure_future(flight.run("get_user_by_id", lookup, "user-1"))
+        await asyncio.sleep(0)
+        first.cancel()
+        lookup.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario())["id"] == "user-1"
+    assert lookup.calls == 1
+
+
+def test_detach_starts_a_new_call():
+    flight = SingleFlight(["get_user_by_id"])
+    lookup = SlowLookup()
+
+    async def scenario():
+        lookup.release = asyncio.Event()
+        before = asyncio.ensure_future(flight.run("get_user_by_id", lookup, "user-1"))
+        await asyncio.sleep(0)
+        flight.detach()
+        after = asyncio.ensure_future(flight.run("get_user_by_id", lookup, "user-1"))
+        await asyncio.sleep(0)
+        lookup.release.set()
+        return await asyncio.gather(before, after)
+
+    before, after = asyncio.run(scenario())
+    assert before is not after
+    assert lookup.calls == 2
+
+
+def test_streams_are_not_shared():
+    flight = SingleFlight(["get_user_list"])
+    calls = []
+
+    async def get_user_list(payload):
+        calls.append(payload)
+        await asyncio.sleep(0)
+        return ListStream(iter(()), None)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(flight.run("get_user_list", get_user_list, None) for _ in range(3))
+        )
+
+    streams = asyncio.run(scenario())
+    assert len(calls) == 3
+    assert len({id(stream) for stream in streams}) == 3
@@ -0,0 +1,117 @@
+# coding: utf-8
+
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from contracts.compression import (
+    ENCODINGS,
+    CompressionMiddleware,
+    CompressionStats,
+    negotiate,
+)
+from contracts.streaming import ListStream
+
+
+class Item(BaseModel):
+    id: str
+
+
+PAYLOAD = json.dumps(
+    {"data": [{"id": "user-%d" % i, "firstName": "John"} for i in range(200)]}
+)
+
+
+@pytest.fixture
+def stats() -> CompressionStats:
+    return CompressionStats()
+
+
+@pytest.fixture
+def client(stats) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/large")
+    async def get_user_list() -> Response:
+        return Response(
+            PAYLOAD, media_type="application/json", headers={"ETag": '"v1"'}
+        )
+
+    @app.get("/small")
+    async def get_user_by_id() -> Response:
+        return Response('{"id":"user-1"}', media_type="application/json")
+
+    @app.get("/health")
+    async def get_health_status() -> Response:
+        return Response(PAYLOAD, media_type="application/json")
+
+    @app.get("/stream")
+    async def stream_users():
+        async def items():
+            for index in range(2000):
+                yield Item(id="user-%d" % index)
+
+        return ListStream(items(), chunk_size=4096).response()
+
+    app.add_middleware(CompressionMiddleware, minimum_size=512, stats=stats)
+    return TestClient(app)
+
+
+def test_negotiation_honours_q_values():
+    available = {"zstd": None, "br": None, "gzip": None}
+
+    assert negotiate("gzip, br", available) == "br"
+    assert negotiate("gzip;q=1.0, zstd;q=0.5", available) == "gzip"
+    assert negotiate("*;q=0.5, br;q=0", available) == "zstd"
+    assert negotiate("identity", available) is None
+    assert negotiate(None, available) is None
+
+
+def test_large_bodies_are_compressed(client, stats):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert int(response.headers["content-length"]) < len(PAYLOAD) / 4
+    assert response.text == PAYLOAD
+    counters = stats.stats()["gzip"]
+    assert counters["responses"] == 1
+    assert counters["bytes_in"] == len(PAYLOAD)
+    assert counters["bytes_saved"] > 0
+
+
+def test_small_and_excluded_bodies_are_not(client, stats):
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    health = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in small.headers
+    assert small.headers["vary"] == "Accept-Encoding"
+    assert "content-encoding" not in health.headers
+    assert "content-encoding" not in identity.headers
+    assert stats.stats() == {}
+
+
+def test_streams_are_compressed_incrementally(client, stats):
+    with client.stream(
+        "GET", "/stream", headers={"Accept-Encoding": "gzip"}
+    ) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert len(json.loads(gzip.decompress(raw))["data"]) == 2000
+    assert stats.stats()["gzip"]["responses"] == 1
+
+
+@pytest.mark.parametrize("encoding", [name for name in ENCODINGS if name != "gzip"])
+def test_optional_encodings(client, encoding):
+    response = client.get("/large", headers={"Accept-Encoding": encoding})
+
+    assert response.headers["content-encoding"] == encoding
+    assert response.text == PAYLOAD
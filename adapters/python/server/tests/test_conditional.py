@@ -0,0 +1,117 @@
+# coding: utf-8
+
+from datetime import datetime, timezone
+
+from contracts.conditional import body_etag, etag_matches, quote_etag
+from contracts.models.get_user_list200_response import GetUserList200Response
+from contracts.models.pagination_meta import PaginationMeta
+from contracts.models.user import User
+from contracts.responses import render
+
+HEADERS = {"Authorization": "Bearer special-key"}
+
+
+def make_user() -> User:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return User(
+        id="user-1",
+        email="user1@example.com",
+        first_name="John",
+        last_name="Doe",
+        role="BUYER",
+        status="ACTIVE",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class FakeUsersApi:
+    """Duck-typed implementation, so `BaseUsersApi.subclasses` stays untouched"""
+
+    def __init__(self, version=None):
+        self.version = version
+        self.loads = 0
+        self.version_reads = 0
+
+    async def get_user_version(self, userId):
+        self.version_reads += 1
+        return self.version
+
+    async def get_user_by_id(self, userId):
+        self.loads += 1
+        return make_user()
+
+    async def get_user_list(self, users_request_payload):
+        return GetUserList200Response(
+            data=[make_user()], meta=PaginationMeta(limit=10, offset=0, total=1)
+        )
+
+
+def test_etag_matching():
+    etag = quote_etag("v1")
+
+    assert etag == '"v1"'
+    assert etag_matches('"v0", "v1"', etag)
+    assert etag_matches('W/"v1"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"v2"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_get_user_without_version_hashes_the_body(users_client):
+    impl = FakeUsersApi()
+    client = users_client(impl)
+
+    response = client.get("/v1/users/user-1", headers=HEADERS)
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert etag == body_etag(render(make_user()))
+
+    response = client.get(
+        "/v1/users/user-1", headers={**HEADERS, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_version_hook_answers_without_loading(users_client):
+    impl = FakeUsersApi(version="7")
+    client = users_client(impl)
+
+    response = client.get(
+        "/v1/users/user-1", headers={**HEADERS, "If-None-Match": '"7"'}
+    )
+    assert response.status_code == 304
+    assert impl.loads == 0
+
+    response = client.get(
+        "/v1/users/user-1", headers={**HEADERS, "If-None-Match": '"6"'}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"7"'
+    assert response.json()["id"] == "user-1"
+    assert impl.loads == 1
+
+
+def test_version_is_read_once_per_request(users_client):
+    impl = FakeUsersApi(version="7")
+    client = users_client(impl)
+
+    response = client.get("/v1/users/user-1", headers=HEADERS)
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"7"'
+    assert impl.version_reads == 1
+
+
+def test_user_list_is_conditional(users_client):
+    client = users_client(FakeUsersApi())
+
+    params = {"UsersRequestPayload": '{"limit":10,"offset":0}'}
+
+    etag = client.get("/v1/users", params=params, headers=HEADERS).headers["etag"]
+    response = client.get(
+        "/v1/users", params=params, headers={**HEADERS, "If-None-Match": etag}
+    )
+
+    assert response.status_code == 304
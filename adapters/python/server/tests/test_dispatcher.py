@@ -0,0 +1,125 @@
+# coding: utf-8
+
+import asyncio
+from typing import ClassVar, Tuple
+
+import pytest
+from fastapi import HTTPException
+
+from contracts.dispatcher import ImplementationDispatcher
+
+
+class BaseExampleApi:
+    subclasses: ClassVar[Tuple] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        BaseExampleApi.subclasses = BaseExampleApi.subclasses + (cls,)
+
+    async def startup(self) -> None:
+        ...
+
+    async def shutdown(self) -> None:
+        ...
+
+
+class BaseMissingApi:
+    subclasses: ClassVar[Tuple] = ()
+
+
+class ExampleApiImpl(BaseExampleApi):
+    instances = 0
+
+    def __init__(self):
+        ExampleApiImpl.instances += 1
+        self.events = []
+
+    async def startup(self) -> None:
+        self.events.append("startup")
+
+    async def shutdown(self) -> None:
+        self.events.append("shutdown")
+
+    async def ping(self) -> str:
+        return "pong"
+
+
+def test_builds_each_implementation_once():
+    dispatcher = ImplementationDispatcher()
+    ExampleApiImpl.instances = 0
+
+    async def scenario():
+        await dispatcher.startup((BaseExampleApi, BaseMissingApi))
+        first = dispatcher.handler(BaseExampleApi, "ping")
+        assert dispatcher.handler(BaseExampleApi, "ping") is first
+        assert await first() == "pong"
+        assert await dispatcher.handler(BaseExampleApi, "ping")() == "pong"
+        instance = dispatcher.instance(BaseExampleApi)
+        await dispatcher.shutdown()
+        return instance
+
+    instance = asyncio.run(scenario())
+    assert ExampleApiImpl.instances == 1
+    assert instance.events == ["startup", "shutdown"]
+    assert not dispatcher.started
+
+
+class BaseFailingApi:
+    subclasses: ClassVar[Tuple] = ()
+
+
+class FailingApiImpl(BaseFailingApi):
+    async def startup(self) -> None:
+        raise ConnectionError("database unavailable")
+
+    async def shutdown(self) -> None:
+        raise AssertionError("never started")
+
+
+BaseFailingApi.subclasses = (FailingApiImpl,)
+
+
+def test_failed_startup_shuts_down_started_instances(monkeypatch):
+    started = []
+    monkeypatch.setattr(
+        ExampleApiImpl, "startup", lambda self: started.append(self) or asyncio.sleep(0)
+    )
+    dispatcher = ImplementationDispatcher()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(dispatcher.startup((BaseExampleApi, BaseFailingApi)))
+    assert [instance.events for instance in started] == [["shutdown"]]
+    assert not dispatcher.started
+    assert not dispatcher._instances
+
+
+def test_failing_shutdown_hook_does_not_skip_the_others(caplog):
+    class BrokenApi:
+        async def shutdown(self) -> None:
+            raise RuntimeError("already closed")
+
+    dispatcher = ImplementationDispatcher()
+    asyncio.run(dispatcher.startup((BaseExampleApi,)))
+    example = dispatcher.instance(BaseExampleApi)
+    dispatcher._instances[BaseFailingApi] = BrokenApi()
+
+    asyncio.run(dispatcher.shutdown())
+
+    assert example.events == ["startup", "shutdown"]
+    assert "Shutdown of BrokenApi failed" in caplog.text
+
+
+def test_missing_implementation_is_not_implemented():
+    dispatcher = ImplementationDispatcher()
+    asyncio.run(dispatcher.startup((BaseMissingApi,)))
+
+    with pytest.raises(HTTPException) as exc_info:
+        dispatcher.handler(BaseMissingApi, "ping")
+    assert exc_info.value.status_code == 500
+
+
+def test_handler_requires_lifespan():
+    dispatcher = ImplementationDispatcher()
+
+    with pytest.raises(RuntimeError):
+        dispatcher.handler(BaseExampleApi, "ping")
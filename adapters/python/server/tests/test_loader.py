@@ -0,0 +1,166 @@
+# coding: utf-8
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from contracts.apis.users_api_base import BaseUsersApi
+from contracts.loader import BatchLoader, batch_get_users, user_loader
+from contracts.models.error import Error
+from contracts.models.user import User
+from contracts.models.user_batch_response import UserBatchResponse
+from contracts.models.user_batch_result import UserBatchResult
+
+HEADERS = {"Authorization": "Bearer special-key"}
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.batches = []
+
+    async def __call__(self, keys):
+        self.batches.append(keys)
+        return [KeyError(key) if key == "missing" else key.upper() for key in keys]
+
+
+def gather(loader: BatchLoader, keys):
+    async def scenario():
+        return await asyncio.gather(
+            *(loader.load(key) for key in keys), return_exceptions=True
+        )
+
+    return asyncio.run(scenario())
+
+
+def test_keys_of_one_tick_are_loaded_together():
+    recorder = Recorder()
+    loader = BatchLoader(recorder, window=0)
+
+    results = gather(loader, ["a", "b", "a", "missing"])
+
+    assert recorder.batches == [["a", "b", "missing"]]
+    assert results[:3] == ["A", "B", "A"]
+    assert isinstance(results[3], KeyError)
+    assert loader.stats()["loads"] == 4
+    assert loader.stats()["max_batch_size"] == 3
+
+
+def test_window_collects_later_keys_and_max_batch_splits():
+    recorder = Recorder()
+    loader = BatchLoader(recorder, window=0.01, max_batch=2)
+
+    async def scenario():
+        first = asyncio.ensure_future(loader.load("a"))
+        await asyncio.sleep(0)
+        rest = [asyncio.ensure_future(loader.load(key)) for key in "bcd"]
+        return await asyncio.gather(first, *rest)
+
+    assert asyncio.run(scenario()) == ["A", "B", "C", "D"]
+    assert recorder.batches == [["a", "b"], ["c", "d"]]
+    assert loader.stats()["batches"] == 2
+
+
+def test_failed_batch_fails_every_caller():
+    async def broken(keys):
+        return keys[:1]
+
+    results = gather(BatchLoader(broken, window=0), ["a", "b"])
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def make_user(user_id: str) -> User:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return User(
+        id=user_id,
+        email="user@example.com",
+        first_name="John",
+        last_name="Doe",
+        role="BUYER",
+        status="ACTIVE",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class BatchUsersApi:
+    def __init__(self) -> None:
+        self.requests = []
+
+    async def get_user_version(self, userId):
+        return None
+
+    async def get_user_by_id(self, userId):
+        raise AssertionError("get_user_by_id must go through batch_get_users")
+
+    async def batch_get_users(self, user_batch_get_request):
+        self.requests.append(user_batch_get_request.ids)
+        results = []
+        for user_id in user_batch_get_request.ids:
+            if user_id == "gone":
+                error = Error(code="ERR_NOT_FOUND", message="User not found")
+                results.append(UserBatchResult(id=user_id, error=error))
+                continue
+            results.append(UserBatchResult(id=user_id, user=make_user(user_id)))
+        return UserBatchResponse(results=results)
+
+
+@pytest.fixture
+def batching_loader(monkeypatch):
+    monkeypatch.setattr(user_loader, "enabled", True)
+    monkeypatch.setattr(user_loader, "window", 0)
+    return user_loader
+
+
+def test_route_serves_users_through_batch_get_users(users_client, batching_loader):
+    impl = BatchUsersApi()
+    client = users_client(impl)
+
+    response = client.get("/v1/users/user-1", headers=HEADERS)
+    missing = client.get("/v1/users/gone", headers=HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["id"] == "user-1"
+    assert missing.status_code == 404
+    assert impl.requests == [["user-1"], ["gone"]]
+
+
+def test_route_loads_one_by_one_without_batch_get_users(
+    users_client, batching_loader, monkeypatch
+):
+    # Subclassing registers the class; keep it out of other tests
+    monkeypatch.setattr(BaseUsersApi, "subclasses", BaseUsersApi.subclasses)
+
+    class SingleUsersApi(BaseUsersApi):
+        async def get_user_version(self, userId):
+            return None
+
+        async def get_user_by_id(self, userId):
+            return make_user(userId)
+
+    client = users_client(SingleUsersApi())
+    batches = batching_loader.stats()["batches"]
+
+    response = client.get("/v1/users/user-1", headers=HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["id"] == "user-1"
+    assert batching_loader.stats()["batches"] == batches
+
+
+def test_results_are_matched_by_id(users_client):
+    class ShuffledUsersApi(BatchUsersApi):
+        async def batch_get_users(self, user_batch_get_request):
+            response = await super().batch_get_users(user_batch_get_request)
+            results = [item for item in response.results if item.id != "dropped"]
+            return UserBatchResponse(results=results[::-1])
+
+    users_client(ShuffledUsersApi())
+
+    first, gone, dropped, last = asyncio.run(
+        batch_get_users(["user-1", "gone", "dropped", "user-2"])
+    )
+
+    assert (first.id, last.id) == ("user-1", "user-2")
+    assert gone.status_code == dropped.status_code == 404
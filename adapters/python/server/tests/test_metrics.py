@@ -0,0 +1,173 @@
+# coding: utf-8
+
+import asyncio
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+import contracts.metrics
+from contracts.metrics import (
+    Histogram,
+    MeteredRoute,
+    Metrics,
+    MetricsMiddleware,
+    metrics_endpoint,
+    operation_id,
+    timed,
+    timed_impl,
+)
+from contracts.settings import settings
+
+
+class Item(BaseModel):
+    id: str
+
+
+async def authenticate() -> None:
+    with timed("auth"):
+        await asyncio.sleep(0.01)
+
+
+@timed_impl
+async def load_item(item_id: str) -> Item:
+    await asyncio.sleep(0.02)
+    return Item(id=item_id)
+
+
+@pytest.fixture
+def recorded() -> Metrics:
+    return Metrics(enabled=True)
+
+
+@pytest.fixture
+def client(monkeypatch, recorded) -> TestClient:
+    monkeypatch.setattr(contracts.metrics, "metrics", recorded)
+    router = APIRouter(route_class=MeteredRoute)
+
+    @router.get("/items/{item_id}")
+    async def get_item_by_id(item_id: str, auth: None = Depends(authenticate)) -> Item:
+        if item_id == "missing":
+            raise HTTPException(status_code=404, detail="Not found")
+        return await load_item(item_id)
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(MetricsMiddleware, metrics=recorded)
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+    return TestClient(app)
+
+
+def test_operation_ids_match_the_spec():
+    assert operation_id("get_user_by_id") == "getUserById"
+    assert operation_id("batch_get_users") == "batchGetUsers"
+
+
+def test_histogram_buckets_are_inclusive_and_cumulative():
+    histogram = Histogram((1, 5))
+    for value in (0.5, 1, 3, 9):
+        histogram.observe(value)
+    lines = []
+    histogram.expose("size", 'op="x"', lines)
+
+    assert lines == [
+        'size_bucket{op="x",le="1"} 2',
+        'size_bucket{op="x",le="5"} 3',
+        'size_bucket{op="x",le="+Inf"} 4',
+        'size_sum{op="x"} 13.5',
+        'size_count{op="x"} 4',
+    ]
+
+
+def test_requests_are_split_into_phases(client, recorded):
+    response = client.get("/items/item-1")
+
+    assert response.status_code == 200
+    operation = recorded.operations["getItemById"]
+    assert operation.statuses == {200: 1}
+    assert operation.in_flight == 0
+    assert operation.size.sum == len(response.content)
+    phases = {phase: histogram.sum for phase, histogram in operation.phases.items()}
+    assert phases["auth"] >= 0.01
+    assert phases["impl"] >= 0.02
+    assert phases["validation"] >= 0
+    assert phases["serialization"] >= 0
+    assert sum(phases.values()) <= operation.duration.sum
+
+
+def test_failed_requests_are_counted_by_status(client, recorded):
+    client.get("/items/missing")
+    client.get("/unknown")
+
+    assert list(recorded.operations) == ["getItemById"]
+    operation = recorded.operations["getItemById"]
+    assert operation.statuses == {404: 1}
+    assert operation.phases["impl"].count == 1
+    assert operation.phases["impl"].sum == 0
+
+
+def families(text: str):
+    """Names of the metric families declared in an exposition"""
+    return [line.split()[2] for line in text.splitlines() if line.startswith("# TYPE")]
+
+
+def test_metrics_are_exposed_in_text_format(client, recorded):
+    recorded.register("items", lambda: {"hits": 3, "ratio": 0.5}, gauges=["ratio"])
+    recorded.register(
+        "per_operation",
+        lambda: {"getItemById": {"calls": 2}, "listItems": {"calls": 1}},
+        label="operation",
+    )
+    client.get("/items/item-1")
+
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"] == contracts.metrics.CONTENT_TYPE
+    text = response.text
+    assert "# TYPE contracts_request_duration_seconds histogram" in text
+    assert 'contracts_request_duration_seconds_count{operation="getItemById"} 1' in text
+    assert (
+        'contracts_request_phase_seconds_count{operation="getItemById",phase="impl"} 1'
+        in text
+    )
+    assert 'contracts_requests_total{operation="getItemById",status="200"} 1' in text
+    assert 'contracts_requests_in_flight{operation="getItemById"} 0' in text
+    assert "# TYPE contracts_items_hits counter\ncontracts_items_hits 3\n" in text
+    assert "# TYPE contracts_items_ratio gauge\ncontracts_items_ratio 0.5\n" in text
+    assert (
+        "# HELP contracts_per_operation_calls Per operation calls\n"
+        "# TYPE contracts_per_operation_calls counter\n"
+        'contracts_per_operation_calls{operation="getItemById"} 2\n'
+        'contracts_per_operation_calls{operation="listItems"} 1\n'
+    ) in text
+    declared = tuple(families(text))
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            assert line.split("{")[0].split(" ")[0].startswith(declared), line
+
+
+def test_metrics_token_is_required_when_set(client, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", "scraper-secret")
+
+    assert client.get("/metrics").status_code == 401
+    wrong = client.get("/metrics", headers={"Authorization": "Bearer other"})
+    assert wrong.status_code == 401
+    right = client.get("/metrics", headers={"Authorization": "Bearer scraper-secret"})
+    assert right.status_code == 200
+
+
+def test_routes_are_not_metered_when_disabled(monkeypatch, recorded):
+    monkeypatch.setattr(contracts.metrics, "metrics", Metrics(enabled=False))
+    router = APIRouter(route_class=MeteredRoute)
+
+    @router.get("/health")
+    async def get_health_status() -> Item:
+        return Item(id="ok")
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(MetricsMiddleware, metrics=recorded)
+
+    assert TestClient(app).get("/health").status_code == 200
+    assert recorded.operations == {}
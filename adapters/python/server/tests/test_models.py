@@ -0,0 +1,79 @@
+# coding: utf-8
+
+import os
+import subprocess
+import sys
+
+import pytest
+from pydantic import ValidationError
+
+import contracts.apis
+import contracts.models
+
+from contracts.models.user_create_request import UserCreateRequest
+from contracts.models.user_update_request import UserUpdateRequest
+
+
+def test_name_length_is_enforced():
+    payload = {
+        "email": "user@example.com",
+        "firstName": "J" * 50,
+        "lastName": "Doe",
+        "password": "SecurePassword123!",
+        "role": "BUYER",
+        "status": "ACTIVE",
+    }
+    assert UserCreateRequest.from_dict(payload).first_name == "J" * 50
+
+    payload["firstName"] = "J" * 51
+    with pytest.raises(ValidationError):
+        UserCreateRequest.from_dict(payload)
+
+
+def test_optional_name_accepts_none():
+    assert UserUpdateRequest.model_validate({"firstName": None}).first_name is None
+
+
+def test_models_are_exported_lazily():
+    probe = (
+        "import sys, contracts.models as models; models.Error; "
+        "print(' '.join(sorted("
+        "m for m in sys.modules if m.startswith('contracts.models.')"
+        ")))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", probe],
+        check=True,
+        capture_output=True,
+        env=os.environ,
+        text=True,
+    ).stdout
+
+    assert "contracts.models.error" in output.split()
+    assert "contracts.models.user" not in output.split()
+    assert contracts.models.UserCreateRequest is UserCreateRequest
+    assert "UserBatchResponse" in dir(contracts.models)
+    with pytest.raises(AttributeError):
+        contracts.models.Missing
+
+
+def test_models_defer_building_their_validators():
+    assert UserCreateRequest.model_config["defer_build"] is True
+    assert (
+        UserCreateRequest.from_dict(
+            {
+                "email": "user@example.com",
+                "firstName": "J",
+                "lastName": "D",
+                "password": "SecurePassword123!",
+            }
+        ).first_name
+        == "J"
+    )
+
+
+def test_apis_are_exported_lazily():
+    from contracts.apis.users_api_base import BaseUsersApi
+
+    assert contracts.apis.BaseUsersApi is BaseUsersApi
+    assert contracts.apis.UsersApiRouter.routes
@@ -0,0 +1,117 @@
+# coding: utf-8
+
+from datetime import datetime, timezone
+
+import msgpack
+import pytest
+
+from contracts.models.user import User
+from contracts.negotiation import preferred_media_type
+from contracts.responses import JSON, MSGPACK
+
+HEADERS = {"Authorization": "Bearer special-key"}
+ACCEPT_MSGPACK = {**HEADERS, "Accept": "application/msgpack"}
+
+
+def make_user(user_id: str = "user-1", **kwargs) -> User:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return User(
+        id=user_id,
+        email="user1@example.com",
+        first_name="John",
+        last_name="Doe",
+        role="BUYER",
+        status="ACTIVE",
+        created_at=now,
+        updated_at=now,
+        **kwargs
+    )
+
+
+class UsersApi:
+    def __init__(self, version=None) -> None:
+        self.version = version
+        self.created = None
+
+    async def get_user_version(self, userId):
+        return self.version
+
+    async def get_user_by_id(self, userId):
+        return make_user(userId, last_login_at=None)
+
+    async def create_user(self, user_create_request):
+        self.created = user_create_request
+        return make_user()
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, JSON),
+        ("application/json", JSON),
+        ("application/msgpack", MSGPACK),
+        ("application/x-msgpack, application/json;q=0.5", MSGPACK),
+        ("application/json, application/msgpack;q=0.9", JSON),
+        ("*/*, application/msgpack", JSON),
+        ("application/msgpack;q=0", JSON),
+    ],
+)
+def test_preferred_media_type(accept, expected):
+    assert preferred_media_type(accept) == expected
+
+
+def test_user_is_sent_as_msgpack_with_to_dict_semantics(users_client):
+    client = users_client(UsersApi())
+
+    packed = client.get("/v1/users/user-1", headers=ACCEPT_MSGPACK)
+    plain = client.get("/v1/users/user-1", headers=HEADERS)
+
+    assert packed.headers["content-type"] == MSGPACK
+    assert "Accept" in packed.headers["vary"]
+    assert msgpack.unpackb(packed.content) == plain.json()
+    assert msgpack.unpackb(packed.content)["lastLoginAt"] is None
+    assert packed.headers["etag"] != plain.headers["etag"]
+
+
+def test_version_etag_depends_on_media_type(users_client):
+    client = users_client(UsersApi(version="7"))
+
+    packed = client.get("/v1/users/user-1", headers=ACCEPT_MSGPACK)
+    revalidated = client.get(
+        "/v1/users/user-1",
+        headers={**ACCEPT_MSGPACK, "If-None-Match": packed.headers["etag"]},
+    )
+    plain = client.get(
+        "/v1/users/user-1", headers={**HEADERS, "If-None-Match": packed.headers["etag"]}
+    )
+
+    assert packed.headers["etag"] == '"7+msgpack"'
+    assert revalidated.status_code == 304
+    assert plain.status_code == 200
+
+
+def test_msgpack_request_body_is_validated_like_json(users_client):
+    impl = UsersApi()
+    client = users_client(impl)
+    body = {
+        "email": "user@example.com",
+        "firstName": "John",
+        "lastName": "Doe",
+        "password": "SecurePassword123!",
+    }
+
+    response = client.post(
+        "/v1/users",
+        headers={**ACCEPT_MSGPACK, "Content-Type": MSGPACK},
+        content=msgpack.packb(body),
+    )
+    invalid = client.post(
+        "/v1/users",
+        headers={**HEADERS, "Content-Type": MSGPACK},
+        content=msgpack.packb({"email": "user@example.com"}),
+    )
+
+    assert response.status_code == 200
+    assert msgpack.unpackb(response.content)["id"] == "user-1"
+    assert impl.created.first_name == "John"
+    assert invalid.status_code == 422
@@ -0,0 +1,49 @@
+# coding: utf-8
+
+from datetime import datetime, timezone
+
+import pytest
+
+from contracts.models.user import User
+from contracts.models.user_sort_field import UserSortField
+from contracts.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+)
+
+
+def make_user(index: int) -> User:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return User(
+        id="user-%d" % index,
+        email="user%d@example.com" % index,
+        first_name="Jöhn",
+        last_name="Doe %d" % index,
+        role="BUYER",
+        status="ACTIVE",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(["jöhn doe"], "user-1")
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (["jöhn doe"], "user-1")
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "e30", "x" * 2048])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_next_cursor_points_at_last_row_of_page():
+    rows = [make_user(i) for i in range(3)]
+    sort_by = [UserSortField.FULL_NAME]
+
+    assert next_cursor(rows, 3, sort_by) is None
+    assert decode_cursor(next_cursor(rows, 2, sort_by)) == (["jöhn doe 1"], "user-1")
@@ -0,0 +1,160 @@
+# coding: utf-8
+
+import json
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from contracts.models.order import Order
+from contracts.models.user_status import UserStatus
+from contracts.models.users_request_payload import UsersRequestPayload
+from contracts.query import QueryDecoder, json_depth, users_request_payload
+
+PAYLOAD = {
+    "limit": 10,
+    "offset": 20,
+    "filter": {"text": "john", "statuses": ["ACTIVE", "FROZEN"]},
+    "sortBy": ["FULL_NAME"],
+    "orderBy": ["DESC"],
+}
+
+
+@pytest.fixture
+def decoder() -> QueryDecoder:
+    return QueryDecoder(
+        UsersRequestPayload,
+        "UsersRequestPayload",
+        max_length=512,
+        max_depth=4,
+        cache_size=2,
+    )
+
+
+@pytest.fixture
+def client(monkeypatch, decoder) -> TestClient:
+    monkeypatch.setattr("contracts.query.users_request_payloads", decoder)
+    app = FastAPI()
+
+    @app.get("/v1/users")
+    async def get_user_list(
+        payload: UsersRequestPayload = Depends(users_request_payload),
+    ):
+        return payload.to_dict()
+
+    return TestClient(app)
+
+
+def test_json_depth():
+    assert json_depth('{"a":[1,{"b":"[{[{"}]}') == 3
+    assert json_depth('{"a":"\\"{"}') == 1
+    assert json_depth("12") == 0
+
+
+def test_json_in_query(client, decoder):
+    response = client.get(
+        "/v1/users", params={"UsersRequestPayload": json.dumps(PAYLOAD)}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == PAYLOAD
+
+
+def test_payload_is_required(client):
+    response = client.get("/v1/users")
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "UsersRequestPayload is required"}
+
+
+def test_deep_object(client):
+    params = [
+        ("UsersRequestPayload[limit]", "10"),
+        ("UsersRequestPayload[offset]", "20"),
+        ("UsersRequestPayload[filter][text]", "john"),
+        ("UsersRequestPayload[filter][statuses][]", "ACTIVE"),
+        ("UsersRequestPayload[filter][statuses][]", "FROZEN"),
+        ("UsersRequestPayload[sortBy]", "FULL_NAME"),
+        ("UsersRequestPayload[orderBy]", "DESC"),
+        ("other", "ignored"),
+    ]
+
+    response = client.get("/v1/users", params=params)
+
+    assert response.status_code == 200
+    assert response.json() == PAYLOAD
+
+
+def test_deep_object_keeps_strings_that_look_like_numbers(decoder):
+    payload = decoder.decode_deep_object(
+        [
+            ("UsersRequestPayload[limit]", "5"),
+            ("UsersRequestPayload[offset]", "0"),
+            ("UsersRequestPayload[filter][text]", "42"),
+        ]
+    )
+
+    assert payload.limit == 5
+    assert payload.filter.text == "42"
+
+
+def test_validation_errors_point_into_the_payload(client):
+    response = client.get(
+        "/v1/users", params={"UsersRequestPayload": '{"limit":0,"offset":"0"}'}
+    )
+
+    assert response.status_code == 422
+    locations = [error["loc"] for error in response.json()["detail"]]
+    assert locations == [
+        ["query", "UsersRequestPayload", "limit"],
+        ["query", "UsersRequestPayload", "offset"],
+    ]
+    response = client.get(
+        "/v1/users",
+        params={
+            "UsersRequestPayload[limit]": "many",
+            "UsersRequestPayload[offset]": "0",
+        },
+    )
+    location = response.json()["detail"][0]["loc"]
+    assert location == ["query", "UsersRequestPayload", "limit"]
+    assert (
+        client.get("/v1/users", params={"UsersRequestPayload": "{"}).status_code == 422
+    )
+
+
+def test_limits_are_enforced_before_parsing(client, decoder):
+    too_long = json.dumps({"limit": 1, "offset": 0, "cursor": "x" * 512})
+    too_deep = '{"filter":{"statuses":[[[["ACTIVE"]]]]}}'
+    malformed = "UsersRequestPayload[filter]]"
+
+    for params in (
+        {"UsersRequestPayload": too_long},
+        {"UsersRequestPayload": too_deep},
+        {malformed: "1"},
+    ):
+        response = client.get("/v1/users", params=params)
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["query", "UsersRequestPayload"]
+    assert decoder.stats()["size"] == 0
+
+
+def test_validated_payloads_are_cached(decoder):
+    raw = json.dumps(PAYLOAD)
+    pairs = [("UsersRequestPayload[offset]", "0"), ("UsersRequestPayload[limit]", "1")]
+
+    first = decoder.decode_json(raw)
+    assert decoder.decode_json(raw) is first
+    assert decoder.decode_deep_object(pairs) is decoder.decode_deep_object(pairs[::-1])
+    assert first.filter.statuses == [UserStatus.ACTIVE, UserStatus.FROZEN]
+    assert first.order_by == [Order.DESC]
+    assert decoder.stats() == {"hits": 2, "misses": 2, "size": 2}
+    decoder.decode_json(json.dumps({"limit": 2, "offset": 0}))
+    assert decoder.decode_json(raw) is not first
+
+
+def test_parameter_is_documented(client):
+    [parameter] = client.app.openapi()["paths"]["/v1/users"]["get"]["parameters"]
+
+    assert parameter["name"] == "UsersRequestPayload"
+    assert parameter["in"] == "query"
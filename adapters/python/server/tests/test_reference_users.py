@@ -0,0 +1,247 @@
+# coding: utf-8
+
+import asyncio
+import json
+import random
+
+import pytest
+
+from contracts.impl.reference.users import (
+    Bitmap,
+    InMemoryUsersApi,
+    SortedList,
+    TextIndex,
+    ngrams,
+)
+from contracts.models.user_create_request import UserCreateRequest
+from contracts.models.user_update_request import UserUpdateRequest
+
+HEADERS = {"Authorization": "Bearer special-key"}
+
+PEOPLE = [
+    ("John", "Smith", "ACTIVE", "BUYER"),
+    ("Jane", "Johnson", "FROZEN", "BUYER"),
+    ("Johan", "Ohnson", "ACTIVE", "ADMIN"),
+    ("Al", "Jo", "PENDING", "TEAM_LEAD"),
+]
+
+
+@pytest.fixture
+def store() -> InMemoryUsersApi:
+    store = InMemoryUsersApi()
+    for first, last, status, role in PEOPLE:
+        request = UserCreateRequest(
+            email="%s.%s@example.com" % (first.lower(), last.lower()),
+            first_name=first,
+            last_name=last,
+            password="password1",
+            status=status,
+            role=role,
+        )
+        asyncio.run(store.create_user(request))
+    return store
+
+
+def search(client, **payload):
+    payload = dict({"limit": 20, "offset": 0}, **payload)
+    response = client.get(
+        "/v1/users",
+        headers=HEADERS,
+        params={"UsersRequestPayload": json.dumps(payload)},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    return [user["firstName"] for user in body["data"]], body["meta"]
+
+
+def test_ngrams():
+    assert ngrams("johan") == {"joha", "ohan"}
+    assert ngrams("ohn", 3) == {"ohn"}
+    assert ngrams("al") == {"al"}
+    assert ngrams("") == set()
+
+
+def test_bitmap():
+    bitmap = Bitmap()
+    for slot in (3, 17, 17, 1000):
+        bitmap.add(slot)
+    bitmap.discard(17)
+    bitmap.discard(5000)
+
+    assert len(bitmap) == 2
+    assert 3 in bitmap and 1000 in bitmap
+    assert 17 not in bitmap and 5000 not in bitmap
+    assert bitmap.to_int() == (1 << 3) | (1 << 1000)
+
+
+def test_sorted_list():
+    items = SortedList(load=4)
+    values = list(range(0, 100, 2))
+    random.Random(0).shuffle(values)
+    for value in values:
+        items.add(value)
+    items.remove(40)
+    with pytest.raises(ValueError):
+        items.remove(41)
+
+    expected = [value for value in range(0, 100, 2) if value != 40]
+    assert list(items) == expected and len(items) == len(expected)
+    assert max(map(len, items.blocks)) <= 8
+    assert (
+        items.index(41) == 20
+        and items.index(-1) == 0
+        and items.index(100) == len(expected)
+    )
+    assert list(items.iterate(18))[:3] == [36, 38, 42]
+    assert list(items.iterate(1, reverse=True))[:3] == [96, 94, 92]
+    assert list(items.iterate(len(expected))) == []
+
+
+def test_text_index_matches_substrings_only():
+    index = TextIndex()
+    index.add(0, ("john.smith@example.com", "John", "Smith"))
+    index.add(1, ("johan@example.com", "Johan", "Ohnson"))
+    index.add(2, ("al@example.com", "Al", "Jo"))
+
+    assert index.search("JOHN") == [0]
+    assert index.search("ohn") == [0, 1]
+    assert index.search("jo") == [0, 1, 2]
+    assert index.search("example.com") == [0, 1, 2]
+    assert index.search("smithjohan") == []
+    index.update(0, ("john.smith@example.com", "Jon", "Smith"))
+    assert index.search("john") == [0]
+    index.update(0, ("jon@example.com", "Jon", "Smith"))
+    assert index.search("john") == []
+    index.remove(1)
+    assert index.search("ohn") == []
+    assert "ohan" not in index.postings
+    assert "han" not in index.containing
+
+
+def test_text_search_with_filters(users_client, store):
+    client = users_client(store)
+
+    assert search(client, filter={"text": "JOHN"}) == (
+        ["John", "Jane"],
+        {"limit": 20, "offset": 0, "total": 2},
+    )
+    names, _ = search(client, filter={"text": "ohnson", "statuses": ["ACTIVE"]})
+    assert names == ["Johan"]
+    names, _ = search(client, filter={"text": "jo", "roles": ["ADMIN", "TEAM_LEAD"]})
+    assert names == ["Johan", "Al"]
+    assert search(
+        client,
+        filter={"statuses": ["ACTIVE", "PENDING"], "roles": ["BUYER", "TEAM_LEAD"]},
+    ) == (
+        ["John", "Al"],
+        {"limit": 20, "offset": 0, "total": 2},
+    )
+    assert search(client, filter={"text": "nobody"}) == (
+        [],
+        {"limit": 20, "offset": 0, "total": 0},
+    )
+
+
+def test_indexes_follow_writes(users_client, store):
+    client = users_client(store)
+    johan = store.users[2]
+
+    asyncio.run(
+        store.update_user_by_id(
+            johan.id, UserUpdateRequest(first_name="Zed", status="FROZEN")
+        )
+    )
+    assert search(client, filter={"text": "zed", "statuses": ["FROZEN"]})[0] == ["Zed"]
+    assert search(client, filter={"text": "johan", "statuses": ["ACTIVE"]})[0] == []
+    client.delete("/v1/users/%s" % johan.id, headers=HEADERS)
+    assert search(client, filter={"statuses": ["FROZEN"]})[0] == ["Jane"]
+    assert client.get("/v1/users/%s" % johan.id, headers=HEADERS).status_code == 404
+
+
+def test_pages_and_cursors(users_client, store):
+    client = users_client(store)
+
+    names, meta = search(client, limit=2)
+    assert names == ["John", "Jane"]
+    assert meta["total"] == 4
+    assert search(client, limit=2, cursor=meta["nextCursor"])[0] == ["Johan", "Al"]
+    names, meta = search(client, limit=3, sortBy=["FULL_NAME"], orderBy=["DESC"])
+    assert names == ["John", "Johan", "Jane"]
+    assert search(
+        client,
+        limit=3,
+        sortBy=["FULL_NAME"],
+        orderBy=["DESC"],
+        cursor=meta["nextCursor"],
+    )[0] == ["Al"]
+    assert search(client, offset=3, sortBy=["FULL_NAME"])[0] == ["John"]
+
+
+def test_name_offsets_match_the_full_listing(users_client, store):
+    client = users_client(store)
+
+    for order in ("ASC", "DESC"):
+        for filter in ({}, {"statuses": ["ACTIVE", "PENDING"]}, {"text": "jo"}):
+            query = {"sortBy": ["FULL_NAME"], "orderBy": [order], "filter": filter}
+            names = search(client, **query)[0]
+            for offset in range(len(names) + 2):
+                page = search(client, offset=offset, limit=2, **query)[0]
+                assert page == names[offset:offset + 2]
+
+
+def test_writes_report_conflicts(users_client, store):
+    client = users_client(store)
+    body = {
+        "email": "JOHN.smith@example.com",
+        "firstName": "J",
+        "lastName": "S",
+        "password": "password1",
+    }
+
+    assert client.post("/v1/users", headers=HEADERS, json=body).status_code == 409
+    results = client.post(
+        "/v1/users:batchCreate",
+        headers=HEADERS,
+        json={"items": [body, dict(body, email="new@example.com")]},
+    ).json()["results"]
+    assert results[0]["error"]["code"] == "ERR_ALREADY_EXISTS"
+    assert results[1]["user"]["status"] == "ACTIVE"
+    assert search(client, filter={"text": "new@"})[1]["total"] == 1
+
+
+def test_name_index_follows_writes(users_client, store):
+    client = users_client(store)
+    john = store.users[0]
+
+    names, meta = search(
+        client,
+        limit=2,
+        sortBy=["FULL_NAME"],
+        filter={"statuses": ["ACTIVE", "PENDING"]},
+    )
+    assert names == ["Al", "Johan"] and meta["total"] == 3
+    asyncio.run(store.update_user_by_id(john.id, UserUpdateRequest(first_name="Aaron")))
+    assert search(client, sortBy=["FULL_NAME"], cursor=meta["nextCursor"])[0] == []
+    assert search(
+        client, sortBy=["FULL_NAME"], orderBy=["DESC"], cursor=meta["nextCursor"]
+    )[0] == ["Jane", "Al", "Aaron"]
+    assert search(client, sortBy=["FULL_NAME"])[0] == ["Aaron", "Al", "Jane", "Johan"]
+    client.delete("/v1/users/%s" % store.users[1].id, headers=HEADERS)
+    assert search(
+        client, sortBy=["FULL_NAME"], orderBy=["DESC"], filter={"text": "on"}
+    )[0] == ["Johan", "Aaron"]
+    names = [key for key, _, _ in store.by_name]
+    assert names == ["aaron smith", "al jo", "johan ohnson"]
+    _, meta = search(client, limit=1)
+    payload = {
+        "limit": 1,
+        "offset": 0,
+        "sortBy": ["FULL_NAME"],
+        "cursor": meta["nextCursor"],
+    }
+    response = client.get(
+        "/v1/users",
+        headers=HEADERS,
+        params={"UsersRequestPayload": json.dumps(payload)},
+    )
+    assert response.status_code == 400
@@ -0,0 +1,82 @@
+# coding: utf-8
+
+import pkgutil
+import sys
+
+import pytest
+
+from contracts import registry as registry_module
+from contracts.registry import ImplementationRegistry
+
+
+class FakeEntryPoint:
+    def __init__(self, name: str, value: str) -> None:
+        self.name = name
+        self.value = value
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+
+
+@pytest.fixture
+def impl_package(tmp_path, monkeypatch):
+    package = tmp_path / "sample_impl"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "first.py").write_text("IMPORTS = []\n")
+    (package / "second.py").write_text(
+        "import sample_impl.first\nsample_impl.first.IMPORTS.append('second')\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "sample_impl"
+    for name in [name for name in sys.modules if name.startswith("sample_impl")]:
+        del sys.modules[name]
+
+
+def test_scans_package_once_and_imports_lazily(impl_package, monkeypatch):
+    scans = []
+    iter_modules = pkgutil.iter_modules
+    monkeypatch.setattr(
+        pkgutil, "iter_modules", lambda *args: scans.append(args) or iter_modules(*args)
+    )
+    registry = ImplementationRegistry(package=impl_package)
+    monkeypatch.setattr(registry, "entry_points", lambda: [])
+
+    assert "sample_impl.second" not in sys.modules
+    registry.load()
+    registry.load()
+
+    assert len(scans) == 1
+    assert registry.modules() == ["sample_impl.first", "sample_impl.second"]
+    assert sys.modules["sample_impl.first"].IMPORTS == ["second"]
+
+
+def test_explicit_modules_replace_the_scan(impl_package, monkeypatch):
+    registry = ImplementationRegistry(
+        package="does.not.exist", modules=["sample_impl.first"]
+    )
+    monkeypatch.setattr(registry, "entry_points", lambda: [])
+
+    registry.load()
+
+    assert "sample_impl.first" in sys.modules
+    assert "sample_impl.second" not in sys.modules
+
+
+def test_entry_points_named_after_a_base_load_with_it(monkeypatch):
+    class BaseUsersApi:
+        pass
+
+    users = FakeEntryPoint("BaseUsersApi", "vendor.users")
+    health = FakeEntryPoint("BaseHealthApi", "vendor.health")
+    plugin = FakeEntryPoint("metrics", "vendor.metrics")
+    monkeypatch.setattr(
+        registry_module, "_entry_points", lambda group: [users, health, plugin]
+    )
+    registry = ImplementationRegistry(modules=["contracts.settings"])
+
+    registry.load((BaseUsersApi,))
+    registry.load((BaseUsersApi,))
+
+    assert (users.loads, health.loads, plugin.loads) == (1, 0, 1)
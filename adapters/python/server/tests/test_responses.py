@@ -0,0 +1,72 @@
+# coding: utf-8
+
+import json
+from datetime import datetime, timezone
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from contracts.models.get_user_list200_response import GetUserList200Response
+from contracts.models.pagination_meta import PaginationMeta
+from contracts.models.user import User
+from contracts.responses import render, trusted_response
+from contracts.settings import settings
+
+
+def make_user(index: int, **kwargs) -> User:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return User(
+        id="user-%d" % index,
+        email="user%d@example.com" % index,
+        first_name="John",
+        last_name="Doe",
+        role="BUYER",
+        status="ACTIVE",
+        created_at=now,
+        updated_at=now,
+        **kwargs
+    )
+
+
+def test_render_follows_to_dict_rules():
+    page = GetUserList200Response(
+        data=[
+            make_user(0),
+            make_user(1, last_login_at=None),
+            make_user(2, avatar_url="a"),
+        ],
+        meta=PaginationMeta(limit=10, offset=0, total=3),
+    )
+
+    assert json.loads(render(page)) == json.loads(page.to_json())
+    items = json.loads(render(page))["data"]
+    assert "lastLoginAt" not in items[0]
+    assert items[1]["lastLoginAt"] is None
+    assert items[2]["avatarUrl"] == "a"
+
+
+def test_trusted_route_returns_rendered_model(monkeypatch):
+    monkeypatch.setattr(settings, "verify_responses", False)
+    app = FastAPI()
+    user = make_user(1, avatar_url=None)
+
+    @app.get("/user")
+    @trusted_response
+    async def get_user() -> User:
+        return user
+
+    response = TestClient(app).get("/user")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == json.loads(user.to_json())
+    assert "/user" in app.openapi()["paths"]
+
+
+def test_verify_responses_keeps_route_untouched(monkeypatch):
+    monkeypatch.setattr(settings, "verify_responses", True)
+
+    async def get_user() -> User:
+        ...
+
+    assert trusted_response(get_user) is get_user
@@ -0,0 +1,38 @@
+# coding: utf-8
+
+from datetime import datetime, timezone
+
+from contracts.models.user import User
+from contracts.settings import Settings
+
+
+def make_user(**kwargs) -> User:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    fields = dict(
+        id="user-1",
+        email="user@example.com",
+        first_name="John",
+        last_name="Doe",
+        role="BUYER",
+        status="ACTIVE",
+        created_at=now,
+        updated_at=now,
+    )
+    fields.update(kwargs)
+    return User(**fields)
+
+
+def test_to_json_round_trip():
+    user = make_user(avatar_url=None)
+
+    document = user.to_json()
+
+    assert '"avatarUrl": null' in document or '"avatarUrl":null' in document
+    assert "lastLoginAt" not in document
+    assert User.from_json(document) == user
+
+
+def test_fast_json_is_opt_in():
+    assert Settings.from_env({}).fast_json is False
+    assert Settings.from_env({"CONTRACTS_FAST_JSON": "1"}).fast_json is True
+    assert Settings.from_env({"CONTRACTS_FAST_JSON": "off"}).fast_json is False
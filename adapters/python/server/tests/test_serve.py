@@ -0,0 +1,115 @@
+# coding: utf-8
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+
+from contracts.registry import ImplementationRegistry
+from contracts.serve import Supervisor, default_workers, main
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(
+    url: str, server: subprocess.Popen, timeout: float = 30.0
+) -> httpx.Response:
+    deadline = time.monotonic() + timeout
+    while True:
+        assert server.poll() is None, "server exited early"
+        try:
+            return httpx.get(url)
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def test_default_workers_is_the_usable_cpu_count():
+    assert 1 <= default_workers() <= (os.cpu_count() or 1)
+
+
+def test_unknown_app_is_reported():
+    with pytest.raises(SystemExit):
+        main(["--app", "contracts.main:missing", "--port", str(free_port())])
+
+
+def test_implementations_are_imported_before_the_fork(tmp_path, monkeypatch):
+    (tmp_path / "preloaded_impl.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    registry = ImplementationRegistry(modules=["preloaded_impl"])
+    monkeypatch.setattr("contracts.registry.registry", registry)
+    monkeypatch.setattr(signal, "signal", lambda signum, handler: None)
+    events = []
+
+    def record(event):
+        events.append((event, "preloaded_impl" in sys.modules))
+
+    def spawn(supervisor):
+        record("fork")
+        supervisor.stopping = True
+
+    monkeypatch.setattr("gc.freeze", lambda: record("freeze"))
+    monkeypatch.setattr(Supervisor, "_spawn", spawn)
+
+    assert Supervisor(app=None, sock=None, workers=1).run() == 0
+    assert events == [("freeze", True), ("fork", True)]
+
+
+def test_models_are_built_before_the_fork():
+    probe = (
+        "import contracts.models as models, contracts.serve as serve; "
+        "serve.preload(); "
+        "print(' '.join(name for name in models.__all__ "
+        "if getattr(getattr(models, name), '__pydantic_complete__', True) "
+        "is not True))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", probe],
+        check=True,
+        capture_output=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+        text=True,
+    ).stdout
+
+    assert output.split() == []
+
+
+def test_workers_serve_and_stop_gracefully():
+    port = free_port()
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "contracts.serve",
+            "--port",
+            str(port),
+            "--workers",
+            "2",
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+    try:
+        response = wait_until_ready("http://127.0.0.1:%d/docs" % port, server)
+        assert response.status_code == 200
+
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=30) == 0
+    finally:
+        if server.poll() is None:
+            server.kill()
+            server.wait()
@@ -0,0 +1,81 @@
+# coding: utf-8
+
+import asyncio
+import json
+from datetime import datetime, timezone
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from contracts.models.get_user_list200_response import GetUserList200Response
+from contracts.models.pagination_meta import PaginationMeta
+from contracts.models.user import User
+from contracts.streaming import ListStream
+
+
+def make_users(count: int):
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        User(
+            id="user-%d" % i,
+            email="user%d@example.com" % i,
+            first_name="John",
+            last_name="Doe",
+            role="BUYER",
+            status="ACTIVE",
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+async def produce(users):
+    for user in users:
+        yield user
+
+
+async def collect(stream: ListStream):
+    return [chunk async for chunk in stream.iter_bytes()]
+
+
+def test_stream_matches_materialized_response():
+    users = make_users(50)
+    meta = PaginationMeta(limit=50, offset=0, total=50)
+
+    chunks = asyncio.run(collect(ListStream(produce(users), meta, chunk_size=1024)))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) < 1024 + 512 for chunk in chunks)
+    expected = GetUserList200Response(data=users, meta=meta)
+    assert json.loads(b"".join(chunks)) == json.loads(expected.to_json())
+
+
+def test_meta_is_evaluated_after_items():
+    seen = []
+
+    async def tracked():
+        for user in make_users(2):
+            seen.append(user.id)
+            yield user
+
+    stream = ListStream(
+        tracked(), lambda: PaginationMeta(limit=2, offset=0, total=len(seen))
+    )
+
+    document = json.loads(b"".join(asyncio.run(collect(stream))))
+
+    assert document["meta"]["total"] == 2
+
+
+def test_empty_stream_through_route():
+    app = FastAPI()
+
+    @app.get("/users")
+    async def get_users() -> GetUserList200Response:
+        return ListStream(produce([])).response()
+
+    response = TestClient(app).get("/users")
+
+    assert response.status_code == 200
+    assert response.json() == {"data": []}
@@ -0,0 +1,236 @@
+# coding: utf-8
+
+import base64
+import hashlib
+import hmac
+import inspect
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from contracts import security_api
+from contracts.settings import settings
+from contracts.tokens import (
+    InvalidTokenError,
+    TokenVerifier,
+    VerificationKey,
+    load_keys,
+)
+
+SECRET = b"top-secret"
+NOW = 1700000000
+BASE64URL = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+P256_ORDER = 0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551
+
+
+def _segment(data: dict) -> str:
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def make_token(claims: dict, secret: bytes = SECRET, header: dict = None) -> str:
+    signing_input = "%s.%s" % (
+        _segment(header or {"alg": "HS256", "typ": "JWT"}),
+        _segment(claims),
+    )
+    signature = hmac.new(secret, signing_input.encode("ascii"), hashlib.sha256).digest()
+    return "%s.%s" % (
+        signing_input,
+        base64.urlsafe_b64encode(signature).rstrip(b"=").decode("ascii"),
+    )
+
+
+class Clock:
+    def __init__(self, now: float = NOW) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def verifier(clock):
+    return TokenVerifier([VerificationKey.from_secret(SECRET)], clock=clock)
+
+
+def test_verify_caches_claims_until_exp(verifier, clock):
+    token = make_token({"sub": "user-1", "exp": NOW + 60})
+
+    assert verifier.verify(token).sub == "user-1"
+    assert verifier.verify(token).sub == "user-1"
+    assert verifier.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    clock.now = NOW + 60
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(token)
+    assert verifier.stats()["size"] == 0
+
+
+def test_verify_rejects_bad_tokens(verifier):
+    for token in (
+        "not-a-token",
+        make_token({"sub": "user-1"}, secret=b"other-secret"),
+        make_token({"sub": "user-1"}, header={"alg": "none"}),
+        make_token({"sub": "user-1", "exp": NOW - 1}),
+        make_token({"sub": "user-1", "nbf": NOW + 10}),
+        make_token({"exp": NOW + 60}),
+    ):
+        with pytest.raises(InvalidTokenError):
+            verifier.verify(token)
+    assert verifier.stats()["size"] == 0
+
+
+def test_issuer_and_audience(clock):
+    verifier = TokenVerifier(
+        [VerificationKey.from_secret(SECRET)],
+        issuer="contracts",
+        audience="api",
+        clock=clock,
+    )
+
+    assert (
+        verifier.verify(
+            make_token({"sub": "a", "iss": "contracts", "aud": ["api", "web"]})
+        ).sub
+        == "a"
+    )
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(make_token({"sub": "a", "iss": "other", "aud": "api"}))
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(make_token({"sub": "a", "iss": "contracts", "aud": "web"}))
+
+
+def test_revoked_token_is_rejected_even_when_cached(verifier):
+    token = make_token({"sub": "user-1"})
+    verifier.verify(token)
+
+    verifier.revoke(token)
+
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(token)
+    assert verifier.stats()["size"] == 0
+
+
+def test_revocation_survives_other_encodings(verifier):
+    token = make_token({"sub": "alice"})
+    header, payload, signature = token.split(".")
+    # 43 characters carry 256 bits and two zero bits; setting one decodes alike
+    trailing = BASE64URL[BASE64URL.index(signature[-1]) | 1]
+    variants = [
+        token + "==",
+        "%s=.%s.%s" % (header, payload, signature),
+        "%s.%s.%s" % (header, payload, "!" + signature),
+        "%s.%s.%s" % (header, payload, signature[:-1] + trailing),
+    ]
+
+    for variant in variants:
+        with pytest.raises(InvalidTokenError):
+            verifier.verify(variant)
+    verifier.verify(token)
+    verifier.revoke(token)
+    for variant in [token] + variants:
+        with pytest.raises(InvalidTokenError):
+            verifier.verify(variant)
+
+
+def test_cache_is_bounded_lru(clock):
+    verifier = TokenVerifier(
+        [VerificationKey.from_secret(SECRET)], cache_size=2, clock=clock
+    )
+    first, second, third = (make_token({"sub": "user-%d" % i}) for i in range(3))
+
+    verifier.verify(first)
+    verifier.verify(second)
+    verifier.verify(first)
+    verifier.verify(third)
+    verifier.verify(first)
+    verifier.verify(second)
+
+    assert verifier.stats() == {"hits": 2, "misses": 4, "size": 2}
+
+
+def test_load_keys_from_jwks_file(tmp_path, clock):
+    keys_file = tmp_path / "keys.json"
+    secret = base64.urlsafe_b64encode(SECRET).rstrip(b"=").decode("ascii")
+    keys_file.write_text(
+        json.dumps({"keys": [{"kty": "oct", "kid": "k1", "alg": "HS256", "k": secret}]})
+    )
+    verifier = TokenVerifier(load_keys(keys_file=str(keys_file)), clock=clock)
+
+    assert (
+        verifier.verify(
+            make_token({"sub": "a"}, header={"alg": "HS256", "kid": "k1"})
+        ).sub
+        == "a"
+    )
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(make_token({"sub": "a"}, header={"alg": "HS256", "kid": "k2"}))
+
+
+def test_secured_route_rejects_invalid_token(client: TestClient, monkeypatch, verifier):
+    monkeypatch.setattr(security_api, "token_verifier", verifier)
+
+    response = client.request(
+        "GET",
+        "/v1/users/123e4567-e89b-12d3-a456-426614174000",
+        headers={"Authorization": "Bearer invalid"},
+    )
+
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+
+
+def test_dependency_runs_on_the_event_loop():
+    assert inspect.iscoroutinefunction(security_api.get_token_bearerAuth)
+
+
+def test_executor_verifies_cache_misses_only(client: TestClient, monkeypatch, verifier):
+    monkeypatch.setattr(security_api, "token_verifier", verifier)
+    monkeypatch.setattr(settings, "token_executor", True)
+    headers = {"Authorization": "Bearer %s" % make_token({"sub": "user-1"})}
+    url = "/v1/users/123e4567-e89b-12d3-a456-426614174000"
+
+    assert client.request("GET", url, headers=headers).status_code != 401
+    assert client.request("GET", url, headers=headers).status_code != 401
+    assert (
+        client.request("GET", url, headers={"Authorization": "Bearer x"}).status_code
+        == 401
+    )
+    assert verifier.stats() == {"hits": 1, "misses": 2, "size": 1}
+
+
+def test_asymmetric_jwk(clock):
+    jwt = pytest.importorskip("jwt")
+    ec = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.ec")
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    jwk = json.loads(jwt.algorithms.ECAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update(kid="ec-1", alg="ES256")
+    verifier = TokenVerifier([VerificationKey.from_jwk(jwk)], clock=clock)
+
+    token = jwt.encode(
+        {"sub": "a"}, private_key, algorithm="ES256", headers={"kid": "ec-1"}
+    )
+
+    assert verifier.verify(token).sub == "a"
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(
+            make_token({"sub": "a"}, header={"alg": "HS256", "kid": "ec-1"})
+        )
+    # (r, n - s) is a second valid ECDSA signature of the same input
+    signing_input, _, signature = token.rpartition(".")
+    raw = base64.urlsafe_b64decode(signature + "=" * (-len(signature) % 4))
+    s = (P256_ORDER - int.from_bytes(raw[32:], "big")).to_bytes(32, "big")
+    malleated = "%s.%s" % (
+        signing_input,
+        base64.urlsafe_b64encode(raw[:32] + s).rstrip(b"=").decode("ascii"),
+    )
+    assert verifier.verify(malleated).sub == "a"
+    verifier.revoke(token)
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(malleated)
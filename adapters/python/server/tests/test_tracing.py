@@ -0,0 +1,226 @@
+# coding: utf-8
+
+import asyncio
+import json
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Response
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from contracts.metrics import MeteredRoute, Metrics, MetricsMiddleware
+from contracts.responses import render_as
+from contracts.settings import settings
+from contracts.timing import timed, timed_impl
+from contracts.tracing import (
+    JsonLinesExporter,
+    MemoryExporter,
+    OtlpExporter,
+    Span,
+    Tracer,
+    TracingMiddleware,
+    otlp_payload,
+    parse_traceparent,
+    traceparent,
+    traces_endpoint,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class Item(BaseModel):
+    id: str
+
+
+async def authenticate() -> None:
+    with timed("auth"):
+        await asyncio.sleep(0.005)
+
+
+@timed_impl
+async def load_item(item_id: str) -> Item:
+    await asyncio.sleep(0.01)
+    return Item(id=item_id)
+
+
+def make_app(tracer: Tracer, metrics: Metrics = None) -> FastAPI:
+    router = APIRouter(route_class=MeteredRoute)
+    forwarded = []
+
+    @router.get("/items/{item_id}")
+    async def get_item_by_id(
+        item_id: str, auth: None = Depends(authenticate)
+    ) -> Response:
+        forwarded.append(traceparent())
+        item = await load_item(item_id)
+        return Response(
+            render_as(item, "application/json"), media_type="application/json"
+        )
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+    if metrics is not None:
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+    app.state.forwarded = forwarded
+    return app
+
+
+@pytest.fixture
+def tracer(monkeypatch) -> Tracer:
+    monkeypatch.setattr(settings, "tracing", True)
+    return Tracer(MemoryExporter(10), slow_threshold=1.0, sample_rate=1.0, enabled=True)
+
+
+def test_traceparent_parsing():
+    header = "00-%s-%s-01" % (TRACE_ID, PARENT_ID)
+
+    assert parse_traceparent(header) == (TRACE_ID, PARENT_ID, 1)
+    assert parse_traceparent(header.upper()) == (TRACE_ID, PARENT_ID, 1)
+    assert parse_traceparent("01-%s-%s-00-future" % (TRACE_ID, PARENT_ID)) == (
+        TRACE_ID,
+        PARENT_ID,
+        0,
+    )
+    assert parse_traceparent("00-%s-%s-01-extra" % (TRACE_ID, PARENT_ID)) is None
+    assert parse_traceparent("00-%s-%s-01" % ("0" * 32, PARENT_ID)) is None
+    assert parse_traceparent("ff-%s-%s-01" % (TRACE_ID, PARENT_ID)) is None
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent(None) is None
+
+
+def test_request_phases_become_spans(tracer):
+    app = make_app(tracer)
+    header = "00-%s-%s-00" % (TRACE_ID, PARENT_ID)
+
+    response = TestClient(app).get("/items/item-1", headers={"traceparent": header})
+
+    assert response.status_code == 200
+    [trace] = tracer.exporter.traces()
+    spans = {span["name"]: span for span in trace}
+    root = spans["getItemById"]
+    assert root["traceId"] == TRACE_ID
+    assert root["parentSpanId"] == PARENT_ID
+    assert root["kind"] == "server"
+    assert root["attributes"]["http.response.status_code"] == 200
+    assert all(span["traceId"] == TRACE_ID for span in trace)
+    for name in ("validation", "handler", "serialization"):
+        assert spans[name]["parentSpanId"] == root["spanId"]
+    assert spans["auth"]["parentSpanId"] == spans["validation"]["spanId"]
+    assert spans["impl load_item"]["parentSpanId"] == spans["handler"]["spanId"]
+    assert spans["serialization Item"]["parentSpanId"] == spans["handler"]["spanId"]
+    assert spans["impl load_item"]["durationMs"] >= 10
+    assert app.state.forwarded == ["00-%s-%s-00" % (TRACE_ID, root["spanId"])]
+
+
+def test_caller_sampling_decision_is_forwarded_unchanged(tracer):
+    app = make_app(tracer)
+    client = TestClient(app)
+
+    sampled_header = "00-%s-%s-01" % (TRACE_ID, PARENT_ID)
+    client.get("/items/item-1", headers={"traceparent": sampled_header})
+    client.get("/items/item-1")
+
+    sampled, fresh = app.state.forwarded
+    assert sampled.startswith("00-%s-" % TRACE_ID) and sampled.endswith("-01")
+    assert not fresh.startswith("00-%s-" % TRACE_ID) and fresh.endswith("-00")
+
+
+def test_fast_requests_are_sampled_down(tracer):
+    tracer.sample_rate = 0.0
+    client = TestClient(make_app(tracer))
+
+    client.get("/items/item-1")
+    assert tracer.exporter.traces() == []
+
+    tracer.slow_threshold = 0.01
+    client.get("/items/item-1")
+    client.get(
+        "/items/item-1", headers={"traceparent": "00-%s-%s-01" % (TRACE_ID, PARENT_ID)}
+    )
+    assert len(tracer.exporter.traces()) == 2
+    assert tracer.stats() == {"traces": 3, "kept": 2}
+
+
+def test_tracing_shares_the_sample_with_metrics(tracer):
+    metrics = Metrics(enabled=True)
+    client = TestClient(make_app(tracer, metrics))
+
+    client.get("/items/item-1")
+
+    assert metrics.operations["getItemById"].statuses == {200: 1}
+    assert len(tracer.exporter.traces()) == 1
+
+
+def test_exporters(tmp_path):
+    span = Span(
+        TRACE_ID,
+        PARENT_ID,
+        None,
+        "getItemById",
+        "server",
+        1000,
+        3000,
+        {"http.response.status_code": 503},
+    )
+    path = tmp_path / "traces.jsonl"
+
+    exporter = JsonLinesExporter(str(path), interval=0.01)
+    exporter.export([span, span])
+    assert exporter.flush()
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["name"] == "getItemById"
+    payload = otlp_payload([span], "contracts")
+    [encoded] = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert encoded["traceId"] == TRACE_ID
+    assert encoded["kind"] == 2
+    assert encoded["startTimeUnixNano"] == "1000"
+    assert encoded["status"] == {"code": 2}
+    assert "parentSpanId" not in encoded
+
+
+def test_otlp_exporter_survives_any_post_error():
+    exporter = OtlpExporter("not a url", interval=0.01)
+    span = Span(TRACE_ID, PARENT_ID, None, "getItemById", "server", 1000, 3000)
+
+    assert exporter.post([span]) is False
+    exporter.export([span])
+    assert exporter.flush()
+    exporter.export([span, span])
+    assert exporter.flush()
+
+    assert exporter.dropped == 4
+    assert exporter._worker.is_alive()
+
+
+def test_traces_endpoint_limit(monkeypatch, tracer):
+    monkeypatch.setattr("contracts.tracing.tracer", tracer)
+    app = make_app(tracer)
+    app.add_api_route("/traces", traces_endpoint)
+    client = TestClient(app)
+    client.get("/items/item-1")
+    client.get("/items/item-2")
+
+    assert len(client.get("/traces", params={"limit": 1}).json()) == 1
+    assert len(client.get("/traces").json()) == 2
+    for limit in ("0", "-1", "many"):
+        assert client.get("/traces", params={"limit": limit}).status_code == 422
+
+
+def test_traces_endpoint_requires_the_metrics_token(monkeypatch, tracer):
+    monkeypatch.setattr("contracts.tracing.tracer", tracer)
+    monkeypatch.setattr(settings, "metrics_token", "scraper-secret")
+    app = make_app(tracer)
+    app.add_api_route("/traces", traces_endpoint)
+    client = TestClient(app)
+    client.get("/items/item-1")
+
+    assert client.get("/traces").status_code == 401
+    wrong = client.get("/traces", headers={"Authorization": "Bearer other"})
+    assert wrong.status_code == 401
+    right = client.get("/traces", headers={"Authorization": "Bearer scraper-secret"})
+    assert right.status_code == 200
+    assert len(right.json()) == 1
@@ -1,18 +1,227 @@
 # coding: utf-8
 
+from datetime import datetime, timezone
+from typing import Dict
+
+import pytest
 from fastapi.testclient import TestClient
 
 
 from pydantic import Field, StrictStr  # noqa: F401
 from typing_extensions import Annotated  # noqa: F401
 from contracts.models.error import Error  # noqa: F401
-from contracts.models.get_user_list200_response import GetUserList200Response  # noqa: F401
+from contracts.models.get_user_list200_response import (  # noqa: F401
+    GetUserList200Response,
+)
 from contracts.models.logout_user200_response import LogoutUser200Response  # noqa: F401
+from contracts.models.pagination_meta import PaginationMeta
 from contracts.models.user import User  # noqa: F401
+from contracts.models.user_batch_create_request import (  # noqa: F401
+    UserBatchCreateRequest,
+)
+from contracts.models.user_batch_get_request import UserBatchGetRequest  # noqa: F401
+from contracts.models.user_batch_response import UserBatchResponse  # noqa: F401
+from contracts.models.user_batch_result import UserBatchResult
+from contracts.models.user_batch_update_request import (  # noqa: F401
+    UserBatchUpdateRequest,
+)
 from contracts.models.user_create_request import UserCreateRequest  # noqa: F401
-from contracts.models.user_update_email_request import UserUpdateEmailRequest  # noqa: F401
+from contracts.models.user_update_email_request import (  # noqa: F401
+    UserUpdateEmailRequest,
+)
 from contracts.models.user_update_request import UserUpdateRequest  # noqa: F401
-from contracts.models.object import object  # noqa: F401
+from contracts.models.users_request_payload import UsersRequestPayload  # noqa: F401
+
+
+HEADERS = {"Authorization": "Bearer special-key"}
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class BatchUsersApi:
+    """Users held in a dict, with item-level errors like a real store's"""
+
+    def __init__(self) -> None:
+        self.users: Dict[str, User] = {}
+        self.reads = 0
+
+    def _created(self, request: UserCreateRequest) -> UserBatchResult:
+        if any(user.email == request.email for user in self.users.values()):
+            error = Error(code="ERR_ALREADY_EXISTS", message="Email already in use")
+            return UserBatchResult(error=error)
+        user = User(
+            id="user-%d" % (len(self.users) + 1),
+            email=request.email,
+            first_name=request.first_name,
+            last_name=request.last_name,
+            role="BUYER",
+            status="ACTIVE",
+            created_at=NOW,
+            updated_at=NOW,
+        )
+        self.users[user.id] = user
+        return UserBatchResult(id=user.id, user=user)
+
+    def _found(self, id: str) -> UserBatchResult:
+        if id not in self.users:
+            error = Error(code="ERR_NOT_FOUND", message="User not found")
+            return UserBatchResult(id=id, error=error)
+        return UserBatchResult(id=id, user=self.users[id])
+
+    async def batch_create_users(self, user_batch_create_request):
+        return UserBatchResponse(
+            results=[self._created(item) for item in user_batch_create_request.items]
+        )
+
+    async def batch_get_users(self, user_batch_get_request):
+        return UserBatchResponse(
+            results=[self._found(id) for id in user_batch_get_request.ids]
+        )
+
+    async def batch_update_users(self, user_batch_update_request):
+        results = []
+        for item in user_batch_update_request.items:
+            if item.id in self.users:
+                changes = item.changes.model_dump(exclude_unset=True)
+                self.users[item.id] = self.users[item.id].model_copy(update=changes)
+            results.append(self._found(item.id))
+        return UserBatchResponse(results=results)
+
+    async def get_user_version(self, userId):
+        return None
+
+    async def get_user_by_id(self, userId):
+        self.reads += 1
+        return self._found(userId).user
+
+    async def get_user_list(self, users_request_payload):
+        self.reads += 1
+        users = list(self.users.values())
+        meta = PaginationMeta(limit=20, offset=0, total=len(users))
+        return GetUserList200Response(data=users, meta=meta)
+
+
+def create_item(name: str) -> Dict[str, str]:
+    return {
+        "email": "%s@example.com" % name.lower(),
+        "firstName": name,
+        "lastName": "Doe",
+        "password": "SecurePassword123!",
+    }
+
+
+def batch_create(client: TestClient, *names: str):
+    items = [create_item(name) for name in names]
+    return client.post("/v1/users:batchCreate", headers=HEADERS, json={"items": items})
+
+
+def batch_update(client: TestClient, items):
+    return client.patch("/v1/users:batchUpdate", headers=HEADERS, json={"items": items})
+
+
+@pytest.fixture
+def batch_client(users_client) -> TestClient:
+    return users_client(BatchUsersApi())
+
+
+def test_batch_create_users(batch_client: TestClient):
+    """Test case for batch_create_users
+
+    Create users in batch
+    """
+    response = batch_create(batch_client, "John", "Jane", "John")
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result.get("id") for result in results] == ["user-1", "user-2", None]
+    assert results[1]["user"]["firstName"] == "Jane"
+    assert "error" not in results[0]
+    assert results[2]["error"]["code"] == "ERR_ALREADY_EXISTS"
+    assert "user" not in results[2]
+
+
+def test_batch_get_users(batch_client: TestClient):
+    """Test case for batch_get_users
+
+    Get users in batch
+    """
+    batch_create(batch_client, "John")
+
+    response = batch_client.post(
+        "/v1/users:batchGet", headers=HEADERS, json={"ids": ["missing", "user-1"]}
+    )
+
+    assert response.status_code == 200
+    missing, found = response.json()["results"]
+    assert missing == {
+        "id": "missing",
+        "error": {"code": "ERR_NOT_FOUND", "message": "User not found"},
+    }
+    assert found["user"]["email"] == "john@example.com"
+
+
+def test_batch_update_users(batch_client: TestClient):
+    """Test case for batch_update_users
+
+    Update users in batch
+    """
+    batch_create(batch_client, "John")
+    items = [
+        {"id": "user-1", "changes": {"firstName": "Johnny"}},
+        {"id": "user-9", "changes": {"firstName": "Nobody"}},
+    ]
+
+    response = batch_update(batch_client, items)
+
+    assert response.status_code == 200
+    updated, missing = response.json()["results"]
+    assert updated["user"]["firstName"] == "Johnny"
+    assert missing["error"]["code"] == "ERR_NOT_FOUND"
+
+
+def test_batches_are_limited_to_100_items(batch_client: TestClient):
+    ids = ["user-%d" % i for i in range(101)]
+    changes = [{"id": id, "changes": {}} for id in ids]
+    too_many = [
+        ("POST", "/v1/users:batchCreate", {"items": [create_item(id) for id in ids]}),
+        ("POST", "/v1/users:batchGet", {"ids": ids}),
+        ("PATCH", "/v1/users:batchUpdate", {"items": changes}),
+    ]
+
+    for method, path, body in too_many:
+        response = batch_client.request(method, path, headers=HEADERS, json=body)
+        assert response.status_code == 422
+        empty = {key: [] for key in body}
+        response = batch_client.request(method, path, headers=HEADERS, json=empty)
+        assert response.status_code == 422
+    response = batch_client.post(
+        "/v1/users:batchGet", headers=HEADERS, json={"ids": ids[:100]}
+    )
+    assert response.status_code == 200
+
+
+def test_batch_writes_invalidate_cached_reads(users_client, enabled_cache):
+    impl = BatchUsersApi()
+    client = users_client(impl)
+    batch_create(client, "John")
+
+    def get(path: str):
+        return client.get(path, params=params, headers=HEADERS).json()
+
+    params = {"UsersRequestPayload": '{"limit":10,"offset":0}'}
+    get("/v1/users/user-1")
+    get("/v1/users")
+    assert get("/v1/users/user-1")["firstName"] == "John"
+    assert impl.reads == 2
+
+    batch_create(client, "Jane")
+    assert len(get("/v1/users")["data"]) == 2
+    assert get("/v1/users/user-1")["firstName"] == "John"
+    assert impl.reads == 3
+
+    batch_update(client, [{"id": "user-1", "changes": {"firstName": "Johnny"}}])
+    assert get("/v1/users/user-1")["firstName"] == "Johnny"
+    assert get("/v1/users")["data"][0]["firstName"] == "Johnny"
+    assert impl.reads == 5
 
 
 def test_create_user(client: TestClient):
@@ -238,6 +238,12 @@ export const PaginationOffsetSchema = {
     default: 0
 } as const;
 
+export const CursorSchema = {
+    type: 'string',
+    description: 'Opaque keyset pagination cursor. Returned as `meta.nextCursor` while more records follow; pass it back unchanged to fetch the next page, with `offset` set to 0.',
+    example: 'WyJqb2huIGRvZSIsIjEyM2U0NTY3LWU4OWItMTJkMy1hNDU2LTQyNjYxNDE3NDAwMCJd'
+} as const;
+
 export const UserSortFieldSchema = {
     type: 'string',
     description: 'Enum defining the fields by which user can sort the users list.',
@@ -261,7 +267,7 @@ export const OrderBySchema = {
 export const PaginationMetaSchema = {
     type: 'object',
     description: 'Pagination metadata for list responses',
-    required: ['limit', 'offset', 'total'],
+    required: ['limit', 'offset'],
     properties: {
         limit: {
             type: 'integer',
@@ -279,8 +285,11 @@ export const PaginationMetaSchema = {
         total: {
             type: 'integer',
             minimum: 0,
-            description: 'Total number of items',
+            description: 'Total number of items. May be omitted or estimated when paginating with a cursor.',
             example: 150
+        },
+        nextCursor: {
+            '$ref': '#/components/schemas/Cursor'
         }
     }
 } as const;
@@ -347,4 +356,99 @@ export const UserUpdateEmailRequestSchema = {
         }
     },
     required: ['newEmail', 'password']
+} as const;
+
+export const UserBatchGetRequestSchema = {
+    type: 'object',
+    description: 'Request payload for fetching several users at once',
+    properties: {
+        ids: {
+            type: 'array',
+            description: 'Identifiers of the users to fetch. Results are returned in the same order.',
+            minItems: 1,
+            maxItems: 100,
+            items: {
+                '$ref': '#/components/schemas/Id'
+            }
+        }
+    },
+    required: ['ids']
+} as const;
+
+export const UserBatchResultSchema = {
+    type: 'object',
+    description: 'Outcome of a single item of a batch operation. Exactly one of `user` and `error` is set.',
+    properties: {
+        id: {
+            '$ref': '#/components/schemas/Id'
+        },
+        user: {
+            '$ref': '#/components/schemas/User'
+        },
+        error: {
+            '$ref': '#/components/schemas/Error'
+        }
+    }
+} as const;
+
+export const UserBatchResponseSchema = {
+    type: 'object',
+    description: 'Per-item results of a batch operation, in request order',
+    properties: {
+        results: {
+            type: 'array',
+            items: {
+                '$ref': '#/components/schemas/UserBatchResult'
+            }
+        }
+    },
+    required: ['results']
+} as const;
+
+export const UserBatchCreateRequestSchema = {
+    type: 'object',
+    description: 'Request payload for creating several users at once',
+    properties: {
+        items: {
+            type: 'array',
+            description: 'Users to create. Results are returned in the same order.',
+            minItems: 1,
+            maxItems: 100,
+            items: {
+                '$ref': '#/components/schemas/UserCreateRequest'
+            }
+        }
+    },
+    required: ['items']
+} as const;
+
+export const UserBatchUpdateItemSchema = {
+    type: 'object',
+    description: 'Changes to apply to a single user of a batch update',
+    properties: {
+        id: {
+            '$ref': '#/components/schemas/Id'
+        },
+        changes: {
+            '$ref': '#/components/schemas/UserUpdateRequest'
+        }
+    },
+    required: ['id', 'changes']
+} as const;
+
+export const UserBatchUpdateRequestSchema = {
+    type: 'object',
+    description: 'Request payload for updating several users at once',
+    properties: {
+        items: {
+            type: 'array',
+            description: 'Users to update. Results are returned in the same order.',
+            minItems: 1,
+            maxItems: 100,
+            items: {
+                '$ref': '#/components/schemas/UserBatchUpdateItem'
+            }
+        }
+    },
+    required: ['items']
 } as const;
\ No newline at end of file
@@ -1,7 +1,7 @@
 // This file is auto-generated by @hey-api/openapi-ts
 
 import type { Options as ClientOptions, TDataShape, Client } from './client';
-import type { GetHealthStatusData, GetHealthStatusResponses, GetHealthStatusErrors, AuthenticateUserData, AuthenticateUserResponses, AuthenticateUserErrors, RegisterUserData, RegisterUserResponses, RegisterUserErrors, RefreshTokensData, RefreshTokensResponses, RefreshTokensErrors, LogoutUserData, LogoutUserResponses, LogoutUserErrors, GetUserListData, GetUserListResponses, GetUserListErrors, CreateUserData, CreateUserResponses, CreateUserErrors, DeleteUserByIdData, DeleteUserByIdResponses, DeleteUserByIdErrors, GetUserByIdData, GetUserByIdResponses, GetUserByIdErrors, UpdateUserByIdData, UpdateUserByIdResponses, UpdateUserByIdErrors, UpdateUserEmailData, UpdateUserEmailResponses, UpdateUserEmailErrors } from './types.gen';
+import type { GetHealthStatusData, GetHealthStatusResponses, GetHealthStatusErrors, AuthenticateUserData, AuthenticateUserResponses, AuthenticateUserErrors, RegisterUserData, RegisterUserResponses, RegisterUserErrors, RefreshTokensData, RefreshTokensResponses, RefreshTokensErrors, LogoutUserData, LogoutUserResponses, LogoutUserErrors, GetUserListData, GetUserListResponses, GetUserListErrors, CreateUserData, CreateUserResponses, CreateUserErrors, DeleteUserByIdData, DeleteUserByIdResponses, DeleteUserByIdErrors, GetUserByIdData, GetUserByIdResponses, GetUserByIdErrors, UpdateUserByIdData, UpdateUserByIdResponses, UpdateUserByIdErrors, UpdateUserEmailData, UpdateUserEmailResponses, UpdateUserEmailErrors, BatchGetUsersData, BatchGetUsersResponses, BatchGetUsersErrors, BatchCreateUsersData, BatchCreateUsersResponses, BatchCreateUsersErrors, BatchUpdateUsersData, BatchUpdateUsersResponses, BatchUpdateUsersErrors } from './types.gen';
 import { client as _heyApiClient } from './client.gen';
 
 export type Options<TData extends TDataShape = TDataShape, ThrowOnError extends boolean = boolean> = ClientOptions<TData, ThrowOnError> & {
@@ -207,4 +207,67 @@ export const updateUserEmail = <ThrowOnError extends boolean = false>(options: O
             ...options.headers
         }
     });
+};
+
+/**
+ * Get users in batch
+ * Retrieve up to 100 users by their IDs in a single request
+ */
+export const batchGetUsers = <ThrowOnError extends boolean = false>(options: Options<BatchGetUsersData, ThrowOnError>) => {
+    return (options.client ?? _heyApiClient).post<BatchGetUsersResponses, BatchGetUsersErrors, ThrowOnError>({
+        security: [
+            {
+                scheme: 'bearer',
+                type: 'http'
+            }
+        ],
+        url: '/v1/users:batchGet',
+        ...options,
+        headers: {
+            'Content-Type': 'application/json',
+            ...options.headers
+        }
+    });
+};
+
+/**
+ * Create users in batch
+ * Create up to 100 users in a single request (admin only)
+ */
+export const batchCreateUsers = <ThrowOnError extends boolean = false>(options: Options<BatchCreateUsersData, ThrowOnError>) => {
+    return (options.client ?? _heyApiClient).post<BatchCreateUsersResponses, BatchCreateUsersErrors, ThrowOnError>({
+        security: [
+            {
+                scheme: 'bearer',
+                type: 'http'
+            }
+        ],
+        url: '/v1/users:batchCreate',
+        ...options,
+        headers: {
+            'Content-Type': 'application/json',
+            ...options.headers
+        }
+    });
+};
+
+/**
+ * Update users in batch
+ * Update up to 100 users in a single request
+ */
+export const batchUpdateUsers = <ThrowOnError extends boolean = false>(options: Options<BatchUpdateUsersData, ThrowOnError>) => {
+    return (options.client ?? _heyApiClient).patch<BatchUpdateUsersResponses, BatchUpdateUsersErrors, ThrowOnError>({
+        security: [
+            {
+                scheme: 'bearer',
+                type: 'http'
+            }
+        ],
+        url: '/v1/users:batchUpdate',
+        ...options,
+        headers: {
+            'Content-Type': 'application/json',
+            ...options.headers
+        }
+    });
 };
\ No newline at end of file
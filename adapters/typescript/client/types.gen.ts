@@ -165,6 +165,11 @@ export type Limit = number;
  */
 export type PaginationOffset = number;
 
+/**
+ * Opaque keyset pagination cursor. Returned as `meta.nextCursor` while more records follow; pass it back unchanged to fetch the next page, with `offset` set to 0.
+ */
+export type Cursor = string;
+
 /**
  * Enum defining the fields by which user can sort the users list.
  */
@@ -193,9 +198,10 @@ export type PaginationMeta = {
      */
     offset: number;
     /**
-     * Total number of items
+     * Total number of items. May be omitted or estimated when paginating with a cursor.
      */
-    total: number;
+    total?: number;
+    nextCursor?: Cursor;
 };
 
 /**
@@ -229,12 +235,67 @@ export type UserUpdateEmailRequest = {
     password: Password;
 };
 
+/**
+ * Request payload for fetching several users at once
+ */
+export type UserBatchGetRequest = {
+    /**
+     * Identifiers of the users to fetch. Results are returned in the same order.
+     */
+    ids: Array<Id>;
+};
+
+/**
+ * Outcome of a single item of a batch operation. Exactly one of `user` and `error` is set.
+ */
+export type UserBatchResult = {
+    id?: Id;
+    user?: User;
+    error?: _Error;
+};
+
+/**
+ * Per-item results of a batch operation, in request order
+ */
+export type UserBatchResponse = {
+    results: Array<UserBatchResult>;
+};
+
+/**
+ * Request payload for creating several users at once
+ */
+export type UserBatchCreateRequest = {
+    /**
+     * Users to create. Results are returned in the same order.
+     */
+    items: Array<UserCreateRequest>;
+};
+
+/**
+ * Changes to apply to a single user of a batch update
+ */
+export type UserBatchUpdateItem = {
+    id: Id;
+    changes: UserUpdateRequest;
+};
+
+/**
+ * Request payload for updating several users at once
+ */
+export type UserBatchUpdateRequest = {
+    /**
+     * Users to update. Results are returned in the same order.
+     */
+    items: Array<UserBatchUpdateItem>;
+};
+
 /**
  * Users request payload.
  */
 export type UsersRequestPayload = {
     limit: Limit;
     offset: PaginationOffset;
+    cursor?: Cursor;
     /**
      * Filter criteria for selecting records.
      */
@@ -421,6 +482,7 @@ export type GetUserListData = {
         UsersRequestPayload: {
             limit: Limit;
             offset: PaginationOffset;
+            cursor?: Cursor;
             /**
              * Filter criteria for selecting records.
              */
@@ -664,6 +726,93 @@ export type UpdateUserEmailResponses = {
 
 export type UpdateUserEmailResponse = UpdateUserEmailResponses[keyof UpdateUserEmailResponses];
 
+export type BatchGetUsersData = {
+    body: UserBatchGetRequest;
+    path?: never;
+    query?: never;
+    url: '/v1/users:batchGet';
+};
+
+export type BatchGetUsersErrors = {
+    /**
+     * Invalid request.
+     */
+    400: _Error;
+    /**
+     * Unauthorized.
+     */
+    401: _Error;
+};
+
+export type BatchGetUsersError = BatchGetUsersErrors[keyof BatchGetUsersErrors];
+
+export type BatchGetUsersResponses = {
+    /**
+     * Batch processed. Every item carries either the user or the error it failed with.
+     */
+    200: UserBatchResponse;
+};
+
+export type BatchGetUsersResponse = BatchGetUsersResponses[keyof BatchGetUsersResponses];
+
+export type BatchCreateUsersData = {
+    body: UserBatchCreateRequest;
+    path?: never;
+    query?: never;
+    url: '/v1/users:batchCreate';
+};
+
+export type BatchCreateUsersErrors = {
+    /**
+     * Invalid request.
+     */
+    400: _Error;
+    /**
+     * Unauthorized.
+     */
+    401: _Error;
+};
+
+export type BatchCreateUsersError = BatchCreateUsersErrors[keyof BatchCreateUsersErrors];
+
+export type BatchCreateUsersResponses = {
+    /**
+     * Batch processed. Every item carries either the user or the error it failed with.
+     */
+    200: UserBatchResponse;
+};
+
+export type BatchCreateUsersResponse = BatchCreateUsersResponses[keyof BatchCreateUsersResponses];
+
+export type BatchUpdateUsersData = {
+    body: UserBatchUpdateRequest;
+    path?: never;
+    query?: never;
+    url: '/v1/users:batchUpdate';
+};
+
+export type BatchUpdateUsersErrors = {
+    /**
+     * Invalid request.
+     */
+    400: _Error;
+    /**
+     * Unauthorized.
+     */
+    401: _Error;
+};
+
+export type BatchUpdateUsersError = BatchUpdateUsersErrors[keyof BatchUpdateUsersErrors];
+
+export type BatchUpdateUsersResponses = {
+    /**
+     * Batch processed. Every item carries either the user or the error it failed with.
+     */
+    200: UserBatchResponse;
+};
+
+export type BatchUpdateUsersResponse = BatchUpdateUsersResponses[keyof BatchUpdateUsersResponses];
+
 export type ClientOptions = {
     baseUrl: 'https://api.example.com' | 'http://localhost:8080' | (string & {});
 };
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""Post-generation pass over the python-fastapi routers and base classes.
+
+openapi-generator types a query parameter sent as JSON content as `object`
+and imports it from a `models.object` module that does not exist. The
+templates in `templates/` type such a parameter with the model named after it
+instead, so this pass drops that import.
+
+It also rewrites the package `__init__.py` to export the routers and the base
+classes lazily through a module-level `__getattr__`, as postprocess_models.py
+does for the models: `from contracts.apis import BaseUsersApi` imports
+`contracts.apis.users_api_base` alone.
+
+Usage: python postprocess_apis.py <apis directory>
+"""
+
+import pathlib
+import re
+import sys
+
+OBJECT_IMPORT = re.compile(r"^from [\w.]+\.models\.object import object\n", re.MULTILINE)
+BASE_CLASS = re.compile(r"^class (Base(\w+))\b", re.MULTILINE)
+MAX_LINE_LENGTH = 88
+
+PACKAGE_INIT = '''# coding: utf-8
+
+"""Lazy exports of the API routers and base classes.
+
+Each module is imported on first access to one of its names, so importing a
+single router does not build the others.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+%(exports)s
+}
+
+__all__ = sorted(_EXPORTS)
+
+if TYPE_CHECKING:
+%(imports)s
+
+
+def __getattr__(name):
+    try:
+        module, attribute = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError("module %%r has no attribute %%r" %% (__name__, name))
+    value = getattr(import_module(module), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+'''
+
+
+def _export(name: str, module: str, attribute: str) -> str:
+    line = '    "%s": ("%s", "%s"),' % (name, module, attribute)
+    if len(line) <= MAX_LINE_LENGTH:
+        return line
+    return '    "%s": (\n        "%s",\n        "%s",\n    ),' % (name, module, attribute)
+
+
+def _import(name: str, module: str, attribute: str) -> str:
+    if name == attribute:
+        return "    from %s import %s" % (module, name)
+    return "    from %s import %s as %s" % (module, attribute, name)
+
+
+def package_init(directory: pathlib.Path) -> str:
+    """Return the lazy-export `__init__.py` of the apis package in `directory`"""
+    package = "%s.%s" % (directory.parent.name, directory.name)
+    names = []
+    for path in sorted(directory.glob("*_api_base.py")):
+        for name, api in BASE_CLASS.findall(path.read_text()):
+            router = path.stem[: -len("_base")]
+            names.append((name, "%s.%s" % (package, path.stem), name))
+            names.append(("%sRouter" % api, "%s.%s" % (package, router), "router"))
+    names.sort()
+    return PACKAGE_INIT % {
+        "exports": "\n".join(_export(*name) for name in names),
+        "imports": "\n".join(
+            _import(*name) for name in sorted(names, key=lambda name: name[1])
+        ),
+    }
+
+
+def process(source: str) -> str:
+    """Return `source` without the import of the nonexistent `object` model"""
+    return OBJECT_IMPORT.sub("", source)
+
+
+def main(directory: str) -> None:
+    directory = pathlib.Path(directory)
+    for path in sorted(directory.glob("*_api*.py")):
+        source = path.read_text()
+        processed = process(source)
+        if processed != source:
+            path.write_text(processed)
+            print("postprocessed %s" % path)
+    init = directory / "__init__.py"
+    exports = package_init(directory)
+    if not init.exists() or init.read_text() != exports:
+        init.write_text(exports)
+        print("postprocessed %s" % init)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
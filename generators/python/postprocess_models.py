@@ -0,0 +1,234 @@
+"""Post-generation pass over the python-fastapi models.
+
+openapi-generator turns every `pattern` of a string schema into a Python-level
+`field_validator` that calls `re.match()` on each validation. This pass
+rewrites those validators in place:
+
+* length-only patterns (`^.{m,n}$`, `^.*$`) become native pydantic-core
+  `min_length`/`max_length` constraints and the validator is removed;
+* every other pattern is compiled once at module level and the validator
+  matches against the compiled object.
+
+It also records the nullable fields that `to_dict()` keeps as `None` in a
+`__nullable_fields__` class variable, so serializers other than `to_dict()`
+can honour the same rules, and sets `defer_build` in every `model_config` so
+pydantic builds a model's validator on first use instead of at import.
+
+`to_json()` and `from_json()` go through `contracts.serialization` instead of
+the standard `json` module; it is backed by orjson when `CONTRACTS_FAST_JSON`
+is set.
+
+Finally it rewrites the package `__init__.py` to export every model lazily
+through a module-level `__getattr__`: `from contracts.models import User`
+imports `contracts.models.user` alone.
+
+Usage: python postprocess_models.py <models directory>
+"""
+
+import pathlib
+import re
+import sys
+
+VALIDATOR = re.compile(
+    r"    @field_validator\('(?P<field>\w+)'\)\n"
+    r"    def (?P=field)_validate_regular_expression\(cls, value\):\n"
+    r'        """Validates the regular expression"""\n'
+    r"(?P<optional>        if value is None:\n            return value\n\n)?"
+    r'        if not re\.match\(r"(?P<pattern>.*)", value(?P<flags> ?,re\.\w+(?:\s*\|\s*re\.\w+)*)?\):\n'
+    r'            raise ValueError\(r"must validate the regular expression /.*/"\)\n'
+    r"        return value\n"
+    r"\n?"
+)
+LENGTH_ONLY = re.compile(r"\^\.(?:\{(?P<min>\d*),(?P<max>\d+)\}|\*)\$")
+CLASS = re.compile(r"^class \w+\(", re.MULTILINE)
+SELF_IMPORT = "try:\n    from typing import Self\n"
+JSON_TODO = "        # TODO: pydantic v2: use .model_dump_json(by_alias=True, exclude_unset=True) instead\n"
+NULLABLE = re.compile(r"^        # set to None if (\w+) \(nullable\) is None$", re.MULTILINE)
+PROPERTIES = re.compile(r"^    __properties: ClassVar\[List\[str\]\] = .*$", re.MULTILINE)
+MODEL_CONFIG = re.compile(r"^    model_config = \{\n", re.MULTILINE)
+EXPORTED_CLASS = re.compile(r"^class (\w+)\(", re.MULTILINE)
+
+PACKAGE_INIT = '''# coding: utf-8
+
+"""Lazy exports of the generated models.
+
+Written by generators/python/postprocess_models.py. Each model module is
+imported on first access to one of its names.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+_EXPORTS = {
+%(exports)s
+}
+
+__all__ = sorted(_EXPORTS)
+
+if TYPE_CHECKING:
+%(imports)s
+
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError("module %%r has no attribute %%r" %% (__name__, name))
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+'''
+
+
+def _constrain(source: str, field: str, min_length: int, max_length: int) -> str:
+    """Add length constraints to the `Field()` inside the field's `Annotated[str, ...]`"""
+    declaration = re.compile(
+        r"^(    %s: .*?Annotated\[str, Field\()(?P<args>[^)]*)(\)\])" % re.escape(field),
+        re.MULTILINE,
+    )
+    match = declaration.search(source)
+    if match is None:
+        raise ValueError("cannot find a string declaration for %r" % field)
+    args = [arg.strip() for arg in match.group("args").split(",") if arg.strip()]
+    existing = {arg.split("=", 1)[0]: arg for arg in args}
+    if "max_length" in existing:
+        max_length = min(max_length, int(existing["max_length"].split("=", 1)[1]))
+    if "min_length" in existing:
+        min_length = max(min_length, int(existing["min_length"].split("=", 1)[1]))
+    args = [arg for arg in args if arg.split("=", 1)[0] not in ("min_length", "max_length")]
+    if min_length:
+        args.append("min_length=%d" % min_length)
+    args.append("max_length=%d" % max_length)
+    return "%s%s%s%s" % (
+        source[: match.start()],
+        match.group(1) + ", ".join(args),
+        match.group(3),
+        source[match.end():],
+    )
+
+
+def _compiled(match: "re.Match") -> str:
+    body = '        """Validates the regular expression"""\n'
+    if match.group("optional"):
+        body += match.group("optional")
+    return (
+        "    @field_validator('{field}')\n"
+        "    def {field}_validate_regular_expression(cls, value):\n"
+        "{body}"
+        "        if not _{constant}_PATTERN.match(value):\n"
+        '            raise ValueError(r"must validate the regular expression /{pattern}/")\n'
+        "        return value\n\n"
+    ).format(
+        field=match.group("field"),
+        body=body,
+        constant=match.group("field").upper(),
+        pattern=match.group("pattern"),
+    )
+
+
+def _declare_nullable(source: str) -> str:
+    fields = NULLABLE.findall(source)
+    properties = PROPERTIES.search(source)
+    if not fields or properties is None or "__nullable_fields__" in source:
+        return source
+    declaration = "\n    __nullable_fields__: ClassVar[List[str]] = [%s]" % ", ".join(
+        '"%s"' % field for field in fields
+    )
+    return source[: properties.end()] + declaration + source[properties.end():]
+
+
+def _defer_build(source: str) -> str:
+    if '"defer_build"' in source:
+        return source
+    return MODEL_CONFIG.sub(lambda match: match.group(0) + '        "defer_build": True,\n', source)
+
+
+def _use_serialization(source: str) -> str:
+    if "import json\n" not in source:
+        return source
+    source = source.replace("import json\n", "", 1).replace(JSON_TODO, "")
+    names = [name for name in ("dumps", "loads") if "json.%s(" % name in source]
+    for name in names:
+        source = source.replace("json.%s(" % name, "%s(" % name)
+    if names:
+        position = source.index(SELF_IMPORT)
+        source = (
+            source[:position]
+            + "from contracts.serialization import %s\n" % ", ".join(names)
+            + source[position:]
+        )
+    return source
+
+
+def package_init(directory: pathlib.Path) -> str:
+    """Return the lazy-export `__init__.py` of the models package in `directory`"""
+    package = "%s.%s" % (directory.parent.name, directory.name)
+    names = []
+    for path in sorted(directory.glob("*.py")):
+        if path.name == "__init__.py":
+            continue
+        for name in EXPORTED_CLASS.findall(path.read_text()):
+            names.append((name, "%s.%s" % (package, path.stem)))
+    names.sort()
+    return PACKAGE_INIT % {
+        "exports": "\n".join('    "%s": "%s",' % (name, module) for name, module in names),
+        "imports": "\n".join("    from %s import %s" % (module, name) for name, module in names),
+    }
+
+
+def process(source: str) -> str:
+    """Return `source` with its nullable fields declared, its build deferred,
+    its JSON through `contracts.serialization` and its regular-expression
+    validators rewritten"""
+    source = _declare_nullable(source)
+    source = _use_serialization(source)
+    source = _defer_build(source)
+    constants = []
+    while True:
+        match = VALIDATOR.search(source)
+        if match is None:
+            break
+        field, pattern = match.group("field"), match.group("pattern")
+        length = LENGTH_ONLY.fullmatch(pattern)
+        if length is not None:
+            source = source[: match.start()] + source[match.end():]
+            if length.group("max") is not None:
+                source = _constrain(
+                    source, field, int(length.group("min") or 0), int(length.group("max"))
+                )
+            continue
+        flags = (match.group("flags") or "").lstrip(" ,")
+        constants.append(
+            '_%s_PATTERN = re.compile(r"%s"%s)\n'
+            % (field.upper(), pattern, ", " + flags if flags else "")
+        )
+        source = source[: match.start()] + _compiled(match) + source[match.end():]
+    if constants:
+        position = CLASS.search(source).start()
+        source = source[:position] + "".join(constants) + "\n\n" + source[position:]
+    return source
+
+
+def main(directory: str) -> None:
+    directory = pathlib.Path(directory)
+    for path in sorted(directory.glob("*.py")):
+        if path.name == "__init__.py":
+            continue
+        source = path.read_text()
+        processed = process(source)
+        if processed != source:
+            path.write_text(processed)
+            print("postprocessed %s" % path)
+    init = directory / "__init__.py"
+    exports = package_init(directory)
+    if not init.exists() or init.read_text() != exports:
+        init.write_text(exports)
+        print("postprocessed %s" % init)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])